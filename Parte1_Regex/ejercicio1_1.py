@@ -1,27 +1,125 @@
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Patrones compilados una sola vez a nivel de módulo: no dependen de la caché
+# interna de 're', que se vacía cuando otro código compila muchos patrones
+RE_RFC = re.compile(r'^[A-Z]{4}\d{6}(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])[A-Z\d]{3}$')
+RE_MATRICULA_UAM = re.compile(r'^\d{10}$')
+RE_IPV4 = re.compile(r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$')
+RE_PASSWORD_FUERTE = re.compile(r'^(?=(?:.*[A-Z]){2})(?=(?:.*[a-z]){2})(?=(?:.*\d){2})(?=.*[!@#$%^&*]).{10,}$')
 
 def validar_rfc (rfc):
     #Valida RFC mexicano con homoclave#
-    patron = r'^[A-Z]{4}\d{6}(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])[A-Z\d]{3}$' # TU CODIGO AQUI
-    return bool(re. fullmatch (patron , rfc))
+    return bool(RE_RFC.fullmatch(rfc))
 
 def validar_matricula_uam ( matricula ):
     #Valida matricula UAM#
-    patron = r'^\d{10}$' # TU CODIGO AQUI
-    return bool(re. fullmatch (patron , matricula ))
+    return bool(RE_MATRICULA_UAM.fullmatch(matricula))
 
-def validar_ipv4 (ip):
-    """Valida direccion IPv4"""
-    patron = r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$' # TU CODIGO AQUI
-    return bool(re. fullmatch (patron , ip))
+def validar_ipv4 (ip, rapido=False):
+    """Valida direccion IPv4 (rapido=True usa el parser de octetos sin regex)"""
+    if rapido:
+        return _ipv4_rapido(ip)
+    return bool(RE_IPV4.fullmatch(ip))
 
-def validar_password_fuerte (password):
-    """Valida contraseña fuerte"""
-    # TU CODIGO AQUI
+def validar_password_fuerte (password, rapido=False):
+    """Valida contraseña fuerte (rapido=True cuenta clases en una sola pasada)"""
+    if rapido:
+        return _password_rapido(password)
     # Pista: Usa lookahead assertions (?=...)
-    patron = r'^(?=(?:.*[A-Z]){2})(?=(?:.*[a-z]){2})(?=(?:.*\d){2})(?=.*[!@#$%^&*]).{10,}$'    
-    return bool(re.match(patron, password))
-    pass
+    return bool(RE_PASSWORD_FUERTE.match(password))
+
+# ─────────────────────────────────────────────
+#  Caminos rápidos sin regex (mismo resultado que los patrones)
+# ─────────────────────────────────────────────
+
+def _ipv4_rapido(ip):
+    # Cada octeto: 1 a 3 dígitos ASCII con valor <= 255 (se permiten ceros a la izquierda).
+    # Todas las comprobaciones son métodos de str, que recorren la cadena en C
+    if not 7 <= len(ip) <= 15 or not ip.isascii():
+        return False
+    octetos = ip.split('.')
+    if len(octetos) != 4 or not ''.join(octetos).isdigit():
+        return False
+    return 0 < min(map(len, octetos)) and max(map(len, octetos)) <= 3 and max(map(int, octetos)) <= 255
+
+# Cada byte ASCII se reduce a su clase: 'A' mayúscula, 'a' minúscula, '0' dígito,
+# '!' especial y ' ' cualquier otro; después basta con contar
+_CLASES_ASCII = bytes(
+    ord('A') if 65 <= b <= 90 else
+    ord('a') if 97 <= b <= 122 else
+    ord('0') if 48 <= b <= 57 else
+    ord('!') if chr(b) in '!@#$%^&*' else
+    ord(' ')
+    for b in range(256))
+_SIN_ASCII = dict.fromkeys(range(128))
+
+def _password_rapido(password):
+    # Como en el patrón, '.' no cruza saltos de línea y '$' acepta uno final
+    cuerpo = password[:-1] if password.endswith('\n') else password
+    if len(cuerpo) < 10 or '\n' in cuerpo:
+        return False
+    clases = cuerpo.encode('ascii', 'replace').translate(_CLASES_ASCII)
+    if not (b'!' in clases and clases.count(b'A') >= 2 and clases.count(b'a') >= 2):
+        return False
+    digitos = clases.count(b'0')
+    if digitos < 2 and not cuerpo.isascii():
+        # \d en patrones str acepta cualquier dígito Unicode, no sólo 0-9
+        digitos += sum(c.isdecimal() for c in cuerpo.translate(_SIN_ASCII))
+    return digitos >= 2
+
+# ─────────────────────────────────────────────
+#  Validación por lotes
+# ─────────────────────────────────────────────
+
+# tipo -> método del patrón compilado que usa el validador individual
+VALIDADORES_LOTE = {
+    'rfc':       RE_RFC.fullmatch,
+    'matricula': RE_MATRICULA_UAM.fullmatch,
+    'ipv4':      RE_IPV4.fullmatch,
+    'password':  RE_PASSWORD_FUERTE.match,
+}
+
+VALIDADORES_RAPIDOS = {
+    'ipv4':     _ipv4_rapido,
+    'password': _password_rapido,
+}
+
+def _validar_bloque(tipo, bloque, rapido=False):
+    validador = VALIDADORES_RAPIDOS[tipo] if rapido else VALIDADORES_LOTE[tipo]
+    # map() sobre el método compilado evita la llamada a la función Python por registro
+    return bytearray(map(bool, map(validador, bloque)))
+
+def validar_lote(tipo, datos, procesos=None, tam_bloque=100_000, rapido=False):
+    """Valida un iterable de registros y regresa un bytearray con 1 (válido)
+    o 0 (inválido) por registro, en el mismo orden.
+    rapido=True usa el camino sin regex (sólo 'ipv4' y 'password').
+    Con procesos > 1 los bloques se reparten en un pool de procesos; sólo se
+    mantienen en vuelo unos cuantos bloques para no cargar toda la entrada."""
+    if tipo not in VALIDADORES_LOTE:
+        raise ValueError(f"Tipo desconocido: '{tipo}'. Opciones: {list(VALIDADORES_LOTE)}")
+    if rapido and tipo not in VALIDADORES_RAPIDOS:
+        raise ValueError(f"Sin camino rápido para '{tipo}'. Opciones: {list(VALIDADORES_RAPIDOS)}")
+    datos = iter(datos)
+    bloques = iter(lambda: list(islice(datos, tam_bloque)), [])
+    resultado = bytearray()
+
+    if not procesos or procesos <= 1:
+        for bloque in bloques:
+            resultado += _validar_bloque(tipo, bloque, rapido)
+        return resultado
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        en_vuelo = deque()
+        for bloque in bloques:
+            en_vuelo.append(pool.submit(_validar_bloque, tipo, bloque, rapido))
+            if len(en_vuelo) >= 2 * procesos:
+                resultado += en_vuelo.popleft().result()
+        while en_vuelo:
+            resultado += en_vuelo.popleft().result()
+    return resultado
 
 # Casos de prueba
 if __name__ == "__main__":
@@ -36,9 +134,14 @@ if __name__ == "__main__":
     # IPv4
     validar_ipv4 ("192.168.1.1") #== True
     validar_ipv4 ("256.1.1.1") #== False
+    validar_ipv4 ("192.168.1.1", rapido=True) #== True
 
     # Password
     validar_password_fuerte ("Abc123!Xyz456#") #== True
     validar_password_fuerte ("Password1!") #== False
+    validar_password_fuerte ("Abc123!Xyz456#", rapido=True) #== True
+
+    # Lote
+    validar_lote ("ipv4", ["192.168.1.1", "256.1.1.1", "10.0.0.1"]) #== bytearray(b'\x01\x00\x01')
 
-    print("Todos los tests pasaron!")
\ No newline at end of file
+    print("Todos los tests pasaron!")
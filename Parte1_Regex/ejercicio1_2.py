@@ -1,62 +1,330 @@
+import heapq
+import math
+import os
 import re
+import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import repeat
 
-def analizar_log(archivo):
-    """Analiza archivo de log y extrae información relevante"""
+# Módulos compartidos entre las partes del repositorio (carpeta comun/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.fragmentos import abrir_fragmento, fronteras_lineas  # noqa: E402
+
+# a) Entradas de tipo ERROR (timestamp y mensaje)
+# Buscamos: Fecha y hora, luego [ERROR] y capturamos el resto de la línea
+RE_ERROR = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[ERROR\] (.*)')
+
+# b) IPs, c) rutas de archivos, d) tipo de mensaje y e) tiempos en ms.
+# Cada categoría se busca por separado, como en el análisis original: una
+# IP o un tiempo dentro de una ruta cuenta en las dos categorías
+RE_IP = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+RE_ARCHIVO = re.compile(r'/[a-zA-Z0-9._/-]+\.[a-z]{2,4}')
+RE_TIPO = re.compile(r'\[(ERROR|INFO|WARNING)\]')
+RE_TIEMPO = re.compile(r'\d+ms')
+
+
+# ─────────────────────────────────────────────
+#  Resúmenes (sketches) de memoria constante
+# ─────────────────────────────────────────────
+
+class HyperLogLog:
+    """Número aproximado de valores distintos con 2^p registros de un byte.
+    Error estándar relativo ≈ 1.04/√(2^p): 0.81 % con p=14 (16 KB).
+    Usa un hash estable (blake2b) para poder fusionar resultados de otros procesos"""
+    def __init__(self, p=14):
+        self.p = p
+        self.m = 1 << p
+        self.registros = bytearray(self.m)
+
+    def agregar(self, valor):
+        h = int.from_bytes(blake2b(valor.encode(), digest_size=8).digest(), 'big')
+        resto = 64 - self.p
+        j = h >> resto
+        # Posición del primer 1 en los bits restantes
+        rango = resto - (h & ((1 << resto) - 1)).bit_length() + 1
+        if rango > self.registros[j]:
+            self.registros[j] = rango
+
+    def fusionar(self, otro):
+        self.registros = bytearray(map(max, self.registros, otro.registros))
+        return self
+
+    def estimar(self):
+        m = self.m
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / sum(2.0 ** -r for r in self.registros)
+        ceros = self.registros.count(0)
+        if estimacion <= 2.5 * m and ceros:
+            # Rango pequeño: conteo lineal
+            estimacion = m * math.log(m / ceros)
+        return round(estimacion)
+
+
+class TopK:
+    """Elementos más frecuentes con el algoritmo Space-Saving y k contadores.
+    Todo elemento con frecuencia real > N/k aparece, y cada conteo reportado
+    sobreestima el real en a lo más N/k (N = elementos vistos). Al fusionar
+    resúmenes las cotas se suman, así que siguen valiendo con el N total"""
+    def __init__(self, k=100):
+        self.k = k
+        self.total = 0
+        self.conteos = {}   # elemento -> conteo estimado
+        self._heap = []     # (conteo, elemento), con entradas viejas que se descartan al sacar
+
+    def agregar(self, elemento, veces=1):
+        self.total += veces
+        conteos = self.conteos
+        if elemento in conteos:
+            conteos[elemento] += veces
+        elif len(conteos) < self.k:
+            conteos[elemento] = veces
+        else:
+            # Reemplaza al mínimo y hereda su conteo como cota de error
+            while True:
+                c, viejo = heapq.heappop(self._heap)
+                if conteos.get(viejo) == c:
+                    break
+            del conteos[viejo]
+            conteos[elemento] = c + veces
+        heapq.heappush(self._heap, (conteos[elemento], elemento))
+        if len(self._heap) > 8 * self.k:
+            self._heap = [(c, e) for e, c in conteos.items()]
+            heapq.heapify(self._heap)
+
+    def minimo(self):
+        """Cota del conteo de cualquier elemento ausente: el menor contador si
+        el resumen está lleno, 0 si no (entonces no ha descartado nada)"""
+        return min(self.conteos.values()) if len(self.conteos) >= self.k else 0
+
+    def fusionar(self, otro):
+        # Space-Saving fusionable: un elemento ausente de un resumen pudo
+        # aparecer ahí hasta su mínimo veces, así que se suma ese mínimo; con 0
+        # el conteo fusionado podría quedar por debajo del real
+        min_propio, min_otro = self.minimo(), otro.minimo()
+        suma = {e: c + otro.conteos.get(e, min_otro) for e, c in self.conteos.items()}
+        for e, c in otro.conteos.items():
+            if e not in suma:
+                suma[e] = c + min_propio
+        self.conteos = dict(heapq.nlargest(self.k, suma.items(), key=lambda x: x[1]))
+        self.total += otro.total
+        self._heap = [(c, e) for e, c in self.conteos.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def mas_comunes(self, n=10):
+        return sorted(self.conteos.items(), key=lambda x: (-x[1], x[0]))[:n]
+
+
+class Cuantiles:
+    """Cuantiles aproximados con cubetas logarítmicas (estilo DDSketch).
+    Cada cuantil tiene error relativo ≤ alfa respecto al valor real de ese
+    rango; las cubetas crecen con log(max/min), no con la cantidad de datos
+    (con alfa=1 % bastan ~1,000 cubetas para valores de 1 ms a 10^9 ms)"""
+    def __init__(self, alfa=0.01):
+        self.alfa = alfa
+        self.gamma = (1 + alfa) / (1 - alfa)
+        self._log_gamma = math.log(self.gamma)
+        self.cubetas = Counter()
+        self.ceros = 0
+        self.total = 0
+
+    def agregar(self, valor):
+        self.total += 1
+        if valor <= 0:
+            self.ceros += 1
+        else:
+            self.cubetas[math.ceil(math.log(valor) / self._log_gamma)] += 1
+
+    def fusionar(self, otro):
+        self.cubetas.update(otro.cubetas)
+        self.ceros += otro.ceros
+        self.total += otro.total
+        return self
+
+    def cuantil(self, q):
+        """Valor aproximado del elemento en la posición int(q * (total - 1)) del orden"""
+        if not self.total:
+            return None
+        rango = int(q * (self.total - 1))
+        acumulado = self.ceros
+        if rango < acumulado:
+            return 0
+        for i in sorted(self.cubetas):
+            acumulado += self.cubetas[i]
+            if rango < acumulado:
+                return 2 * self.gamma ** i / (self.gamma + 1)
+
+
+# Ejemplos que se guardan con aproximado=True si no se indica max_muestras
+MUESTRAS_APROXIMADO = 100
+
+class ResultadoLog:
+    """Agregados de un análisis de log. Errores, archivos y tiempos guardan
+    a lo más max_muestras ejemplos (None = todos); los totales siempre son exactos.
+    Con aproximado=True las IPs no se guardan: se usan HyperLogLog para las
+    distintas, Space-Saving para IPs y archivos más frecuentes y cubetas
+    logarítmicas para p50/p95/p99 de los tiempos, todos de memoria constante;
+    las muestras quedan acotadas (MUESTRAS_APROXIMADO si max_muestras es None)"""
+    def __init__(self, archivo, max_muestras=None, aproximado=False):
+        if aproximado and max_muestras is None:
+            max_muestras = MUESTRAS_APROXIMADO
+        self.archivo = archivo
+        self.max_muestras = max_muestras
+        self.aproximado = aproximado
+        if aproximado:
+            self.ips_distintas = HyperLogLog()
+            self.top_ips = TopK()
+            self.top_archivos = TopK()
+            self.cuantiles_ms = Cuantiles()
+        self.errores = []          # (fecha, mensaje)
+        self.total_errores = 0
+        self.ips = set()
+        self.archivos = []
+        self.total_archivos = 0
+        self.tipos = Counter()
+        self.tiempos = []          # como aparecen en el log, ej. '1234ms'
+        self.total_tiempos = 0
+        self.suma_ms = 0
+        self.min_ms = None
+        self.max_ms = None
+
+    def _muestra(self, lista, valor):
+        if self.max_muestras is None or len(lista) < self.max_muestras:
+            lista.append(valor)
+
+    def procesar_linea(self, linea):
+        # Cada patrón necesita un carácter fijo; 'in' descarta la mayoría de
+        # las líneas sin llamar al motor de regex
+        if '.' in linea:
+            for ip in RE_IP.findall(linea):
+                if self.aproximado:
+                    self.ips_distintas.agregar(ip)
+                    self.top_ips.agregar(ip)
+                else:
+                    self.ips.add(ip)
+            if '/' in linea:
+                for ruta in RE_ARCHIVO.findall(linea):
+                    self.total_archivos += 1
+                    self._muestra(self.archivos, ruta)
+                    if self.aproximado:
+                        self.top_archivos.agregar(ruta)
+        error = False
+        if '[' in linea:
+            for tipo in RE_TIPO.findall(linea):
+                self.tipos[tipo] += 1
+                error = error or tipo == 'ERROR'
+        if 'ms' in linea:
+            for t in RE_TIEMPO.findall(linea):
+                ms = int(t[:-2])
+                self.total_tiempos += 1
+                self.suma_ms += ms
+                self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+                self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+                self._muestra(self.tiempos, t)
+                if self.aproximado:
+                    self.cuantiles_ms.agregar(ms)
+        if error:
+            m = RE_ERROR.match(linea.rstrip('\n'))
+            if m:
+                self.total_errores += 1
+                self._muestra(self.errores, m.groups())
+
+    def fusionar(self, otro):
+        """Agrega el resultado de un fragmento posterior del mismo archivo.
+        Fusionar los fragmentos en orden da exactamente el resultado serial"""
+        self.ips |= otro.ips
+        self.tipos += otro.tipos
+        if self.aproximado:
+            self.ips_distintas.fusionar(otro.ips_distintas)
+            self.top_ips.fusionar(otro.top_ips)
+            self.top_archivos.fusionar(otro.top_archivos)
+            self.cuantiles_ms.fusionar(otro.cuantiles_ms)
+        for lista, extra in ((self.errores, otro.errores), (self.archivos, otro.archivos),
+                             (self.tiempos, otro.tiempos)):
+            lista.extend(extra if self.max_muestras is None else extra[:self.max_muestras - len(lista)])
+        self.total_errores += otro.total_errores
+        self.total_archivos += otro.total_archivos
+        self.total_tiempos += otro.total_tiempos
+        self.suma_ms += otro.suma_ms
+        if otro.min_ms is not None:
+            self.min_ms = otro.min_ms if self.min_ms is None else min(self.min_ms, otro.min_ms)
+            self.max_ms = otro.max_ms if self.max_ms is None else max(self.max_ms, otro.max_ms)
+        return self
+
+    def mostrar(self):
+        # --- Mostrar resultados (Formato según Ejemplo de Salida) ---
+        print(f"=== Análisis de {self.archivo} ===\n")
+
+        print("ERRORES encontrados:")
+        for fecha, mensaje in self.errores:
+            print(f"  [{fecha}] {mensaje}")
+
+        if self.aproximado:
+            print(f"\nIPs distintas (aprox.): {self.ips_distintas.estimar()}")
+            print("IPs más frecuentes (aprox.):")
+            for ip, n in self.top_ips.mas_comunes():
+                print(f"  {ip}: {n}")
+        else:
+            print("\nIPs detectadas:")
+            for ip in self.ips:
+                print(f"  {ip}")
+
+        print("\nArchivos mencionados:")
+        for arc in self.archivos:
+            print(f"  {arc}")
+        if self.aproximado:
+            print("Archivos más frecuentes (aprox.):")
+            for arc, n in self.top_archivos.mas_comunes():
+                print(f"  {arc}: {n}")
+
+        print("\nResumen por tipo:")
+        # Orden específico solicitado: ERROR, INFO, WARNING
+        for t in ["ERROR", "INFO", "WARNING"]:
+            print(f"  {t}: {self.tipos.get(t, 0)}")
+
+        print("\nTiempos de ejecución:")
+        for t in self.tiempos:
+            print(f"  {t}")
+        if self.aproximado and self.total_tiempos:
+            p50, p95, p99 = (self.cuantiles_ms.cuantil(q) for q in (0.5, 0.95, 0.99))
+            print(f"  p50 ≈ {p50:.0f}ms  p95 ≈ {p95:.0f}ms  p99 ≈ {p99:.0f}ms")
+
+
+def _analizar_fragmento(archivo, inicio, fin, max_muestras, aproximado):
+    resultado = ResultadoLog(archivo, max_muestras, aproximado)
+    for linea in abrir_fragmento(archivo, inicio, fin):
+        resultado.procesar_linea(linea)
+    return resultado
+
+
+def analizar_log(archivo, max_muestras=None, procesos=None, tam_fragmento=32 << 20, aproximado=False):
+    """Analiza archivo de log línea por línea y regresa un ResultadoLog.
+    La memoria depende sólo de los agregados, no del tamaño del archivo.
+    Con procesos > 1 el archivo se parte en fragmentos de ~tam_fragmento bytes
+    alineados a saltos de línea que se analizan en paralelo y se fusionan en orden.
+    aproximado=True cambia los campos de alta cardinalidad por resúmenes (ver ResultadoLog)"""
+    resultado = ResultadoLog(archivo, max_muestras, aproximado)
     try:
+        if procesos and procesos > 1:
+            fronteras = fronteras_lineas(archivo, tam_fragmento)
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                for parcial in pool.map(_analizar_fragmento, repeat(archivo), fronteras[:-1],
+                                        fronteras[1:], repeat(max_muestras), repeat(aproximado)):
+                    resultado.fusionar(parcial)
+            return resultado
         with open(archivo, 'r', encoding='utf-8') as f:
-            contenido = f.read()
+            for linea in f:
+                resultado.procesar_linea(linea)
     except FileNotFoundError:
         print(f"Error: El archivo {archivo} no fue encontrado.")
-        return
-
-    # a) Extraer entradas de tipo ERROR (timestamp y mensaje)
-    # Buscamos: Fecha y hora, luego [ERROR] y capturamos el resto de la línea
-    patron_error = r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[ERROR\] (.*)$'
-    errores = re.findall(patron_error, contenido, re.MULTILINE)
-
-    # b) Extraer todas las direcciones IP
-    patron_ip = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
-    ips = re.findall(patron_ip, contenido)
-
-    # c) Extraer rutas completas de archivos
-    # Buscamos algo que empiece con / y siga con caracteres de ruta/archivo
-    patron_archivo = r'(/[a-zA-Z0-9._/-]+\.[a-z]{2,4})'
-    archivos = re.findall(patron_archivo, contenido)
-
-    # d) Contar cuántos mensajes hay de cada tipo
-    patron_tipo = r'\[(ERROR|INFO|WARNING)\]'
-    tipos = re.findall(patron_tipo, contenido)
-    contador = Counter(tipos)
-
-    # e) Extraer todos los tiempos de ejecución en milisegundos
-    patron_tiempo = r'(\d+ms)'
-    tiempos = re.findall(patron_tiempo, contenido)
-
-    # --- Mostrar resultados (Formato según Ejemplo de Salida) ---
-    print(f"=== Análisis de {archivo} ===\n")
-
-    print("ERRORES encontrados:")
-    for fecha, mensaje in errores:
-        print(f"  [{fecha}] {mensaje}")
-    
-    print("\nIPs detectadas:")
-    for ip in set(ips): # Usamos set para no repetir IPs si aparecen varias veces
-        print(f"  {ip}")
-
-    print("\nArchivos mencionados:")
-    for arc in archivos:
-        print(f"  {arc}")
-
-    print("\nResumen por tipo:")
-    # Orden específico solicitado: ERROR, INFO, WARNING
-    for t in ["ERROR", "INFO", "WARNING"]:
-        print(f"  {t}: {contador.get(t, 0)}")
-
-    print("\nTiempos de ejecución:")
-    for t in tiempos:
-        print(f"  {t}")
+        return None
+    return resultado
+
 
 if __name__ == "__main__":
     # Asegúrate de que el archivo 'sistema.log' exista en la misma carpeta
-    analizar_log("sistema.log")
\ No newline at end of file
+    resultado = analizar_log("sistema.log")
+    if resultado:
+        resultado.mostrar()
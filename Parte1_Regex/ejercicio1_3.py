@@ -1,4 +1,32 @@
+import os
 import re
+import string
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Módulos compartidos entre las partes del repositorio (carpeta comun/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.fragmentos import abrir_fragmento, estado_trabajador, fronteras_lineas, iniciar_trabajador  # noqa: E402
+
+@lru_cache(maxsize=None)
+def tablas_rot(n):
+    """Tablas de traducción (str y bytes) que rotan n posiciones las letras ASCII"""
+    n %= 26
+    minus, mayus = string.ascii_lowercase, string.ascii_uppercase
+    origen = minus + mayus
+    destino = minus[n:] + minus[:n] + mayus[n:] + mayus[:n]
+    return str.maketrans(origen, destino), bytes.maketrans(origen.encode(), destino.encode())
+
+@lru_cache(maxsize=32)
+def compilar_patrones(patrones):
+    return re.compile("|".join(f"({p})" for p in patrones))
+
+# Todo hasta el último espacio que no siga a ')' (ver CifradorROT._corte_seguro).
+# El '.*' codicioso retrocede desde el final, así que el costo es la distancia al corte
+RE_ULTIMO_CORTE = re.compile(r'.*(?<!\))\s', re.DOTALL)
 
 class CifradorROT:
     def __init__(self, n=13):
@@ -22,39 +50,42 @@ class CifradorROT:
             return chr((ord(char) - ord('A') + n_actual) % 26 + ord('A'))
         return char # No cifra dígitos ni símbolos
 
+    def rotar(self, texto, n_actual):
+        """Equivale a aplicar cifrar_caracter a cada carácter, pero con
+        translate (en C). Se traduce sobre UTF-8: los caracteres no ASCII sólo
+        usan bytes >= 0x80, que la tabla deja intactos"""
+        tabla_str, tabla_bytes = tablas_rot(n_actual)
+        try:
+            return texto.encode('utf-8').translate(tabla_bytes).decode('utf-8')
+        except UnicodeEncodeError:
+            # Sustitutos sueltos no se pueden codificar; la tabla str los deja igual
+            return texto.translate(tabla_str)
+
+    def regex_total(self):
+        """Todos los patrones unidos en uno solo usando OR (|), compilado una vez"""
+        return compilar_patrones(tuple(self.patrones_regex))
+
+    def tramos_protegidos(self, texto):
+        """Lista de (inicio, fin) de cada coincidencia que NO debe cifrarse"""
+        return [m.span() for m in self.regex_total().finditer(texto)]
+
     def procesar_texto(self, texto, n_actual):
-        """Lógica central: Protege patrones, cifra el resto y restaura"""
-        # 1. Identificar y extraer todo lo que DEBE protegerse
-        protegidos = []
-        
-        # Unimos todos los patrones en uno solo usando OR (|)
-        regex_total = "|".join(f"({p})" for p in self.patrones_regex)
-        
-        def guardar_y_marcar(match):
-            protegidos.append(match.group(0))
-            return f"__PROT_{len(protegidos)-1}__"
-
-        # Marcamos el texto: "hola juan@mail.com" -> "hola __PROT_0__"
-        texto_marcado = re.sub(regex_total, guardar_y_marcar, texto)
-
-        # 2. Cifrar el texto que quedó (el que tiene los marcadores)
-        lista_cifrada = [self.cifrar_caracter(c, n_actual) for c in texto_marcado]
-        texto_cifrado = "".join(lista_cifrada)
-
-        # 3. Restaurar los protegidos
-        # Nota: Los marcadores "__PROT_X__" ahora pueden estar cifrados si N != 0
-        # Pero como los marcadores usan guiones bajos y números (que no se cifran),
-        # solo rotan las letras 'PROT'. Los buscaremos con cuidado.
-        
-        def restaurar(match):
-            indice = int(match.group(1))
-            return protegidos[indice]
-
-        # Buscamos el marcador cifrado (PROT rotado n veces)
-        marcador_busqueda = "".join([self.cifrar_caracter(c, n_actual) for c in "PROT"])
-        patron_restaurar = fr'__{marcador_busqueda}_(\d+)__'
-        
-        return re.sub(patron_restaurar, restaurar, texto_cifrado)
+        """Lógica central: cifra todo excepto los tramos protegidos"""
+        tramos = self.tramos_protegidos(texto)
+        if not tramos:
+            return self.rotar(texto, n_actual)
+        # La rotación no cambia la longitud, así que los índices de los tramos
+        # sirven igual en el texto cifrado: se rota todo de una vez y se toman
+        # los huecos de ahí y los tramos del original
+        cifrado = self.rotar(texto, n_actual)
+        partes = []
+        anterior = 0
+        for inicio, fin in tramos:
+            partes.append(cifrado[anterior:inicio])
+            partes.append(texto[inicio:fin])
+            anterior = fin
+        partes.append(cifrado[anterior:])
+        return "".join(partes)
 
     def cifrar_texto(self, texto):
         return self.procesar_texto(texto, self.n)
@@ -63,28 +94,162 @@ class CifradorROT:
         # Descifrar es simplemente rotar en dirección opuesta (26 - N)
         return self.procesar_texto(texto, 26 - self.n)
 
-    def cifrar_archivo(self, entrada, salida):
+    def _corte_seguro(self, texto):
+        """Posición (justo después de un espacio) donde se puede partir el texto
+        sin partir ninguna coincidencia protegida, o None si no hay.
+        URLs, emails y fechas no contienen espacios; el único espacio posible
+        dentro de una coincidencia es el de un teléfono, que va tras ')'"""
+        m = RE_ULTIMO_CORTE.match(texto)
+        return m.end() if m else None
+
+    def procesar_archivo(self, entrada, salida, n_actual, tam_bloque=1 << 20, max_arrastre=16 << 20):
+        """Procesa el archivo por bloques con memoria acotada.
+        El final de cada bloque, desde el último corte seguro, se arrastra al
+        siguiente, así que el resultado es idéntico a procesar todo el texto.
+        Si en max_arrastre caracteres no hay corte seguro (un token sin espacios
+        enorme) se parte ahí y ese token podría no quedar protegido"""
+        with open(entrada, 'r', encoding='utf-8') as f_in, open(salida, 'w', encoding='utf-8') as f_out:
+            pendiente = ""
+            while True:
+                bloque = f_in.read(tam_bloque)
+                texto = pendiente + bloque
+                if not bloque:
+                    f_out.write(self.procesar_texto(texto, n_actual))
+                    return
+                corte = self._corte_seguro(texto)
+                if corte is None:
+                    if len(texto) < max_arrastre:
+                        pendiente = texto
+                        continue
+                    corte = len(texto)
+                f_out.write(self.procesar_texto(texto[:corte], n_actual))
+                pendiente = texto[corte:]
+
+    def cifrar_archivo(self, entrada, salida, tam_bloque=1 << 20):
         try:
-            with open(entrada, 'r', encoding='utf-8') as f:
-                texto = f.read()
-            resultado = self.cifrar_texto(texto)
-            with open(salida, 'w', encoding='utf-8') as f:
-                f.write(resultado)
+            self.procesar_archivo(entrada, salida, self.n, tam_bloque)
             print(f"Archivo cifrado con éxito: {salida}")
         except FileNotFoundError:
             print(f"Error: No se encontró el archivo {entrada}")
 
-    def descifrar_archivo(self, entrada, salida):
+    def descifrar_archivo(self, entrada, salida, tam_bloque=1 << 20):
         try:
-            with open(entrada, 'r', encoding='utf-8') as f:
-                texto = f.read()
-            resultado = self.descifrar_texto(texto)
-            with open(salida, 'w', encoding='utf-8') as f:
-                f.write(resultado)
+            self.procesar_archivo(entrada, salida, 26 - self.n, tam_bloque)
             print(f"Archivo descifrado con éxito: {salida}")
         except FileNotFoundError:
             print(f"Error: No se encontró el archivo {entrada}")
 
+    def cifrar_lote(self, entradas, workers=None, sufijo=".rot", tam_segmento=8 << 20, descifrar=False):
+        """Cifra muchos textos y archivos; regresa un ReporteLote.
+        Las cadenas (str) se cifran en memoria; las rutas (os.PathLike, p. ej.
+        pathlib.Path) se escriben en ruta + sufijo. Los archivos de más de
+        tam_segmento bytes se parten en saltos de línea (ningún patrón protegido
+        contiene uno) y los segmentos se reparten entre los procesos"""
+        n_actual = 26 - self.n if descifrar else self.n
+        reporte = ReporteLote()
+        tareas = []  # (índice de la entrada, argumentos de _procesar_tarea sin el cifrador)
+        for i, entrada in enumerate(entradas):
+            if isinstance(entrada, os.PathLike):
+                ruta = os.fspath(entrada)
+                reporte.agregar(ruta, ruta + sufijo, os.path.getsize(ruta))
+                # Un archivo vacío da fronteras [0, 0]: un segmento vacío, que
+                # igual abre (y deja vacía) su salida en recibir()
+                fronteras = fronteras_lineas(ruta, tam_segmento)
+                tareas.extend((i, (n_actual, None, ruta, inicio, fin))
+                              for inicio, fin in zip(fronteras, fronteras[1:]))
+            else:
+                reporte.agregar(None, None, len(entrada.encode('utf-8', 'surrogatepass')))
+                tareas.append((i, (n_actual, entrada)))
+
+        inicio = time.perf_counter()
+        salida = None
+        actual = None
+
+        def recibir(i, texto, segundos):
+            nonlocal salida, actual
+            destino = reporte.archivos[i]
+            destino[3] += segundos
+            if destino[0] is None:
+                destino[1] = texto
+                return
+            if actual != i:
+                if salida:
+                    salida.close()
+                salida = open(destino[1], 'w', encoding='utf-8')
+                actual = i
+            salida.write(texto)
+
+        try:
+            if not workers or workers <= 1:
+                cifrador = _nuevo_cifrador(self.n, self.patrones_regex)
+                for i, args in tareas:
+                    recibir(i, *_procesar_tarea(cifrador, *args))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=iniciar_trabajador,
+                                         initargs=(_nuevo_cifrador, self.n, self.patrones_regex)) as pool:
+                    # Resultados en orden de envío, con pocas tareas en vuelo
+                    en_vuelo = deque()
+                    for i, args in tareas:
+                        en_vuelo.append((i, pool.submit(_procesar_en_trabajador, *args)))
+                        if len(en_vuelo) >= 2 * workers:
+                            i_listo, futuro = en_vuelo.popleft()
+                            recibir(i_listo, *futuro.result())
+                    while en_vuelo:
+                        i_listo, futuro = en_vuelo.popleft()
+                        recibir(i_listo, *futuro.result())
+        finally:
+            if salida:
+                salida.close()
+        reporte.segundos = time.perf_counter() - inicio
+        return reporte
+
+class ReporteLote:
+    """Resultado de cifrar_lote: [entrada, salida, bytes, segundos] por elemento.
+    Para cadenas, entrada es None y salida es el texto cifrado; segundos es el
+    tiempo de procesamiento sumado de todos sus segmentos"""
+    def __init__(self):
+        self.archivos = []
+        self.segundos = 0.0
+
+    def agregar(self, entrada, salida, tam):
+        self.archivos.append([entrada, salida, tam, 0.0])
+
+    def resultados(self):
+        return [salida for _, salida, _, _ in self.archivos]
+
+    def mostrar(self, max_filas=20):
+        print(f"{'entrada':<40}{'MB':>10}{'s':>9}{'MB/s':>10}")
+        for i, (entrada, _, tam, segundos) in enumerate(self.archivos[:max_filas]):
+            nombre = entrada if entrada is not None else f"<texto {i}>"
+            velocidad = tam / 2**20 / segundos if segundos else 0.0
+            print(f"{nombre[-40:]:<40}{tam / 2**20:>10.2f}{segundos:>9.3f}{velocidad:>10.1f}")
+        if len(self.archivos) > max_filas:
+            print(f"... y {len(self.archivos) - max_filas} más")
+        total = sum(tam for _, _, tam, _ in self.archivos) / 2**20
+        print(f"Total: {len(self.archivos)} elementos, {total:.1f} MB en {self.segundos:.2f} s "
+              f"({total / self.segundos if self.segundos else 0.0:.1f} MB/s)")
+
+# ─────────────────────────────────────────────
+#  Trabajadores de cifrar_lote
+# ─────────────────────────────────────────────
+
+def _nuevo_cifrador(n, patrones):
+    # Un cifrador por proceso; regex_total() compila los patrones aquí, una sola vez
+    cifrador = CifradorROT(n)
+    cifrador.patrones_regex = list(patrones)
+    cifrador.regex_total()
+    return cifrador
+
+def _procesar_tarea(cifrador, n_actual, texto=None, ruta=None, inicio=0, fin=0):
+    t0 = time.perf_counter()
+    if ruta is not None:
+        texto = abrir_fragmento(ruta, inicio, fin).read()
+    return cifrador.procesar_texto(texto, n_actual), time.perf_counter() - t0
+
+def _procesar_en_trabajador(*args):
+    # En el pool, el cifrador es el que iniciar_trabajador creó en ese proceso
+    return _procesar_tarea(estado_trabajador(), *args)
+
 # --- Ejemplo de Ejecución ---
 if __name__ == "__main__":
     # Creamos un archivo de prueba 
@@ -1,28 +1,757 @@
+import mmap
+import os
 import re
-from collections import defaultdict
+import sys
+from array import array
+from collections import defaultdict, deque
+
+
+class _Columnas(dict):
+    """Símbolo -> columna; cualquier carácter fuera del alfabeto cae en la última"""
+    def __init__(self, alfabeto):
+        super().__init__((c, i) for i, c in enumerate(alfabeto))
+        self.otro = len(alfabeto)
+
+    def __missing__(self, c):
+        return self.otro
+
+    def para_bytes(self):
+        """Tabla de 256 entradas para escanear bytes (el alfabeto es ASCII)"""
+        return [self.get(chr(b), self.otro) for b in range(256)]
+
+
+class _EstadoBusqueda:
+    """Estado de una búsqueda en curso que se conserva entre trozos"""
+    __slots__ = ('extendiendo', 'fila', 'pos', 'base', 'piso', 'vivos', 'mejor', 'rastro', 'muertos', 'tope')
+
+    def __init__(self, fila):
+        self.extendiendo = False  # False: buscando un fin; True: simulando desde los inicios posibles
+        self.fila = fila
+        self.pos = 0     # posición dentro del buffer actual
+        self.base = 0    # desplazamiento absoluto de buffer[0]
+        self.piso = 0    # fin absoluto de la última coincidencia reportada
+        self.vivos = None   # fila del AFD anclado -> inicio absoluto más a la izquierda que la alcanza
+        self.mejor = None   # (inicio, fin) de la mejor coincidencia vista hasta ahora
+        # Posición absoluta -> filas del AFD anclado que, vistas ahí en una
+        # extensión anterior, ya no aceptaron más adelante: una corrida que
+        # llegue a ellas no puede alargar nada y se descarta (rastro: las de
+        # la extensión en curso, que sólo se confirman si termina sin recorte)
+        self.rastro = {}
+        self.muertos = {}
+        self.tope = 64      # tamaño de muertos que dispara la poda de posiciones ya pasadas
+
+
+class AFD:
+    """AFD compilado: tabla densa de enteros, una consulta por carácter"""
+    def __init__(self, alfabeto, tabla, inicial, salidas, afnd=None):
+        self.alfabeto = alfabeto
+        self.ancho = len(alfabeto) + 1  # última columna: símbolo fuera del alfabeto
+        self.columnas = _Columnas(alfabeto)
+        # tabla[fila + col] guarda directamente el desplazamiento de la fila destino
+        # (estado * ancho) o -1 para el estado muerto, así no hay multiplicaciones al simular
+        self.tabla = tabla
+        self.inicial = inicial
+        self.salidas = salidas  # por estado: tupla de ids de patrones que aceptan
+        self.aceptacion = bytearray(bool(s) for s in salidas)
+        # Misma información indexada por desplazamiento de fila, para los ciclos de búsqueda
+        self.aceptacion_fila = bytearray(len(salidas) * self.ancho)
+        self.aceptacion_fila[::self.ancho] = self.aceptacion
+        self._afnd = afnd
+        self._busqueda = None
+        self._prefijos = None
+
+    @property
+    def num_estados(self):
+        return len(self.aceptacion)
+
+    def coincide(self, texto):
+        """True si el texto completo pertenece al lenguaje del autómata"""
+        tabla, columnas = self.tabla, self.columnas
+        fila = self.inicial * self.ancho
+        for c in texto:
+            fila = tabla[fila + columnas[c]]
+            if fila < 0:
+                return False
+        return bool(self.aceptacion_fila[fila])
+
+    match = coincide
+
+    def patrones_que_coinciden(self, texto):
+        """Ids de los patrones que reconocen el texto completo"""
+        tabla, columnas = self.tabla, self.columnas
+        fila = self.inicial * self.ancho
+        for c in texto:
+            fila = tabla[fila + columnas[c]]
+            if fila < 0:
+                return ()
+        return self.salidas[fila // self.ancho]
+
+    def escanear(self, trozos):
+        """Una sola pasada sobre un iterable de trozos (str o bytes): produce
+        (fin, ids) por cada posición donde termina una coincidencia de algún
+        patrón. Memoria constante; no necesita guardar texto"""
+        busq, _ = self._tablas_busqueda(con_prefijos=False)
+        tabla, ancho, acepta = busq.tabla, busq.ancho, busq.aceptacion_fila
+        salidas = busq.salidas
+        fila, base, col = busq.inicial * ancho, 0, None
+        for trozo in trozos:
+            if col is None:
+                col = self.columnas if isinstance(trozo, str) else self.columnas.para_bytes()
+            for i, c in enumerate(trozo, base + 1):
+                fila = tabla[fila + col[c]]
+                if acepta[fila]:
+                    yield i, salidas[fila // ancho]
+            base += len(trozo)
+
+    def longitud_maxima(self):
+        """Longitud de la coincidencia más larga, o None si no está acotada.
+        Como los estados muertos ya se eliminaron, cualquier ciclo la hace infinita"""
+        ancho, n = self.ancho, self.num_estados
+        sucesores = [{self.tabla[q * ancho + c] // ancho for c in range(ancho)} - {-1}
+                     for q in range(n)]
+        # Orden topológico (Kahn); si no se visitan todos los estados hay ciclo
+        entrantes = [0] * n
+        for suc in sucesores:
+            for d in suc:
+                entrantes[d] += 1
+        orden = [q for q in range(n) if entrantes[q] == 0]
+        for q in orden:
+            for d in sucesores[q]:
+                entrantes[d] -= 1
+                if entrantes[d] == 0:
+                    orden.append(d)
+        if len(orden) < n:
+            return None
+        mas_larga = [0] * n
+        for q in reversed(orden):
+            mas_larga[q] = max([mas_larga[d] + 1 for d in sucesores[q]], default=0)
+        return mas_larga[self.inicial]
+
+    def _tablas_busqueda(self, con_prefijos=True):
+        """AFD no anclado y, si se pide, el de los prefijos del lenguaje leídos
+        al revés; se construyen una vez"""
+        if self._afnd is None:
+            raise ValueError("El AFD no conserva su AFND; compílalo con GeneradorAFND.compilar()")
+        if self._busqueda is None:
+            self._busqueda = _construir_afd(self._afnd, no_anclado=True)
+        if con_prefijos and self._prefijos is None:
+            self._prefijos = _construir_afd(self._afnd.invertido(self._afnd.coaccesibles()))
+        return self._busqueda, self._prefijos
+
+    def _avanzar(self, buffer, st, col, final, limite=None):
+        """Procesa buffer desde st.pos y produce (inicio, fin) absolutos.
+
+        Semántica POSIX: la coincidencia no vacía que empieza más a la
+        izquierda y, de las que empiezan ahí, la más larga; la siguiente se
+        busca desde su fin, sin traslapes.
+        El AFD no anclado localiza el primer fin de alguna coincidencia. Toda
+        coincidencia que empiece antes tiene que seguir viva ahí, así que con
+        el AFD de prefijos, leyendo hacia atrás, se halla el inicio más a la
+        izquierda posible. Desde ese punto se simula el AFD anclado desde todos
+        los inicios a la vez: una corrida por fila, con el inicio más a la
+        izquierda que la alcanzó (dos corridas en la misma fila tienen el mismo
+        futuro), hasta que mueren todas las que podrían mejorar el resultado.
+        Una fila que en una extensión anterior siguió viva en la misma
+        posición sin volver a aceptar tampoco aceptará ahora: así cada texto
+        se recorre una sola vez aunque las extensiones se traslapen (p. ej.
+        'a|a*b' sobre 'aaaa...'). Con limite, la extensión se corta cuando la
+        coincidencia llega a esa longitud, como el retroceso de buscar_flujo."""
+        busq, pref = self._tablas_busqueda()
+        tb, ab = busq.tabla, busq.aceptacion_fila
+        tp, ap = pref.tabla, pref.aceptacion_fila
+        ta, aa = self.tabla, self.aceptacion_fila
+        inicial = self.inicial * self.ancho
+        n = len(buffer)
+        pos, base = st.pos, st.base
+        while True:
+            if not st.extendiendo:
+                fila = st.fila
+                while pos < n:
+                    fila = tb[fila + col[buffer[pos]]]
+                    pos += 1
+                    if ab[fila]:
+                        break
+                else:
+                    st.fila = fila
+                    break
+                st.fila = busq.inicial * busq.ancho
+                # Inicio más a la izquierda de un prefijo del lenguaje que termina en pos
+                piso = max(st.piso - base, 0)
+                i, inicio, fila = pos, pos, pref.inicial * pref.ancho
+                while i > piso:
+                    i -= 1
+                    fila = tp[fila + col[buffer[i]]]
+                    if fila < 0:
+                        break
+                    if ap[fila]:
+                        inicio = i
+                st.extendiendo, st.vivos, st.mejor = True, {}, None
+                pos = inicio
+            vivos, mejor, rastro, muertos = st.vivos, st.mejor, st.rastro, st.muertos
+            recortado = False
+            while pos < n:
+                if mejor is None and inicial not in vivos:
+                    vivos[inicial] = base + pos
+                c = col[buffer[pos]]
+                pos += 1
+                descartar = muertos.get(base + pos, ())
+                siguientes = {}
+                for fila, ini in vivos.items():
+                    fila = ta[fila + c]
+                    if fila >= 0 and fila not in descartar and siguientes.get(fila, ini) >= ini:
+                        siguientes[fila] = ini
+                nueva = False
+                for fila, ini in siguientes.items():
+                    if aa[fila] and (mejor is None or ini <= mejor[0]):
+                        mejor, nueva = (ini, base + pos), True
+                if mejor is not None:
+                    # Las corridas que empezaron después ya no pueden ganar
+                    siguientes = {f: ini for f, ini in siguientes.items() if ini <= mejor[0]}
+                    if nueva:
+                        rastro = {}
+                    elif siguientes:
+                        rastro[base + pos] = set(siguientes)
+                    if not siguientes:
+                        vivos = siguientes
+                        break
+                    if limite is not None and base + pos - mejor[0] >= limite:
+                        recortado = True
+                        break
+                vivos = siguientes
+            else:
+                if not final:
+                    st.vivos, st.mejor, st.rastro = vivos, mejor, rastro
+                    break
+            yield mejor
+            if not recortado:
+                for p, filas in rastro.items():
+                    if p in muertos:
+                        muertos[p] |= filas
+                    else:
+                        muertos[p] = filas
+            st.extendiendo, st.piso = False, mejor[1]
+            st.vivos = st.mejor = None
+            st.rastro = {}
+            if len(muertos) > st.tope:
+                st.muertos = {p: filas for p, filas in muertos.items() if p > mejor[1]}
+                st.tope = 2 * len(st.muertos) + 64
+            pos = mejor[1] - base
+        st.pos = pos
+
+    def buscar_flujo(self, trozos, max_retroceso=1 << 16):
+        """Busca coincidencias en un iterable de trozos (str o bytes) con
+        memoria acotada; produce (inicio, fin) con desplazamientos absolutos.
+
+        El estado se conserva entre trozos, así que una coincidencia puede
+        cruzar fronteras. Sólo se guarda el texto necesario para hallar el
+        inicio y para alargar la coincidencia: la longitud máxima del patrón,
+        o max_retroceso si no está acotada (coincidencias más largas pueden
+        reportarse recortadas)."""
+        busq, _ = self._tablas_busqueda()
+        retroceso = self.longitud_maxima()
+        if retroceso is None:
+            retroceso = max_retroceso
+        st = _EstadoBusqueda(busq.inicial * busq.ancho)
+        buffer, col = None, None
+        for trozo in trozos:
+            if not trozo:
+                continue
+            if buffer is None:
+                texto = isinstance(trozo, str)
+                buffer = "" if texto else bytearray()
+                col = self.columnas if texto else self.columnas.para_bytes()
+            # Descartar lo que ya no puede formar parte de una coincidencia; al
+            # simular sólo hace falta el texto desde el fin de la mejor, donde
+            # se reanuda la búsqueda
+            if st.extendiendo:
+                corte = st.mejor[1] - st.base if st.mejor else st.pos
+            else:
+                corte = max(st.piso, st.base + st.pos - retroceso) - st.base
+            if corte > 0:
+                buffer = buffer[corte:]
+                st.base += corte
+                st.pos -= corte
+            buffer += trozo
+            yield from self._avanzar(buffer, st, col, False, retroceso)
+        if buffer is not None:
+            yield from self._avanzar(buffer, st, col, True, retroceso)
+
+    def buscar_todo(self, texto):
+        """Tuplas (inicio, fin) de las coincidencias no vacías, sin traslapes y
+        con la semántica de buscar_flujo (más a la izquierda y, desde ahí, la
+        más larga, como POSIX; re.finditer toma la primera alternativa)"""
+        return self.buscar_flujo([texto])
+
+    def buscar_en_archivo(self, ruta):
+        """Escanea un archivo vía mmap sin copiarlo a memoria; desplazamientos en bytes"""
+        with open(ruta, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                busq, _ = self._tablas_busqueda()
+                st = _EstadoBusqueda(busq.inicial * busq.ancho)
+                yield from self._avanzar(mm, st, self.columnas.para_bytes(), final=True)
+
+    search_stream = buscar_flujo
+    finditer = buscar_todo
+
+
+def _minimizar_hopcroft(delta, salidas, k):
+    """Algoritmo de Hopcroft sobre un AFD completo (delta[q][c]). La partición
+    inicial agrupa estados con la misma salida (tupla de patrones que aceptan).
+    Regresa (bloque_de, num_bloques)"""
+    n = len(delta)
+    inversa = [[[] for _ in range(n)] for _ in range(k)]
+    for q in range(n):
+        for c in range(k):
+            inversa[c][delta[q][c]].append(q)
+
+    por_salida = defaultdict(set)
+    for q in range(n):
+        por_salida[salidas[q]].add(q)
+    bloques = list(por_salida.values())
+    bloque_de = [0] * n
+    for i, b in enumerate(bloques):
+        for q in b:
+            bloque_de[q] = i
+    # Basta dejar fuera uno de los bloques iniciales: el más grande
+    mayor = max(range(len(bloques)), key=lambda i: len(bloques[i]))
+    pendientes = set(range(len(bloques))) - {mayor}
+
+    while pendientes:
+        a = pendientes.pop()
+        divisor = list(bloques[a])
+        for c in range(k):
+            # Estados que con 'c' llegan al bloque divisor, agrupados por su bloque
+            tocados = defaultdict(set)
+            for q in divisor:
+                for p in inversa[c][q]:
+                    tocados[bloque_de[p]].add(p)
+            for b, interseccion in tocados.items():
+                if len(interseccion) == len(bloques[b]):
+                    continue
+                resto = bloques[b] - interseccion
+                nuevo = len(bloques)
+                # El bloque original se queda con la parte grande
+                if len(interseccion) <= len(resto):
+                    bloques[b], chico = resto, interseccion
+                else:
+                    bloques[b], chico = interseccion, resto
+                bloques.append(chico)
+                for q in chico:
+                    bloque_de[q] = nuevo
+                # Si 'b' ya estaba pendiente, ambas mitades quedan pendientes;
+                # si no, basta con la mitad chica
+                pendientes.add(nuevo)
+    return bloque_de, len(bloques)
+
+
+def _mover(afnd, clausuras, conjunto):
+    """Conjuntos destino (ya con cerradura-ε) por columna"""
+    sim_inicio, sim_columna, sim_destino = afnd.sim_inicio, afnd.sim_columna, afnd.sim_destino
+    destinos = defaultdict(set)
+    for e in conjunto:
+        for j in range(sim_inicio[e], sim_inicio[e + 1]):
+            destinos[sim_columna[j]] |= clausuras[sim_destino[j]]
+    return destinos
+
+
+def _subconjuntos(afnd, clausuras, k):
+    """Construcción por subconjuntos anclada; el estado 0 es el sumidero y el 1 el inicial"""
+    inicio = clausuras[afnd.inicial]
+    ids = {frozenset(): 0, inicio: 1}
+    conjuntos = [frozenset(), inicio]
+    delta = [[0] * k]
+    i = 1
+    while i < len(conjuntos):
+        fila = [0] * k
+        for col, conjunto in _mover(afnd, clausuras, conjuntos[i]).items():
+            nuevo = frozenset(conjunto)
+            if nuevo not in ids:
+                ids[nuevo] = len(conjuntos)
+                conjuntos.append(nuevo)
+            fila[col] = ids[nuevo]
+        delta.append(fila)
+        i += 1
+    return delta, [afnd.salidas(c) for c in conjuntos]
+
+
+def _subconjuntos_no_anclado(afnd, clausuras, k):
+    """Construcción por subconjuntos de .*R; el estado 0 es el inicial.
+
+    El conjunto real de cada estado es resto ∪ M(c), donde M(c) es el
+    movimiento del inicio con la última columna leída, compartido por todos
+    los estados a los que se llega con c. Guardar sólo (c, resto) evita copiar
+    M(c), que con miles de patrones es enorme, en cada estado; dos claves del
+    mismo conjunto sólo dejan duplicados que después une Hopcroft."""
+    vacio = frozenset()
+    M = {c: frozenset(d) for c, d in _mover(afnd, clausuras, clausuras[afnd.inicial]).items()}
+    # R[c][c2]: lo que aporta M(c) al leer c2 y que no está ya en M(c2)
+    R = {None: {}}
+    for c, conjunto in M.items():
+        R[c] = {c2: frozenset(d - M.get(c2, vacio))
+                for c2, d in _mover(afnd, clausuras, conjunto).items()}
+    salidas_M = {c: set(afnd.salidas(conjunto)) for c, conjunto in M.items()}
+    salidas_M[None] = set()
+
+    claves = [(None, vacio)]
+    ids = {claves[0]: 0}
+    delta, salidas = [], []
+    i = 0
+    while i < len(claves):
+        base, resto = claves[i]
+        i += 1
+        destinos = _mover(afnd, clausuras, resto)
+        fila = [0] * k
+        for col in range(k):
+            nuevo_resto = destinos[col] - M.get(col, vacio) if col in destinos else set()
+            nuevo_resto |= R[base].get(col, vacio)
+            clave = (col if col in M else None, frozenset(nuevo_resto))
+            if clave not in ids:
+                ids[clave] = len(claves)
+                claves.append(clave)
+            fila[col] = ids[clave]
+        delta.append(fila)
+        salidas.append(tuple(sorted(salidas_M[base].union(afnd.salidas(resto)))))
+    return delta, salidas
+
+
+def _construir_afd(afnd, no_anclado=False, conservar_afnd=False):
+    """Construcción por subconjuntos + minimización de Hopcroft.
+
+    Con no_anclado=True el AFD reconoce coincidencias que terminan en cada
+    posición (equivale a .*R): el inicio se reinyecta en cada paso y un
+    estado acepta si alguna coincidencia no vacía termina ahí."""
+    clausuras = afnd.clausuras()
+    k = len(afnd.alfabeto) + 1  # última columna: símbolo fuera del alfabeto
+
+    # 1. Construcción por subconjuntos
+    if no_anclado:
+        delta, salidas = _subconjuntos_no_anclado(afnd, clausuras, k)
+    else:
+        delta, salidas = _subconjuntos(afnd, clausuras, k)
+
+    # 2. Minimización; si es anclado, el bloque del sumidero agrupa a todos los estados muertos
+    bloque_de, num_bloques = _minimizar_hopcroft(delta, salidas, k)
+    muerto = -1 if no_anclado else bloque_de[0]
+    inicial = bloque_de[0] if no_anclado else bloque_de[1]
+
+    # 3. Renumerar en orden BFS desde el inicial para mejor localidad en la tabla
+    orden = {inicial: 0}
+    representante = {bloque_de[q]: q for q in range(len(delta))}
+    cola = deque([inicial])
+    while cola:
+        b = cola.popleft()
+        for d in delta[representante[b]]:
+            bd = bloque_de[d]
+            if bd != muerto and bd not in orden:
+                orden[bd] = len(orden)
+                cola.append(bd)
+
+    tabla = array('i', [-1]) * (len(orden) * k)
+    salidas_afd = [()] * len(orden)
+    for b, nuevo in orden.items():
+        q = representante[b]
+        salidas_afd[nuevo] = salidas[q]
+        for j, d in enumerate(delta[q]):
+            bd = bloque_de[d]
+            if bd != muerto:
+                tabla[nuevo * k + j] = orden[bd] * k
+    return AFD(afnd.alfabeto, tabla, 0, salidas_afd, afnd if conservar_afnd else None)
+
+
+class AFNDCompacto:
+    """AFND con estados enteros y aristas en formato CSR sobre arreglos planos.
+
+    Las aristas del estado q con símbolo están en las posiciones
+    sim_inicio[q]..sim_inicio[q+1] de sim_columna/sim_destino, y sus
+    transiciones ε en eps_inicio[q]..eps_inicio[q+1] de eps_destinos.
+    'patrones' asocia cada estado final con el id del patrón que reconoce."""
+    __slots__ = ('alfabeto', 'num_estados', 'sim_inicio', 'sim_columna', 'sim_destino',
+                 'eps_inicio', 'eps_destinos', 'inicial', 'finales', 'patrones')
+
+    def __init__(self, alfabeto, sim_inicio, sim_columna, sim_destino,
+                 eps_inicio, eps_destinos, inicial, finales):
+        self.alfabeto = alfabeto
+        self.num_estados = len(sim_inicio) - 1
+        self.sim_inicio = sim_inicio
+        self.sim_columna = sim_columna
+        self.sim_destino = sim_destino
+        self.eps_inicio = eps_inicio
+        self.eps_destinos = eps_destinos
+        self.inicial = inicial
+        # finales: {estado: id_patron}, o un conjunto de estados si hay un solo patrón
+        self.patrones = dict(finales) if isinstance(finales, dict) else dict.fromkeys(finales, 0)
+        self.finales = frozenset(self.patrones)
+
+    @classmethod
+    def desde_aristas(cls, alfabeto, etiquetadas, epsilon, inicial, finales):
+        """Construye desde listas por estado: etiquetadas[q] = [(col, destino)],
+        epsilon[q] = [destino]"""
+        sim_inicio = array('i', [0])
+        sim_columna, sim_destino = array('i'), array('i')
+        for aristas in etiquetadas:
+            for col, dest in aristas:
+                sim_columna.append(col)
+                sim_destino.append(dest)
+            sim_inicio.append(len(sim_columna))
+        eps_inicio, eps_destinos = array('i', [0]), array('i')
+        for destinos in epsilon:
+            eps_destinos.extend(destinos)
+            eps_inicio.append(len(eps_destinos))
+        return cls(alfabeto, sim_inicio, sim_columna, sim_destino,
+                   eps_inicio, eps_destinos, inicial, finales)
+
+    @classmethod
+    def desde_transiciones(cls, estados, transiciones, inicial, finales, alfabeto):
+        """Convierte la representación con nombres 'qN' y diccionarios anidados"""
+        nombres = sorted(estados, key=lambda x: int(x[1:]))
+        ids = {e: i for i, e in enumerate(nombres)}
+        columnas = {c: i for i, c in enumerate(alfabeto)}
+        etiquetadas, epsilon = [], []
+        for e in nombres:
+            trans = transiciones.get(e, {})
+            etiquetadas.append([(columnas[s], ids[d]) for s in sorted(trans) if s != 'ε'
+                                for d in sorted(trans[s], key=ids.get)])
+            epsilon.append(sorted(ids[d] for d in trans.get('ε', ())))
+        return cls.desde_aristas(alfabeto, etiquetadas, epsilon, ids[inicial], {ids[f] for f in finales})
+
+    def epsilon(self, q):
+        return self.eps_destinos[self.eps_inicio[q]:self.eps_inicio[q + 1]]
+
+    def etiquetadas(self, q):
+        ini, fin = self.sim_inicio[q], self.sim_inicio[q + 1]
+        return zip(self.sim_columna[ini:fin], self.sim_destino[ini:fin])
+
+    def clausuras(self):
+        """Cerradura-ε del estado inicial y de cada destino de arista etiquetada
+        (los únicos que usa la construcción por subconjuntos), restringida a
+        estados 'importantes': con aristas etiquetadas o finales"""
+        importantes = [self.sim_inicio[q] != self.sim_inicio[q + 1] or q in self.finales
+                       for q in range(self.num_estados)]
+        eps_inicio, eps_destinos = self.eps_inicio, self.eps_destinos
+        resultado = {}
+        for q in {self.inicial, *self.sim_destino}:
+            visitados = {q}
+            pila = [q]
+            while pila:
+                actual = pila.pop()
+                for i in range(eps_inicio[actual], eps_inicio[actual + 1]):
+                    sig = eps_destinos[i]
+                    if sig not in visitados:
+                        visitados.add(sig)
+                        pila.append(sig)
+            resultado[q] = frozenset(e for e in visitados if importantes[e])
+        return resultado
+
+    def salidas(self, conjunto):
+        """Ids (ordenados) de los patrones que aceptan en un conjunto de estados"""
+        return tuple(sorted({self.patrones[q] for q in conjunto & self.finales}))
+
+    def coaccesibles(self):
+        """Estados desde los que se puede llegar a algún final"""
+        entrantes = [[] for _ in range(self.num_estados)]
+        for q in range(self.num_estados):
+            for _, d in self.etiquetadas(q):
+                entrantes[d].append(q)
+            for d in self.epsilon(q):
+                entrantes[d].append(q)
+        vistos = set(self.finales)
+        pila = list(vistos)
+        while pila:
+            for p in entrantes[pila.pop()]:
+                if p not in vistos:
+                    vistos.add(p)
+                    pila.append(p)
+        return vistos
+
+    def invertido(self, desde=None):
+        """AFND del lenguaje invertido: aristas al revés y un nuevo estado
+        inicial con ε hacia los antiguos finales. Con desde=coaccesibles()
+        reconoce los prefijos del lenguaje leídos al revés"""
+        n = self.num_estados
+        etiquetadas = [[] for _ in range(n + 1)]
+        epsilon = [[] for _ in range(n + 1)]
+        for q in range(n):
+            for col, d in self.etiquetadas(q):
+                etiquetadas[d].append((col, q))
+            for d in self.epsilon(q):
+                epsilon[d].append(q)
+        epsilon[n] = sorted(self.finales if desde is None else desde)
+        return AFNDCompacto.desde_aristas(self.alfabeto, etiquetadas, epsilon, n, {self.inicial})
+
+    def a_transiciones(self):
+        """Vista con nombres 'qN' y diccionarios, como la representación original"""
+        transiciones = defaultdict(lambda: defaultdict(set))
+        for q in range(self.num_estados):
+            for col, d in self.etiquetadas(q):
+                transiciones[f"q{q}"][self.alfabeto[col]].add(f"q{d}")
+            for d in self.epsilon(q):
+                transiciones[f"q{q}"]['ε'].add(f"q{d}")
+        return transiciones
+
+
+class AFDPerezoso:
+    """Simula el AFND construyendo los estados del AFD sólo cuando se visitan.
+
+    Los estados se guardan en una caché acotada por memoria_max (bytes
+    estimados); al llenarse se vacía completa y la simulación continúa desde
+    el estado actual, como hace RE2. Así la memoria queda acotada incluso en
+    patrones donde la construcción por subconjuntos explota."""
+    NO_CALCULADO = -2
+
+    def __init__(self, afnd, memoria_max=1 << 20):
+        self.alfabeto = afnd.alfabeto
+        # Al menos una columna: con alfabeto vacío las filas siguen siendo distintas
+        self.ancho = max(len(afnd.alfabeto), 1)
+        self.columnas = {c: i for i, c in enumerate(afnd.alfabeto)}
+        self.memoria_max = memoria_max
+        self._afnd = afnd
+        self.clausuras = afnd.clausuras()
+        # Movimientos por estado del AFND, ya con la cerradura del destino
+        self._movimientos = [[(col, self.clausuras[d]) for col, d in afnd.etiquetadas(q)]
+                             for q in range(afnd.num_estados)]
+        self.salidas = []
+        self._inicio = self.clausuras[afnd.inicial]
+        self.tabla = array('i')
+        self.aceptacion = bytearray()
+        self._ids = {}
+        self._conjuntos = []
+        self.memoria = 0
+        self.vaciados = 0
+        self._agregar(self._inicio)
+
+    @property
+    def num_estados(self):
+        return len(self._conjuntos)
+
+    def _agregar(self, conjunto):
+        fila = len(self.tabla)
+        self._ids[conjunto] = fila
+        self._conjuntos.append(conjunto)
+        self.tabla.extend([self.NO_CALCULADO] * self.ancho)
+        salida = self._afnd.salidas(conjunto)
+        self.salidas.append(salida)
+        self.aceptacion.append(bool(salida))
+        # Fila de la tabla + conjunto + entrada del diccionario
+        self.memoria += self.ancho * self.tabla.itemsize + sys.getsizeof(conjunto) + 100
+        return fila
+
+    def _vaciar(self):
+        # Se limpia en su lugar para que las referencias locales sigan siendo válidas
+        del self.tabla[:]
+        self.aceptacion.clear()
+        self.salidas.clear()
+        self._ids.clear()
+        self._conjuntos.clear()
+        self.memoria = 0
+        self.vaciados += 1
+        self._agregar(self._inicio)
+
+    def _calcular(self, fila, col):
+        """Calcula (y guarda en caché) la transición desde 'fila' con 'col'"""
+        destino = set()
+        for e in self._conjuntos[fila // self.ancho]:
+            for c, clausura in self._movimientos[e]:
+                if c == col:
+                    destino |= clausura
+        if not destino:
+            self.tabla[fila + col] = -1
+            return -1
+        destino = frozenset(destino)
+        nueva = self._ids.get(destino)
+        if nueva is None:
+            if self.memoria >= self.memoria_max:
+                # Caché llena: se descarta todo y se sigue desde el destino
+                self._vaciar()
+                nueva = self._ids.get(destino)
+                return self._agregar(destino) if nueva is None else nueva
+            nueva = self._agregar(destino)
+        self.tabla[fila + col] = nueva
+        return nueva
+
+    def _recorrer(self, texto):
+        """Fila final tras consumir el texto, o -1 si el autómata muere"""
+        tabla, columnas, calcular = self.tabla, self.columnas, self._calcular
+        fila = 0
+        for c in texto:
+            col = columnas.get(c)
+            if col is None:
+                return -1
+            sig = tabla[fila + col]
+            if sig == -2:  # NO_CALCULADO
+                sig = calcular(fila, col)
+            if sig < 0:
+                return -1
+            fila = sig
+        return fila
+
+    def coincide(self, texto):
+        """True si el texto completo pertenece al lenguaje del autómata"""
+        fila = self._recorrer(texto)
+        return fila >= 0 and bool(self.aceptacion[fila // self.ancho])
+
+    match = coincide
+
+    def patrones_que_coinciden(self, texto):
+        """Ids de los patrones que reconocen el texto completo"""
+        fila = self._recorrer(texto)
+        return self.salidas[fila // self.ancho] if fila >= 0 else ()
+
 
 class GeneradorAFND:
     def __init__(self, regex):
+        # Acepta una regex o una lista de ellas; con varias se construye un solo
+        # autómata cuyos finales indican qué patrón (por posición en la lista) reconocen
         self.regex = regex
-        self.estados = set()
-        self.transiciones = defaultdict(lambda: defaultdict(set))
-        self.estado_inicial = None
-        self.estados_finales = set()
-        self.alfabeto = sorted(list(set(re.findall(r'[a-zA-Z0-9]', regex))))
+        self.patrones = [regex] if isinstance(regex, str) else list(regex)
+        self.alfabeto = sorted(set(re.findall(r'[a-zA-Z0-9]', "".join(self.patrones))))
         self.contador_estados = 0
+        self.afnd = None
+        # Arreglos de construcción: en Thompson cada estado tiene a lo más
+        # una arista con símbolo y dos transiciones ε
+        self._simbolo = array('i')
+        self._destino = array('i')
+        self._eps_a = array('i')
+        self._eps_b = array('i')
+        self._eps_union = []  # ε del estado raíz cuando hay varios patrones
 
     def nuevo_estado(self):
-        estado = f"q{self.contador_estados}"
+        estado = self.contador_estados
         self.contador_estados += 1
-        self.estados.add(estado)
+        for arreglo in (self._simbolo, self._destino, self._eps_a, self._eps_b):
+            arreglo.append(-1)
         return estado
 
+    def _epsilon(self, origen, a, b=-1):
+        self._eps_a[origen], self._eps_b[origen] = a, b
+
+    # Vista compatible con la representación anterior (nombres 'qN')
+    @property
+    def estados(self):
+        return {f"q{i}" for i in range(self.afnd.num_estados)} if self.afnd else set()
+
+    @property
+    def transiciones(self):
+        return self.afnd.a_transiciones() if self.afnd else defaultdict(lambda: defaultdict(set))
+
+    @property
+    def estado_inicial(self):
+        return f"q{self.afnd.inicial}" if self.afnd else None
+
+    @property
+    def estados_finales(self):
+        return {f"q{f}" for f in self.afnd.finales} if self.afnd else set()
+
     def validar_regex(self):
+        return bool(self.patrones) and all(self._validar_patron(p) for p in self.patrones)
+
+    def _validar_patron(self, regex):
         # Soporta letras, números y los operadores: | * + ? ( )
         patron = r'^[a-zA-Z0-9|()*+?]+$'
-        if not re.fullmatch(patron, self.regex): return False
+        if not re.fullmatch(patron, regex): return False
         pila = []
-        for c in self.regex:
+        for c in regex:
             if c == '(': pila.append(c)
             elif c == ')':
                 if not pila: return False
@@ -56,75 +785,126 @@ class GeneradorAFND:
         return salida
 
     def generar_afnd(self):
-        postfix = self.infix_to_postfix(self.regex)
+        columnas = {c: i for i, c in enumerate(self.alfabeto)}
+        fragmentos = [self._fragmento(p, columnas) for p in self.patrones]
+        if len(fragmentos) == 1:
+            inicial, final = fragmentos[0]
+            self.afnd = self._congelar(inicial, {final: 0})
+            return
+        inicial = self.nuevo_estado()
+        self._eps_union = [ini for ini, _ in fragmentos]
+        self.afnd = self._congelar(inicial, {fin: i for i, (_, fin) in enumerate(fragmentos)})
+
+    def _fragmento(self, regex, columnas):
+        """Construcción de Thompson de un patrón; regresa (inicial, final)"""
+        postfix = self.infix_to_postfix(regex)
         pila = []
 
         for simbolo in postfix:
             if simbolo.isalnum():
                 ini, fin = self.nuevo_estado(), self.nuevo_estado()
-                self.transiciones[ini][simbolo].add(fin)
+                self._simbolo[ini], self._destino[ini] = columnas[simbolo], fin
                 pila.append((ini, fin))
             elif simbolo == '*':
                 a_ini, a_fin = pila.pop()
                 ini, fin = self.nuevo_estado(), self.nuevo_estado()
-                self.transiciones[ini]['ε'] = {a_ini, fin}
-                self.transiciones[a_fin]['ε'] = {a_ini, fin}
+                self._epsilon(ini, a_ini, fin)
+                self._epsilon(a_fin, a_ini, fin)
                 pila.append((ini, fin))
             elif simbolo == '+':
                 a_ini, a_fin = pila.pop()
                 ini, fin = self.nuevo_estado(), self.nuevo_estado()
-                self.transiciones[ini]['ε'] = {a_ini}
-                self.transiciones[a_fin]['ε'] = {a_ini, fin}
+                self._epsilon(ini, a_ini)
+                self._epsilon(a_fin, a_ini, fin)
                 pila.append((ini, fin))
             elif simbolo == '?':
                 a_ini, a_fin = pila.pop()
                 ini, fin = self.nuevo_estado(), self.nuevo_estado()
-                self.transiciones[ini]['ε'] = {a_ini, fin}
-                self.transiciones[a_fin]['ε'] = {fin}
+                self._epsilon(ini, a_ini, fin)
+                self._epsilon(a_fin, fin)
                 pila.append((ini, fin))
             elif simbolo == '|':
                 (a2_i, a2_f), (a1_i, a1_f) = pila.pop(), pila.pop()
                 ini, fin = self.nuevo_estado(), self.nuevo_estado()
-                self.transiciones[ini]['ε'] = {a1_i, a2_i}
-                self.transiciones[a1_f]['ε'] = {fin}
-                self.transiciones[a2_f]['ε'] = {fin}
+                self._epsilon(ini, a1_i, a2_i)
+                self._epsilon(a1_f, fin)
+                self._epsilon(a2_f, fin)
                 pila.append((ini, fin))
             elif simbolo == '.':
                 (a2_i, a2_f), (a1_i, a1_f) = pila.pop(), pila.pop()
-                self.transiciones[a1_f]['ε'] = {a2_i}
+                self._epsilon(a1_f, a2_i)
                 pila.append((a1_i, a2_f))
 
-        self.estado_inicial, final = pila.pop()
-        self.estados_finales.add(final)
+        return pila.pop()
+
+    def _congelar(self, inicial, finales):
+        """Pasa los arreglos de construcción a formato CSR"""
+        n = self.contador_estados
+        sim_inicio, eps_inicio = array('i', [0]), array('i', [0])
+        sim_columna, sim_destino, eps_destinos = array('i'), array('i'), array('i')
+        for q in range(n):
+            if self._simbolo[q] >= 0:
+                sim_columna.append(self._simbolo[q])
+                sim_destino.append(self._destino[q])
+            sim_inicio.append(len(sim_columna))
+            for d in (self._eps_a[q], self._eps_b[q]):
+                if d >= 0:
+                    eps_destinos.append(d)
+            if q == inicial and self._eps_union:
+                eps_destinos.extend(self._eps_union)
+            eps_inicio.append(len(eps_destinos))
+        return AFNDCompacto(self.alfabeto, sim_inicio, sim_columna, sim_destino,
+                            eps_inicio, eps_destinos, inicial, finales)
+
+    def compilar(self, modo="afd", memoria_max=1 << 20):
+        """Construcción por subconjuntos + minimización de Hopcroft.
+        Regresa un AFD con tabla de transiciones densa; con modo="perezoso"
+        regresa un AFDPerezoso con caché acotada por memoria_max bytes"""
+        if self.afnd is None:
+            self.generar_afnd()
+        if modo == "perezoso":
+            return AFDPerezoso(self.afnd, memoria_max)
+        if modo != "afd":
+            raise ValueError(f"Modo desconocido: '{modo}'. Opciones: afd, perezoso")
+        return _construir_afd(self.afnd, conservar_afnd=True)
+
+    compile = compilar
 
     def mostrar_automata(self):
-        print(f"\n=== Autómata para: {self.regex} ===")
-        print(f"Estados: {{{', '.join(sorted(self.estados, key=lambda x: int(x[1:])))}}}")
+        afnd = self.afnd
+        n = afnd.num_estados
+        print(f"\n=== Autómata para: {', '.join(self.patrones)} ===")
+        print(f"Estados: {{{', '.join(f'q{i}' for i in range(n))}}}")
         print(f"Alfabeto: {{{', '.join(self.alfabeto)}}}")
-        print(f"Estado inicial: {self.estado_inicial}")
-        print(f"Estados finales: {{{', '.join(self.estados_finales)}}}")
+        print(f"Estado inicial: q{afnd.inicial}")
+        print(f"Estados finales: {{{', '.join(f'q{f}' for f in sorted(afnd.finales))}}}")
 
         # Dibujar Tabla
-        cols = self.alfabeto + (['ε'] if any('ε' in d for d in self.transiciones.values()) else [])
+        tiene_epsilon = len(afnd.eps_destinos) > 0
+        cols = self.alfabeto + (['ε'] if tiene_epsilon else [])
         header = f"+----------" + "".join([f"+-----------" for _ in cols]) + "+"
         print("\nTabla de transiciones:")
         print(header)
         print(f"| Estado   " + "".join([f"| {c:<9} " for c in cols]) + "|")
         print(header)
-        
-        for est in sorted(self.estados, key=lambda x: int(x[1:])):
-            linea = f"| {est:<8} "
-            for c in cols:
-                dest = self.transiciones[est].get(c, set())
-                dest_str = "{" + ",".join(sorted(dest)) + "}" if dest else "{}"
+
+        multi_trans = False
+        for q in range(n):
+            por_columna = defaultdict(list)
+            for col, d in afnd.etiquetadas(q):
+                por_columna[col].append(d)
+            multi_trans = multi_trans or any(len(v) > 1 for v in por_columna.values())
+            if tiene_epsilon:
+                por_columna[len(self.alfabeto)] = list(afnd.epsilon(q))
+            linea = f"| {'q' + str(q):<8} "
+            for j in range(len(cols)):
+                dest = sorted(por_columna.get(j, ()))
+                dest_str = "{" + ",".join(f"q{d}" for d in dest) + "}"
                 linea += f"| {dest_str:<9} "
             print(linea + "|")
         print(header)
 
         # Razón de No Determinismo
-        tiene_epsilon = any('ε' in self.transiciones[e] for e in self.estados)
-        multi_trans = any(len(self.transiciones[e][s]) > 1 for e in self.estados for s in self.transiciones[e])
-        
         if tiene_epsilon or multi_trans:
             print("\nTipo de autómata: AFND (No Determinista)")
             razon = "Tiene transiciones ε" if tiene_epsilon else "Tiene múltiples destinos para un mismo símbolo"
@@ -138,5 +918,25 @@ if __name__ == "__main__":
     if gen.validar_regex():
         gen.generar_afnd()
         gen.mostrar_automata()
+
+        afd = gen.compilar()
+        print(f"\nAFD mínimo: {afd.num_estados} estados")
+        for cadena in ["abb", "aabb", "babb", "ab", "abba"]:
+            print(f"  {cadena:<6} -> {'acepta' if afd.coincide(cadena) else 'rechaza'}")
+
+        texto = "xx abb yy babb, aabbb"
+        print(f"\nCoincidencias en '{texto}': {list(afd.buscar_todo(texto))}")
+
+        # Varios patrones en un solo autómata: una pasada indica qué reglas disparan
+        reglas = ["abb", "ba", "a+"]
+        multi = GeneradorAFND(reglas).compilar()
+        print(f"\nReglas {reglas} sobre 'xabbax':")
+        for fin, ids in multi.escanear(["xabbax"]):
+            print(f"  fin {fin}: {[reglas[i] for i in ids]}")
+
+        # Modo perezoso: estados del AFD construidos bajo demanda con memoria acotada
+        perezoso = GeneradorAFND("(a|b)*a(a|b)(a|b)(a|b)(a|b)").compilar(modo="perezoso", memoria_max=64 * 1024)
+        print(f"\nModo perezoso: 'abaabba' -> {'acepta' if perezoso.coincide('abaabba') else 'rechaza'}"
+              f" ({perezoso.num_estados} estados en caché)")
     else:
         print("Regex inválida.")
\ No newline at end of file
@@ -1,8 +1,26 @@
 import ply.lex as lex
+import asyncio
+import io
 import json
 import datetime
+import ipaddress
 import os
-from collections import defaultdict
+import heapq
+import html
+import re
+import sys
+import tempfile
+import time
+import zlib
+from bisect import bisect_right, insort
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
+
+# Módulos compartidos entre las partes del repositorio (carpeta comun/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.fragmentos import abrir_fragmento, estado_trabajador, fronteras_lineas, iniciar_trabajador  # noqa: E402
 
 # --- CONFIGURACIÓN DEL LEXER ---
 tokens = ('TIMESTAMP', 'IP', 'LOGIN_FAILED', 'COMMAND_DANGER', 'WORD')
@@ -34,18 +52,243 @@ def t_error(t):
 
 lexer = lex.lex()
 
+# --- TOKENIZADOR RÁPIDO (config "lexer": "rapido") ---
+# Mismas reglas y mismo orden que el lexer de PLY, pero en una sola regex:
+# cada coincidencia se salta (dentro del motor de re) los espacios ignorados,
+# las WORD y los caracteres sueltos hasta el siguiente token que interesa.
+# (?!...) antes de WORD reproduce la prioridad de PLY (la primera regla que
+# coincide gana) y los grupos atómicos evitan que una WORD se parta al retroceder.
+# (?>...) y *+ existen en re desde Python 3.11; antes sólo queda el lexer de PLY
+_REGLAS = [('TIMESTAMP', t_TIMESTAMP.__doc__), ('IP', t_IP.__doc__),
+           ('LOGIN_FAILED', t_LOGIN_FAILED.__doc__), ('COMMAND_DANGER', t_COMMAND_DANGER.__doc__)]
+_INTERESANTE = "|".join(regla for _, regla in _REGLAS)
+RE_TOKENS = re.compile(
+    f"(?:[{t_ignore}]|(?!{_INTERESANTE})(?>{t_WORD.__doc__}|.))*+"
+    + "(?:" + "|".join(f"(?P<{nombre}>{regla})" for nombre, regla in _REGLAS) + ")",
+    re.DOTALL) if sys.version_info >= (3, 11) else None
+
+@lru_cache(maxsize=4096)
+def convertir_timestamp(texto):
+    """Equivale a strptime(texto, '%Y-%m-%d %H:%M:%S') para el ancho fijo de
+    TIMESTAMP, sin el costo de interpretar el formato en cada línea"""
+    return datetime.datetime(int(texto[0:4]), int(texto[5:7]), int(texto[8:10]),
+                             int(texto[11:13]), int(texto[14:16]), int(texto[17:19]))
+
+# --- ÍNDICE DE REGLAS (lista negra y comandos de config.json) ---
+_CARACTERES_WORD = "a-zA-Z0-9:/._-"  # la misma clase que t_WORD
+
+def _entero_ipv4(texto):
+    """Valor entero de una IP como las que reconoce t_IP, o None si algún octeto pasa de 255"""
+    valor = 0
+    for octeto in texto.split('.'):
+        octeto = int(octeto)
+        if octeto > 255:
+            return None
+        valor = (valor << 8) | octeto
+    return valor
+
+class IndiceReglas:
+    """Reglas de config.json preparadas para consultarse en tiempo
+    independiente del tamaño de las listas:
+      - IPs exactas de blacklist_ips en un set,
+      - bloques CIDR de blacklist_ips como intervalos enteros ordenados y
+        fusionados (búsqueda binaria),
+      - danger_commands en un árbol de prefijos (trie)"""
+    def __init__(self, config):
+        self.ips = set()
+        intervalos = []
+        for entrada in config.get("blacklist_ips", []):
+            if '/' not in entrada:
+                self.ips.add(entrada)
+                continue
+            red = ipaddress.ip_network(entrada, strict=False)
+            if red.version == 4:  # el lexer sólo reconoce IPv4
+                intervalos.append((int(red.network_address), int(red.broadcast_address)))
+        intervalos.sort()
+        self.inicios, self.fines = [], []
+        for inicio, fin in intervalos:
+            if self.fines and inicio <= self.fines[-1] + 1:
+                self.fines[-1] = max(self.fines[-1], fin)
+            else:
+                self.inicios.append(inicio)
+                self.fines.append(fin)
+
+        # Trie de comandos: cada nodo es un dict carácter -> nodo; la clave None
+        # guarda la posición del comando en la lista (gana el primero, como en
+        # la alternancia del lexer). Los espacios del comando aceptan cualquier
+        # espacio en blanco de la línea, igual que '\s' en t_COMMAND_DANGER
+        self.trie = {}
+        primeros = set()
+        for i, comando in enumerate(config.get("danger_commands", [])):
+            comando = re.sub(r'\s', ' ', comando.strip())
+            if not comando:
+                continue
+            nodo = self.trie
+            for c in comando:
+                nodo = nodo.setdefault(c, {})
+            nodo.setdefault(None, i)
+            primeros.add(comando[0])
+        # Un comando sólo puede empezar donde empieza un token: al inicio de la
+        # línea o tras un carácter que no forma parte de una WORD
+        clase = "".join(map(re.escape, sorted(primeros)))
+        self.re_inicios = re.compile(f"(?<![{_CARACTERES_WORD}])[{clase}]" if primeros else r"(?!)")
+
+    def ip_en_lista_negra(self, ip):
+        if ip is None:
+            return False
+        if ip in self.ips:
+            return True
+        if not self.inicios:
+            return False
+        valor = _entero_ipv4(ip)
+        if valor is None:
+            return False
+        i = bisect_right(self.inicios, valor) - 1
+        return i >= 0 and valor <= self.fines[i]
+
+    def comando_peligroso(self, linea):
+        """Texto del último comando peligroso de la línea, o None"""
+        for m in reversed(list(self.re_inicios.finditer(linea))):
+            inicio = m.start()
+            nodo, mejor, fin = self.trie, None, None
+            for j in range(inicio, len(linea)):
+                c = linea[j]
+                nodo = nodo.get(' ' if c.isspace() else c)
+                if nodo is None:
+                    break
+                if None in nodo and (mejor is None or nodo[None] < mejor):
+                    mejor, fin = nodo[None], j + 1
+            if mejor is not None:
+                return linea[inicio:fin]
+        return None
+
+class _RastroIP:
+    """Fallos recientes de una IP y la última alerta de fuerza bruta emitida"""
+    __slots__ = ("intentos", "ultima_alerta")
+
+    def __init__(self, max_intentos):
+        # Sólo importan los max_intentos fallos más recientes, en orden: hay
+        # fuerza bruta si el más antiguo de ellos cae dentro de la ventana
+        self.intentos = deque(maxlen=max(1, max_intentos))
+        self.ultima_alerta = None
+
+class AlmacenAlertas:
+    """Alertas guardadas en un archivo JSONL (una por línea) conforme se
+    producen, en vez de en una lista en memoria. Sin ruta se usa un archivo
+    temporal anónimo. Iterarlo relee el archivo y da los mismos dicts que
+    antes guardaba la lista; no se debe agregar mientras se itera.
+    En memoria sólo quedan los agregados del reporte: alertas por nivel,
+    por hora y por tipo (el mensaje sin la IP o el comando, así que el
+    número de claves no crece con el log)"""
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self._f = open(ruta, 'w+b') if ruta else tempfile.TemporaryFile('w+b')
+        self._leido = False
+        self._total = 0
+        self.por_nivel = Counter()
+        self.por_hora = Counter()
+        self.por_tipo = Counter()
+
+    def append(self, alerta):
+        if self._leido:
+            self._f.seek(0, os.SEEK_END)
+            self._leido = False
+        self._f.write(json.dumps(alerta, ensure_ascii=False).encode('utf-8') + b"\n")
+        self._total += 1
+        self.por_nivel[alerta["nivel"]] += 1
+        self.por_hora[alerta["timestamp"][:13]] += 1  # 'AAAA-MM-DD HH'
+        self.por_tipo[alerta["mensaje"].split(":", 1)[0]] += 1  # 'Fuerza bruta detectada'
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        self._f.flush()
+        self._f.seek(0)
+        self._leido = True
+        for linea in self._f:
+            yield json.loads(linea)
+
+    def cerrar(self):
+        self._f.close()
+
+# Líneas con error que el modo seguimiento imprime; las demás sólo se cuentan
+MAX_ERRORES_MOSTRADOS = 10
+
+class EstadisticasSeguimiento:
+    """Contadores del modo seguimiento (AnalizadorSeguridad.seguir).
+    latencias guarda, para las líneas que generan alertas, los segundos entre
+    la escritura de la línea y la alerta (las últimas 100 000)"""
+    def __init__(self):
+        self.lineas = 0
+        self.lotes = 0
+        self.alertas = 0
+        self.rotaciones = 0
+        self.truncamientos = 0
+        self.errores = 0
+        self.latencias = deque(maxlen=100_000)
+        self.inicio = time.monotonic()
+
+    def percentil(self, p):
+        if not self.latencias:
+            return 0.0
+        ordenadas = sorted(self.latencias)
+        return ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))]
+
+    def mostrar(self):
+        segundos = time.monotonic() - self.inicio
+        print(f"Líneas: {self.lineas} en {self.lotes} lotes ({self.lineas / segundos:,.0f} líneas/s)")
+        print(f"Alertas: {self.alertas}  Rotaciones: {self.rotaciones}  Truncamientos: {self.truncamientos}  "
+              f"Líneas con error: {self.errores}")
+        print(f"Latencia escritura -> alerta: p50 {self.percentil(50) * 1000:.1f} ms, "
+              f"p99 {self.percentil(99) * 1000:.1f} ms, máx {max(self.latencias, default=0) * 1000:.1f} ms")
+
 class AnalizadorSeguridad:
-    def __init__(self, config_path):
+    def __init__(self, config_path, con_alertas=True):
+        """con_alertas=False no abre el almacén de alertas: así se construyen
+        los procesos de procesar_log(procesos=N), que sólo regresan datos y no
+        deben tocar (ni truncar) el archivo alerts.file del proceso principal"""
         # Validación de existencia del archivo de configuración
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"No se encontró el archivo: {config_path}")
             
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
-        self.alertas = []
-        self.historial_logins = defaultdict(list)
+        self.config_path = config_path
+        opciones = self.config.get("alerts", {})
+        self.alertas = AlmacenAlertas(opciones.get("file")) if con_alertas else None
+        # Consola opcional y con tope de alertas impresas por segundo (0 = sin tope)
+        self.consola = opciones.get("console", True)
+        self.max_consola = opciones.get("console_max_per_second", 0)
+        self._segundo_consola = None
+        self._impresas = 0
+        self._omitidas = 0
+        self.reglas = IndiceReglas(self.config)
+        # ip -> _RastroIP, de la menos a la más recientemente activa
+        self.historial_logins = OrderedDict()
+        umbrales = self.config["thresholds"]
+        self.max_intentos = umbrales["max_login_attempts"]
+        self.ventana = umbrales["window_seconds"]
+        # Tiempo mínimo entre alertas de fuerza bruta de una misma IP (0 = todas)
+        self.enfriamiento = umbrales.get("cooldown_seconds", 0)
+        # Tope de IPs rastreadas; al rebasarlo se olvida la menos reciente
+        self.max_ips = max(1, umbrales.get("max_tracked_ips", 100_000))
+        # Marca más reciente vista y el mayor atraso de una línea respecto a ella
+        self._reloj = None
+        self._desfase = 0
 
-    def analizar_linea(self, linea):
+        # "ply" (por defecto) o "rapido"; ambos producen los mismos datos
+        modo = self.config.get("lexer", "ply")
+        if modo == "ply":
+            self.tokenizar = self._tokenizar_ply
+        elif modo == "rapido":
+            if RE_TOKENS is None:
+                raise ValueError("El lexer 'rapido' requiere Python 3.11 o superior")
+            self.tokenizar = self._tokenizar_rapido
+        else:
+            raise ValueError(f"Lexer desconocido en la configuración: '{modo}'. Opciones: ['ply', 'rapido']")
+
+    def _tokenizar_ply(self, linea):
         lexer.input(linea)
         datos = {"ts": None, "ip": None, "fail": False, "cmd": None}
         for tok in lexer:
@@ -53,91 +296,420 @@ class AnalizadorSeguridad:
             elif tok.type == 'IP': datos["ip"] = tok.value
             elif tok.type == 'LOGIN_FAILED': datos["fail"] = True
             elif tok.type == 'COMMAND_DANGER': datos["cmd"] = tok.value
+        return datos
+
+    def _tokenizar_rapido(self, linea):
+        datos = {"ts": None, "ip": None, "fail": False, "cmd": None}
+        m = RE_TOKENS.match(linea)
+        while m:
+            tipo = m.lastgroup
+            if tipo == 'TIMESTAMP': datos["ts"] = convertir_timestamp(m.group(tipo))
+            elif tipo == 'IP': datos["ip"] = m.group(tipo)
+            elif tipo == 'LOGIN_FAILED': datos["fail"] = True
+            else: datos["cmd"] = m.group(tipo)
+            m = RE_TOKENS.match(linea, m.end())
+        return datos
+
+    def analizar_linea(self, linea):
+        datos = self.tokenizar(linea)
 
         # A) Detección de Fuerza Bruta
         if datos["fail"] and datos["ip"] and datos["ts"]:
-            self.historial_logins[datos["ip"]].append(datos["ts"])
-            window = self.config["thresholds"]["window_seconds"]
-            intentos = [t for t in self.historial_logins[datos["ip"]] 
-                        if (datos["ts"] - t).total_seconds() <= window]
-            if len(intentos) >= self.config["thresholds"]["max_login_attempts"]:
+            if self.fuerza_bruta(datos["ip"], datos["ts"]):
                 self.registrar_alerta("CRITICAL", f"Fuerza bruta detectada: {datos['ip']}", datos["ts"])
 
+        for nivel, mensaje in self._alertas_sin_estado(datos, linea):
+            self.registrar_alerta(nivel, mensaje, datos["ts"])
+
+    def _alertas_sin_estado(self, datos, linea):
+        """Reglas que sólo dependen de la línea: [(nivel, mensaje), ...]"""
+        alertas = []
         # B) IPs en Lista Negra
-        if datos["ip"] in self.config["blacklist_ips"]:
-            self.registrar_alerta("HIGH", f"IP en lista negra detectada: {datos['ip']}", datos["ts"])
+        if self.reglas.ip_en_lista_negra(datos["ip"]):
+            alertas.append(("HIGH", f"IP en lista negra detectada: {datos['ip']}"))
+
+        # C) Comandos Peligrosos (de danger_commands; el token COMMAND_DANGER
+        # del lexer sólo delimita tokens)
+        comando = self.reglas.comando_peligroso(linea)
+        if comando:
+            alertas.append(("CRITICAL", f"Comando peligroso detectado: {comando}"))
+        return alertas
+
+    def fuerza_bruta(self, ip, ts):
+        """Registra un fallo de ip en ts y dice si hay que alertar.
+        Costo O(1) amortizado: cada IP guarda a lo más max_intentos marcas y
+        las IPs inactivas se desalojan. Una línea fuera de orden cronológico
+        se coloca en su lugar y amplía el plazo de desalojo en lo que llegó
+        tarde, así que cuenta los mismos fallos que la ventana completa"""
+        if self._reloj is None or ts > self._reloj:
+            self._reloj = ts
+        else:
+            self._desfase = max(self._desfase, (self._reloj - ts).total_seconds())
+        rastro = self.historial_logins.get(ip)
+        if rastro is None:
+            rastro = self.historial_logins[ip] = _RastroIP(self.max_intentos)
+        else:
+            self.historial_logins.move_to_end(ip)
+        intentos = rastro.intentos
+        if not intentos or ts >= intentos[-1]:
+            intentos.append(ts)
+        elif len(intentos) < intentos.maxlen:
+            insort(intentos, ts)
+        elif ts > intentos[0]:
+            # Entre las max_intentos marcas mayores desplaza a la más antigua
+            intentos.popleft()
+            insort(intentos, ts)
+        self._desalojar(ts)
 
-        # C) Comandos Peligrosos
-        if datos["cmd"]:
-            self.registrar_alerta("CRITICAL", f"Comando peligroso detectado: {datos['cmd']}", datos["ts"])
+        if len(rastro.intentos) < self.max_intentos or (ts - rastro.intentos[0]).total_seconds() > self.ventana:
+            return False
+        # El enfriamiento cuenta hacia los dos lados de la última alerta: una
+        # línea atrasada no la adelanta ni la esquiva con una diferencia negativa
+        if rastro.ultima_alerta is not None and abs((ts - rastro.ultima_alerta).total_seconds()) < self.enfriamiento:
+            return False
+        rastro.ultima_alerta = ts if rastro.ultima_alerta is None else max(ts, rastro.ultima_alerta)
+        return True
+
+    def _desalojar(self, ts):
+        # Una IP sin fallos en la ventana ni alerta en enfriamiento ya no influye
+        # en nada, salvo para una línea que llegue tan tarde como la más atrasada
+        inactividad = max(self.ventana, self.enfriamiento) + self._desfase
+        historial = self.historial_logins
+        while historial:
+            ip, rastro = next(iter(historial.items()))
+            if len(historial) <= self.max_ips and (ts - rastro.intentos[-1]).total_seconds() <= inactividad:
+                break
+            del historial[ip]
 
     def registrar_alerta(self, nivel, mensaje, ts):
         self.alertas.append({"nivel": nivel, "mensaje": mensaje, "timestamp": str(ts)})
+        if not self.consola:
+            return
+        if self.max_consola:
+            segundo = int(time.monotonic())
+            if segundo != self._segundo_consola:
+                self._vaciar_consola()
+                self._segundo_consola = segundo
+                self._impresas = 0
+            if self._impresas >= self.max_consola:
+                self._omitidas += 1
+                return
+            self._impresas += 1
         print(f"[{nivel}] {ts}: {mensaje}")
 
-    def procesar_log(self, ruta_log):
+    def _vaciar_consola(self):
+        if self._omitidas:
+            print(f"... {self._omitidas} alertas no mostradas en consola")
+            self._omitidas = 0
+
+    def procesar_log(self, ruta_log, procesos=None, tam_fragmento=16 << 20):
+        """Analiza el archivo completo. Con procesos > 1 se reparte en un pool
+        (ver _procesar_paralelo) con las mismas alertas y en el mismo orden"""
         if not os.path.exists(ruta_log):
             print(f"Error: El archivo de log '{ruta_log}' no existe.")
             return
-        with open(ruta_log, 'r', encoding='utf-8') as f:
-            for linea in f:
-                self.analizar_linea(linea)
-
-    def generar_reporte_html(self, nombre_archivo="reporte_seguridad.html"):
-        conteo = {"CRITICAL": 0, "HIGH": 0}
-        for a in self.alertas:
-            conteo[a["nivel"]] = conteo.get(a["nivel"], 0) + 1
-
-        html = f"""
-        <html>
-        <head>
-            <title>Reporte de Seguridad</title>
-            <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-            <style>
-                body {{ font-family: 'Segoe UI', sans-serif; margin: 40px; background: #f8f9fa; }}
-                .container {{ max-width: 900px; margin: auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-                .CRITICAL {{ background: #dc3545; color: white; padding: 3px 8px; border-radius: 4px; font-weight: bold; }}
-                .HIGH {{ background: #fd7e14; color: white; padding: 3px 8px; border-radius: 4px; font-weight: bold; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-                th, td {{ padding: 12px; border-bottom: 1px solid #ddd; text-align: left; }}
-                th {{ background: #212529; color: white; }}
-                .chart-container {{ width: 320px; margin: 20px auto; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1> Reporte de Monitoreo de Seguridad</h1>
-                <p>Análisis de archivo: <strong>seguridad.log</strong></p>
-                <div class="chart-container"><canvas id="myChart"></canvas></div>
-                <table>
-                    <tr><th>Nivel</th><th>Fecha y Hora</th><th>Mensaje de Alerta</th></tr>
-        """
-        for a in self.alertas:
-            html += f"<tr><td><span class='{a['nivel']}'>{a['nivel']}</span></td><td>{a['timestamp']}</td><td>{a['mensaje']}</td></tr>"
-        
-        html += f"""
-                </table>
-            </div>
-            <script>
-                new Chart(document.getElementById('myChart'), {{
-                    type: 'pie',
-                    data: {{
-                        labels: ['Crítico (CRITICAL)', 'Alto (HIGH)'],
-                        datasets: [{{ 
-                            data: [{conteo['CRITICAL']}, {conteo['HIGH']}], 
-                            backgroundColor: ['#dc3545', '#fd7e14'] 
-                        }}]
-                    }},
-                    options: {{ plugins: {{ legend: {{ position: 'bottom' }} }} }}
-                }});
-            </script>
-        </body></html>
-        """
-        with open(nombre_archivo, 'w', encoding='utf-8') as f:
-            f.write(html)
-        print(f"\n Reporte generado: {nombre_archivo}")
+        if procesos and procesos > 1:
+            self._procesar_paralelo(ruta_log, procesos, tam_fragmento)
+        else:
+            with open(ruta_log, 'r', encoding='utf-8') as f:
+                for linea in f:
+                    self.analizar_linea(linea)
+        self._vaciar_consola()
+
+    def _procesar_paralelo(self, ruta_log, procesos, tam_fragmento):
+        # 1) Fragmentos de bytes alineados a líneas: cada proceso tokeniza, evalúa
+        #    las reglas sin estado y extrae los fallos de login (línea, ip, ts).
+        # 2) Los fallos se reparten por hash de la IP: todos los de una IP caen
+        #    en el mismo proceso y en orden de archivo, así que su ventana es la
+        #    misma que en serie.
+        # 3) Las alertas se mezclan por (línea, regla), el orden de la corrida serial.
+        # El estado de fuerza bruta queda en los procesos, no en self. Si hay
+        # más IPs con fallos que max_tracked_ips, el tope es global y cada
+        # partición olvidaría IPs distintas: ese paso se hace aquí, en serie
+        fronteras = fronteras_lineas(ruta_log, tam_fragmento)
+        with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_trabajador,
+                                 initargs=(_nuevo_analizador, self.config_path)) as pool:
+            sin_estado = []
+            particiones = [[] for _ in range(procesos)]
+            desplazamiento = 0
+            for n, alertas, fallos in pool.map(_analizar_fragmento, repeat(ruta_log),
+                                               fronteras[:-1], fronteras[1:]):
+                sin_estado.extend((desplazamiento + i, regla, nivel, mensaje, ts)
+                                  for i, regla, nivel, mensaje, ts in alertas)
+                for i, ip, ts in fallos:
+                    particiones[zlib.crc32(ip.encode()) % procesos].append((desplazamiento + i, ip, ts))
+                desplazamiento += n
+            if len({ip for particion in particiones for _, ip, _ in particion}) <= self.max_ips:
+                fuerza_bruta = list(pool.map(_fuerza_bruta_particion, particiones))
+            else:
+                fuerza_bruta = [_detectar_fuerza_bruta(_nuevo_analizador(self.config_path),
+                                                       heapq.merge(*particiones))]
+
+        for _, _, nivel, mensaje, ts in heapq.merge(sin_estado, *fuerza_bruta):
+            self.registrar_alerta(nivel, mensaje, ts)
+
+    async def seguir(self, rutas, intervalo=0.2, tam_lote=500, max_lotes=64, desde_inicio=False,
+                     duracion=None, detener=None, marca_escritura=None):
+        """Modo seguimiento (como tail -F) sobre varios archivos a la vez.
+        Cada archivo tiene su lector, que sondea cada `intervalo` segundos,
+        detecta rotación (cambia el inodo) y truncamiento (el tamaño baja de
+        la posición leída) y manda las líneas nuevas en lotes de hasta
+        tam_lote a una cola de max_lotes: si el análisis se atrasa, los
+        lectores esperan y el propio archivo hace de búfer.
+        Termina tras `duracion` segundos o cuando se activa el asyncio.Event
+        `detener`, y regresa las EstadisticasSeguimiento.
+        marca_escritura(linea) puede dar la hora (time.time()) en que se
+        escribió la línea; si no, la latencia se mide desde que se leyó.
+        Las líneas que analizar_linea rechaza se cuentan en `errores` y se
+        saltan; si el consumidor muere por otra causa, se cancelan los
+        lectores y seguir relanza su excepción"""
+        estadisticas = EstadisticasSeguimiento()
+        cola = asyncio.Queue(maxsize=max_lotes)
+        lectores = [asyncio.create_task(self._seguir_archivo(ruta, cola, estadisticas, intervalo, tam_lote, desde_inicio))
+                    for ruta in rutas]
+        consumidor = asyncio.create_task(self._consumir(cola, estadisticas, marca_escritura))
+        detener = detener or asyncio.Event()
+        espera = asyncio.create_task(detener.wait())
+        try:
+            # Termina por duración, por `detener` o porque el consumidor murió
+            await asyncio.wait({espera, consumidor}, timeout=duracion, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            espera.cancel()
+            for lector in lectores:
+                lector.cancel()
+            await asyncio.gather(*lectores, return_exceptions=True)
+            # Se analiza lo que quedó en la cola, salvo que ya no haya consumidor
+            vaciado = asyncio.create_task(cola.join())
+            await asyncio.wait({vaciado, consumidor}, return_when=asyncio.FIRST_COMPLETED)
+            vaciado.cancel()
+            consumidor.cancel()
+            self._vaciar_consola()
+        if consumidor.done() and not consumidor.cancelled() and consumidor.exception():
+            raise consumidor.exception()
+        return estadisticas
+
+    async def _seguir_archivo(self, ruta, cola, estadisticas, intervalo, tam_lote, desde_inicio):
+        f = None
+        pendiente = b""
+        primera_vez = True
+        agotando = False
+        try:
+            while True:
+                if f is None:
+                    try:
+                        f = open(ruta, 'rb')
+                    except FileNotFoundError:
+                        primera_vez = False  # cuando aparezca, se lee completo
+                        await asyncio.sleep(intervalo)
+                        continue
+                    if primera_vez and not desde_inicio:
+                        f.seek(0, os.SEEK_END)
+                    primera_vez = False
+
+                datos = f.read(1 << 16)
+                if datos:
+                    pendiente += datos
+                    corte = pendiente.rfind(b"\n") + 1
+                    if corte:
+                        leido = time.time()
+                        # Mismos saltos de línea que procesar_log (modo texto)
+                        lineas = io.StringIO(pendiente[:corte].decode('utf-8', 'replace'), newline=None).readlines()
+                        pendiente = pendiente[corte:]
+                        for i in range(0, len(lineas), tam_lote):
+                            await cola.put((lineas[i:i + tam_lote], leido))
+                    continue
+
+                # Fin de archivo: ¿rotó, se truncó o sólo no hay nada nuevo?
+                try:
+                    actual = os.stat(ruta)
+                except FileNotFoundError:
+                    actual = None
+                propio = os.fstat(f.fileno())
+                if actual is None or (actual.st_ino, actual.st_dev) != (propio.st_ino, propio.st_dev):
+                    if not agotando:
+                        # El escritor pudo agregar líneas al archivo viejo entre la
+                        # última lectura y el cambio de nombre: se lee hasta el final
+                        agotando = True
+                        continue
+                    agotando = False
+                    if actual is not None:
+                        estadisticas.rotaciones += 1
+                    f.close()
+                    f = None
+                    if pendiente:
+                        await cola.put(([pendiente.decode('utf-8', 'replace')], time.time()))
+                        pendiente = b""
+                elif actual.st_size < f.tell():
+                    estadisticas.truncamientos += 1
+                    f.seek(0)
+                    pendiente = b""
+                else:
+                    await asyncio.sleep(intervalo)
+        finally:
+            if f:
+                f.close()
+
+    async def _consumir(self, cola, estadisticas, marca_escritura):
+        while True:
+            lineas, leido = await cola.get()
+            try:
+                for linea in lineas:
+                    antes = len(self.alertas)
+                    try:
+                        self.analizar_linea(linea)
+                    except Exception as e:
+                        # Una línea mal formada (p. ej. una fecha imposible) no detiene el seguimiento
+                        estadisticas.errores += 1
+                        if estadisticas.errores <= MAX_ERRORES_MOSTRADOS:
+                            print(f"Línea ignorada ({type(e).__name__}: {e}): {linea.rstrip()!r}")
+                        continue
+                    if len(self.alertas) > antes:
+                        escrito = marca_escritura(linea) if marca_escritura else None
+                        estadisticas.latencias.append(time.time() - (escrito or leido))
+                        estadisticas.alertas += len(self.alertas) - antes
+                estadisticas.lineas += len(lineas)
+                estadisticas.lotes += 1
+            finally:
+                cola.task_done()
+
+    def generar_reporte_html(self, nombre_archivo="reporte_seguridad.html", filas_por_pagina=1000, top_n=10):
+        """Escribe el reporte por partes: la primera página lleva los agregados
+        (gráfica por nivel, histograma por hora y los top_n tipos de alerta) y las
+        primeras filas; el resto de las alertas va en páginas de
+        filas_por_pagina (reporte_2.html, reporte_3.html, ...). Las filas se
+        leen del almacén y se escriben conforme se leen"""
+        base, extension = os.path.splitext(nombre_archivo)
+        paginas = max(1, -(-len(self.alertas) // filas_por_pagina))
+        nombre_pagina = lambda k: nombre_archivo if k == 1 else f"{base}_{k}{extension}"
+
+        filas = iter(self.alertas)
+        for k in range(1, paginas + 1):
+            with open(nombre_pagina(k), 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(_HTML_CABECERA)
+                if k == 1:
+                    self._escribir_resumen(f, top_n)
+                f.write(f"<h2>Alertas (página {k} de {paginas})</h2>\n")
+                f.write("<table>\n<tr><th>Nivel</th><th>Fecha y Hora</th><th>Mensaje de Alerta</th></tr>\n")
+                f.writelines(
+                    f"<tr><td><span class='{a['nivel']}'>{a['nivel']}</span></td>"
+                    f"<td>{a['timestamp']}</td><td>{html.escape(a['mensaje'])}</td></tr>\n"
+                    for a in islice(filas, filas_por_pagina))
+                f.write("</table>\n")
+                if paginas > 1:
+                    enlaces = " ".join(
+                        f"<strong>{i}</strong>" if i == k else
+                        f"<a href='{os.path.basename(nombre_pagina(i))}'>{i}</a>"
+                        for i in range(1, paginas + 1))
+                    f.write(f"<p class='paginas'>Páginas: {enlaces}</p>\n")
+                f.write("</div>\n")
+                if k == 1:
+                    self._escribir_graficas(f)
+                f.write("</body></html>\n")
+        print(f"\n Reporte generado: {nombre_archivo}" + (f" ({paginas} páginas)" if paginas > 1 else ""))
+
+    def _escribir_resumen(self, f, top_n):
+        conteo = self.alertas.por_nivel
+        f.write(f"""<h1> Reporte de Monitoreo de Seguridad</h1>
+<p>Análisis de archivo: <strong>seguridad.log</strong></p>
+<p>Total de alertas: <strong>{len(self.alertas)}</strong> (CRITICAL: {conteo['CRITICAL']}, HIGH: {conteo['HIGH']})</p>
+<div class="chart-container"><canvas id="myChart"></canvas></div>
+<h2>Alertas por hora</h2>
+<div class="histograma"><canvas id="porHora"></canvas></div>
+<h2>Top {top_n} tipos de alerta</h2>
+<table>
+<tr><th>Alertas</th><th>Tipo</th></tr>
+""")
+        f.writelines(f"<tr><td>{n}</td><td>{html.escape(tipo)}</td></tr>\n"
+                     for tipo, n in self.alertas.por_tipo.most_common(top_n))
+        f.write("</table>\n")
+
+    def _escribir_graficas(self, f):
+        conteo = self.alertas.por_nivel
+        horas = sorted(self.alertas.por_hora)
+        f.write(f"""<script>
+    new Chart(document.getElementById('myChart'), {{
+        type: 'pie',
+        data: {{
+            labels: ['Crítico (CRITICAL)', 'Alto (HIGH)'],
+            datasets: [{{
+                data: [{conteo['CRITICAL']}, {conteo['HIGH']}],
+                backgroundColor: ['#dc3545', '#fd7e14']
+            }}]
+        }},
+        options: {{ plugins: {{ legend: {{ position: 'bottom' }} }} }}
+    }});
+    new Chart(document.getElementById('porHora'), {{
+        type: 'bar',
+        data: {{
+            labels: {json.dumps([h + ":00" if h != "None" else "sin hora" for h in horas])},
+            datasets: [{{ label: 'Alertas', data: {json.dumps([self.alertas.por_hora[h] for h in horas])}, backgroundColor: '#212529' }}]
+        }},
+        options: {{ plugins: {{ legend: {{ display: false }} }} }}
+    }});
+</script>
+""")
+
+_HTML_CABECERA = """<html>
+<head>
+    <meta charset="utf-8">
+    <title>Reporte de Seguridad</title>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <style>
+        body { font-family: 'Segoe UI', sans-serif; margin: 40px; background: #f8f9fa; }
+        .container { max-width: 900px; margin: auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .CRITICAL { background: #dc3545; color: white; padding: 3px 8px; border-radius: 4px; font-weight: bold; }
+        .HIGH { background: #fd7e14; color: white; padding: 3px 8px; border-radius: 4px; font-weight: bold; }
+        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
+        th, td { padding: 12px; border-bottom: 1px solid #ddd; text-align: left; }
+        th { background: #212529; color: white; }
+        .chart-container { width: 320px; margin: 20px auto; }
+        .histograma { height: 240px; margin: 20px auto; }
+        .paginas a, .paginas strong { margin: 0 4px; }
+    </style>
+</head>
+<body>
+<div class="container">
+"""
+
+# ─────────────────────────────────────────────
+#  Trabajadores de procesar_log(procesos=N)
+# ─────────────────────────────────────────────
+
+def _nuevo_analizador(config_path):
+    # Sin almacén: los procesos del pool no registran alertas, sólo las regresan
+    return AnalizadorSeguridad(config_path, con_alertas=False)
+
+def _analizar_fragmento(archivo, inicio, fin):
+    """(líneas, [(línea, regla, nivel, mensaje, ts)], [(línea, ip, ts)]) del fragmento"""
+    analizador = estado_trabajador()
+    alertas, fallos = [], []
+    n = 0
+    for n, linea in enumerate(abrir_fragmento(archivo, inicio, fin), 1):
+        datos = analizador.tokenizar(linea)
+        if datos["fail"] and datos["ip"] and datos["ts"]:
+            fallos.append((n - 1, datos["ip"], datos["ts"]))
+        for regla, (nivel, mensaje) in enumerate(analizador._alertas_sin_estado(datos, linea), 1):
+            alertas.append((n - 1, regla, nivel, mensaje, datos["ts"]))
+    return n, alertas, fallos
+
+def _fuerza_bruta_particion(fallos):
+    return _detectar_fuerza_bruta(estado_trabajador(), fallos)
+
+def _detectar_fuerza_bruta(analizador, fallos):
+    """[(línea, 0, nivel, mensaje, ts)] de los fallos (línea, ip, ts), en orden de archivo"""
+    analizador.historial_logins = OrderedDict()
+    analizador._reloj, analizador._desfase = None, 0
+    return [(i, 0, "CRITICAL", f"Fuerza bruta detectada: {ip}", ts)
+            for i, ip, ts in fallos if analizador.fuerza_bruta(ip, ts)]
 
 if __name__ == "__main__":
+    if "--seguir" in sys.argv:
+        rutas = [a for a in sys.argv[1:] if a != "--seguir"] or ["seguridad.log"]
+        try:
+            asyncio.run(AnalizadorSeguridad("config.json").seguir(rutas))
+        except KeyboardInterrupt:
+            pass
+        sys.exit()
     try:
         analizador = AnalizadorSeguridad("config.json")
         # Cambio de nombre de archivo aquí:
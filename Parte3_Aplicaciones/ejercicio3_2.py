@@ -1,6 +1,15 @@
+import glob
+import json
+import os
 import re
+import string
 import sys
-from typing import List, Tuple
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from itertools import chain, compress, islice, repeat
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 # ─────────────────────────────────────────────
 #  Tipos de error
@@ -44,142 +53,308 @@ RE_HOST_COMMENT = re.compile(r'^#.*$')
 RE_HOST_EMPTY   = re.compile(r'^\s*$')
 
 
+# ─────────────────────────────────────────────
+#  Clasificador de líneas
+#  Un solo patrón compilado por formato, una alternativa con nombre por tipo
+#  de línea, en lugar de probar los patrones de arriba uno tras otro
+# ─────────────────────────────────────────────
+
+def _sin_coincidencia(l: str) -> None:
+    return None
+
+
+class ClasificadorLineas:
+    """reglas: [(nombre, iniciales, patrón)] en orden de prioridad. La regla que
+    coincide queda en match.lastgroup. `iniciales` son los caracteres con los
+    que puede empezar una línea de esa regla (None: cualquiera); con ellos se
+    arma una tabla por primer carácter ASCII que apunta a un patrón con sólo
+    las reglas posibles, o a nada si no hay ninguna. Otros caracteres usan el
+    patrón completo. Una línea (sin '\\n') se clasifica con
+    por_inicial.get(l[:1], maestro.match)(l)"""
+    def __init__(self, reglas: List[Tuple[str, Optional[str], str]]):
+        self.maestro = self._compilar(reglas)
+        self.por_inicial = {}
+        compilados = {(): _sin_coincidencia}
+        for c in [''] + [chr(i) for i in range(128)]:
+            if c:
+                posibles = tuple(r for r in reglas if r[1] is None or c in r[1])
+            else:
+                posibles = tuple(r for r in reglas if re.match(r[2], ''))
+            if posibles not in compilados:
+                compilados[posibles] = self._compilar(posibles).match
+            self.por_inicial[c] = compilados[posibles]
+
+    @staticmethod
+    def _compilar(reglas) -> re.Pattern:
+        return re.compile('|'.join(f'(?P<{nombre}>{patron})' for nombre, _, patron in reglas))
+
+
+_ESPACIOS_ASCII = ''.join(c for c in map(chr, range(128)) if c.isspace())
+_PALABRA_ASCII = string.ascii_letters + string.digits + '_'
+
+# Mismos patrones que RE_INI_*, RE_PROP_* y RE_HOST_*, en el mismo orden
+CLASIFICADOR_INI = ClasificadorLineas([
+    ('vacia',      _ESPACIOS_ASCII,          r'\s*$'),
+    ('comentario', ';',                      r';.*$'),
+    ('seccion',    '[',                      r'\[[A-Za-z_]\w*\]$'),
+    ('clave',      string.ascii_letters + '_', r'[A-Za-z_]\w*\s*=\s*.+$'),
+])
+CLASIFICADOR_PROPERTIES = ClasificadorLineas([
+    ('vacia',      _ESPACIOS_ASCII,          r'\s*$'),
+    ('comentario', '#!',                     r'[#!].*$'),
+    ('propiedad',  _PALABRA_ASCII + '.-',    r'[\w.\-]+\s*[=:]\s*.*$'),
+])
+# En hosts, lo que no es vacío ni comentario es una entrada
+CLASIFICADOR_HOSTS = ClasificadorLineas([
+    ('vacia',      _ESPACIOS_ASCII,          r'\s*$'),
+    ('comentario', '#',                      r'#.*$'),
+])
+
+
+def _hostname_valido(nombre: str) -> bool:
+    """Lo mismo que RE_HOST_NAME.match en tiempo lineal y sin regex: sólo
+    [A-Za-z0-9.-], etiquetas no vacías que no empiezan ni terminan con guión"""
+    return (nombre.isascii()
+            and nombre.replace('-', '').replace('.', '').isalnum()
+            and nombre[0] not in '.-' and nombre[-1] not in '.-'
+            and '..' not in nombre and '.-' not in nombre and '-.' not in nombre)
+
+
 # ─────────────────────────────────────────────
 #  Validadores
+#  Reciben cualquier iterable de líneas (una lista o el archivo abierto) y
+#  entregan los errores conforme los encuentran, sin acumularlos
 # ─────────────────────────────────────────────
 
-def validar_ini(lineas: List[str]) -> List[ErrorValidacion]:
-    errores = []
-    tiene_seccion = False
+# Cada formato con estado se expresa como un paso por línea:
+# (estado antes de la línea, línea sin '\n') -> (estado después, error o None),
+# con el error como (mensaje, sugerencia). Los validadores de archivo completo y
+# ValidadorIncremental comparten estos pasos
 
-    for i, linea in enumerate(lineas, 1):
-        l = linea.rstrip('\n')
-        if RE_INI_EMPTY.match(l) or RE_INI_COMMENT.match(l):
-            continue
-        if RE_INI_SECCION.match(l):
-            tiene_seccion = True
-            continue
-        if RE_INI_CLAVE.match(l):
-            if not tiene_seccion:
-                errores.append(ErrorValidacion(
-                    i, f"Clave fuera de sección: '{l}'",
-                    "Agrega una sección antes, ej: [general]"))
-            continue
+# La tabla y el patrón completo se usan directamente, sin un método que los
+# envuelva: sería una llamada Python más por línea
+_INI_POR_INICIAL, _INI_MAESTRO = CLASIFICADOR_INI.por_inicial, CLASIFICADOR_INI.maestro.match
+_PROP_POR_INICIAL, _PROP_MAESTRO = CLASIFICADOR_PROPERTIES.por_inicial, CLASIFICADOR_PROPERTIES.maestro.match
+_HOSTS_POR_INICIAL, _HOSTS_MAESTRO = CLASIFICADOR_HOSTS.por_inicial, CLASIFICADOR_HOSTS.maestro.match
+
+def _paso_ini(tiene_seccion: bool, l: str) -> Tuple[bool, Optional[Tuple[str, str]]]:
+    m = _INI_POR_INICIAL.get(l[:1], _INI_MAESTRO)(l)
+    if m is None:
         # Línea inválida
-        errores.append(ErrorValidacion(
-            i, f"Sintaxis no reconocida: '{l}'",
-            "Usa [seccion], clave = valor, o ; comentario"))
+        return tiene_seccion, (f"Sintaxis no reconocida: '{l}'",
+                               "Usa [seccion], clave = valor, o ; comentario")
+    tipo = m.lastgroup
+    if tipo == 'seccion':
+        return True, None
+    if tipo == 'clave' and not tiene_seccion:
+        return tiene_seccion, (f"Clave fuera de sección: '{l}'",
+                               "Agrega una sección antes, ej: [general]")
+    return tiene_seccion, None
 
-    return errores
 
+def _paso_properties(estado: None, l: str) -> Tuple[None, Optional[Tuple[str, str]]]:
+    if _PROP_POR_INICIAL.get(l[:1], _PROP_MAESTRO)(l):
+        return estado, None
+    return estado, (f"Propiedad inválida: '{l}'",
+                    "Formato: propiedad.nombre = valor  o  propiedad.nombre: valor")
 
-def validar_properties(lineas: List[str]) -> List[ErrorValidacion]:
-    errores = []
 
+def validar_ini(lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
+    tiene_seccion = False
     for i, linea in enumerate(lineas, 1):
-        l = linea.rstrip('\n')
-        if RE_PROP_EMPTY.match(l) or RE_PROP_COMMENT.match(l):
-            continue
-        if RE_PROP_KV.match(l):
-            continue
-        errores.append(ErrorValidacion(
-            i, f"Propiedad inválida: '{l}'",
-            "Formato: propiedad.nombre = valor  o  propiedad.nombre: valor"))
+        tiene_seccion, error = _paso_ini(tiene_seccion, linea.rstrip('\n'))
+        if error:
+            yield ErrorValidacion(i, *error)
 
-    return errores
 
+def validar_properties(lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
+    for i, linea in enumerate(lineas, 1):
+        _, error = _paso_properties(None, linea.rstrip('\n'))
+        if error:
+            yield ErrorValidacion(i, *error)
 
-def validar_csv(lineas: List[str]) -> List[ErrorValidacion]:
-    """
-    Infiere tipos de columna desde la primera fila de datos
-    y valida el resto según esos tipos.
-    Tipos soportados: int, email, bool, string (fallback)
-    """
-    errores = []
-    if not lineas:
-        return errores
-
-    cabecera = lineas[0].rstrip('\n').split(',')
-    num_cols = len(cabecera)
-
-    # Inferir tipos con la segunda fila (si existe)
-    tipos = ['string'] * num_cols
-    if len(lineas) > 1:
-        primera_fila = lineas[1].rstrip('\n').split(',')
-        for j, valor in enumerate(primera_fila):
-            if RE_CSV_INT.match(valor):
-                tipos[j] = 'int'
-            elif RE_CSV_EMAIL.match(valor):
-                tipos[j] = 'email'
-            elif RE_CSV_BOOL.match(valor):
-                tipos[j] = 'bool'
-            else:
-                tipos[j] = 'string'
 
-    VALIDADORES = {
-        'int':    (RE_CSV_INT,    "entero (ej: 25)"),
-        'email':  (RE_CSV_EMAIL,  "email válido (ej: user@mail.com)"),
-        'bool':   (RE_CSV_BOOL,   "booleano (true/false)"),
-        'string': (RE_CSV_STRING, "cadena no vacía"),
-    }
+# Reglas de cada tipo de columna CSV: (patrón por celda, descripción)
+VALIDADORES_CSV = {
+    'int':    (RE_CSV_INT,    "entero (ej: 25)"),
+    'email':  (RE_CSV_EMAIL,  "email válido (ej: user@mail.com)"),
+    'bool':   (RE_CSV_BOOL,   "booleano (true/false)"),
+    'string': (RE_CSV_STRING, "cadena no vacía"),
+}
 
-    for i, linea in enumerate(lineas[1:], 2):
-        l = linea.rstrip('\n')
+# Cada tipo como fragmento de regex para una celda dentro de una fila
+# completa. Aceptan un subconjunto de lo que aceptan los patrones RE_CSV_*
+# sobre una celda (que nunca contiene ',' ni '\n'): \d y \w se reducen a sus
+# clases ASCII, que re evalúa más rápido; una celda con dígitos o letras no
+# ASCII hace fallar la fila, y ésta se revisa después con los patrones
+# originales. Los cuantificadores posesivos no cambian el resultado (cada
+# clase excluye el carácter que la sigue) y evitan guardar puntos de retroceso
+# (re los acepta desde Python 3.11, la versión mínima del repositorio).
+# string es [^,\n] escrita como rangos y bool es la alternancia factorizada
+# por su primera letra: re evalúa ambas formas más rápido
+CELDAS_CSV = {
+    'int':    r'[0-9]++',
+    'email':  r'[A-Za-z0-9_.+-]++@[A-Za-z0-9_-]++\.[A-Za-z0-9_.]++',
+    'bool':   r'(?:true|false|T(?:rue|RUE)|F(?:alse|ALSE))',
+    'string': r'[\x00-\t\x0b-+\--\U0010ffff]++',
+}
+
+
+class ValidadorCSV:
+    """Validación de CSV por bloques de tam_bloque líneas.
+
+    Los tipos se infieren de las primeras `muestra` filas de datos: una columna
+    toma el primer tipo (int, email, bool) que acepte al menos `umbral` de sus
+    valores muestreados, o string. Con muestra=1 se usa sólo la primera fila,
+    como validar_csv siempre ha hecho; las filas en blanco también cuentan
+    (una segunda línea vacía deja todas las columnas en string).
+    Las líneas pueden venir con o sin '\n' final (de un archivo o de una lista).
+
+    Con los tipos se compila una regex de fila completa (las celdas de cada
+    columna en orden); una sola llamada recorre el bloque entero y se detiene
+    en la primera fila que no cumple. Sólo esa fila se revisa celda por celda
+    con los patrones RE_CSV_* y se continúa en la siguiente, así que el costo
+    por fila válida es el de la regex en C, sin partir la línea en celdas:
+    crear un objeto por celda para revisar columnas cuesta más que todo el
+    recorrido de la regex.
+    errores() entrega por bloque los arreglos (filas, columnas) de cada
+    error, en orden, y el valor culpable; columna -1 indica un número de
+    columnas incorrecto (el valor es cuántas se encontraron)"""
+
+    def __init__(self, muestra: int = 1, umbral: float = 0.5, tam_bloque: int = 1 << 16):
+        self.muestra = max(1, muestra)
+        self.umbral = umbral
+        self.tam_bloque = max(tam_bloque, self.muestra)
+        self.cabecera: List[str] = []
+        self.tipos: List[str] = []
+
+    def inferir_tipos(self, filas: List[List[str]]) -> List[str]:
+        tipos = []
+        for j in range(len(self.cabecera)):
+            valores = [fila[j] for fila in filas if len(fila) > j]
+            tipo = 'string'
+            for candidato in ('int', 'email', 'bool'):
+                patron = VALIDADORES_CSV[candidato][0]
+                if valores and sum(1 for v in valores if patron.match(v)) >= self.umbral * len(valores):
+                    tipo = candidato
+                    break
+            tipos.append(tipo)
+        return tipos
+
+    def _errores_fila(self, i: int, l: str) -> List[Tuple[int, int, object]]:
+        # La misma revisión que hacía validar_csv con cada fila
         if not l:
-            continue
+            return []
         campos = l.split(',')
-        if len(campos) != num_cols:
-            errores.append(ErrorValidacion(
-                i, f"Se esperaban {num_cols} columnas, se encontraron {len(campos)}",
-                f"La cabecera define: {', '.join(cabecera)}"))
-            continue
-        for j, (campo, tipo) in enumerate(zip(campos, tipos)):
-            patron, descripcion = VALIDADORES[tipo]
-            if not patron.match(campo):
-                errores.append(ErrorValidacion(
-                    i, f"Columna '{cabecera[j]}' (col {j+1}): '{campo}' no es {tipo}",
-                    f"Se esperaba {descripcion}"))
-
-    return errores
+        if len(campos) != len(self.cabecera):
+            return [(i, -1, len(campos))]
+        return [(i, j, campo) for j, (campo, tipo) in enumerate(zip(campos, self.tipos))
+                if not VALIDADORES_CSV[tipo][0].match(campo)]
+
+    def _errores_bloque(self, regex_filas: re.Pattern, texto: str, inicio: int,
+                        num_lineas: int) -> Optional[List[Tuple[int, int, object]]]:
+        """Errores de las filas de texto, o None si no trae exactamente
+        num_lineas líneas terminadas en '\n' (hay que normalizarlo). Las
+        líneas se cuentan al avanzar, sin una pasada aparte"""
+        if not texto.endswith('\n'):
+            return None
+        errores = []
+        pos, i = 0, inicio
+        while True:
+            fin = regex_filas.match(texto, pos).end()
+            i += texto.count('\n', pos, fin)
+            if fin == len(texto):
+                break
+            siguiente = texto.index('\n', fin) + 1
+            errores.extend(self._errores_fila(i, texto[fin:siguiente - 1]))
+            pos, i = siguiente, i + 1
+        return errores if i - inicio == num_lineas else None
+
+    def errores(self, lineas: Iterable[str]) -> Iterator[Tuple[array, array, list]]:
+        lineas = iter(lineas)
+        primera = next(lineas, None)
+        if primera is None:
+            return
+        self.cabecera = primera.rstrip('\n').split(',')
+        self.tipos = ['string'] * len(self.cabecera)
+
+        inicio = 2  # número de línea de la primera fila del bloque
+        while True:
+            bloque = list(islice(lineas, self.tam_bloque))
+            if not bloque:
+                return
+            if inicio == 2:
+                muestra = [l.rstrip('\n').split(',') for l in bloque[:self.muestra]]
+                self.tipos = self.inferir_tipos(muestra)
+                # Cuatro filas por vuelta y luego de una en una: menos vueltas de re
+                fila = ",".join(CELDAS_CSV[t] for t in self.tipos) + "\n"
+                regex_filas = re.compile(f"(?:{fila * 4})*+(?:{fila})*+")
+            texto = "".join(bloque)
+            errores = self._errores_bloque(regex_filas, texto, inicio, len(bloque))
+            if errores is None:
+                # Alguna línea sin '\n' (p. ej. una lista de cadenas): se normaliza
+                texto = "".join(l.rstrip('\n') + '\n' for l in bloque)
+                errores = self._errores_bloque(regex_filas, texto, inicio, len(bloque))
+
+            if errores:
+                yield (array('q', (e[0] for e in errores)), array('q', (e[1] for e in errores)),
+                       [e[2] for e in errores])
+            inicio += len(bloque)
+
+
+def validar_csv(lineas: Iterable[str], muestra: int = 1) -> Iterator[ErrorValidacion]:
+    """
+    Infiere tipos de columna desde las primeras `muestra` filas de datos
+    y valida el resto según esos tipos (ver ValidadorCSV).
+    Tipos soportados: int, email, bool, string (fallback)
+    """
+    validador = ValidadorCSV(muestra)
+    for filas, columnas, valores in validador.errores(lineas):
+        cabecera, tipos = validador.cabecera, validador.tipos
+        for i, j, valor in zip(filas, columnas, valores):
+            if j < 0:
+                yield ErrorValidacion(
+                    i, f"Se esperaban {len(cabecera)} columnas, se encontraron {valor}",
+                    f"La cabecera define: {', '.join(cabecera)}")
+            else:
+                yield ErrorValidacion(
+                    i, f"Columna '{cabecera[j]}' (col {j+1}): '{valor}' no es {tipos[j]}",
+                    f"Se esperaba {VALIDADORES_CSV[tipos[j]][1]}")
 
 
 def _ip_valida(m: re.Match) -> bool:
     return all(0 <= int(g) <= 255 for g in m.groups())
 
 
-def validar_hosts(lineas: List[str]) -> List[ErrorValidacion]:
-    errores = []
-
+def validar_hosts(lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
     for i, linea in enumerate(lineas, 1):
         l = linea.rstrip('\n')
-        if RE_HOST_EMPTY.match(l) or RE_HOST_COMMENT.match(l):
+        if _HOSTS_POR_INICIAL.get(l[:1], _HOSTS_MAESTRO)(l):
             continue
 
         partes = l.split()
         if len(partes) < 2:
-            errores.append(ErrorValidacion(
+            yield ErrorValidacion(
                 i, f"Línea incompleta: '{l}'",
-                "Formato: <ip>   <hostname> [alias ...]"))
+                "Formato: <ip>   <hostname> [alias ...]")
             continue
 
         ip_str = partes[0]
         m = RE_HOST_IPV4.match(ip_str)
         if not m:
-            errores.append(ErrorValidacion(
+            yield ErrorValidacion(
                 i, f"IP inválida: '{ip_str}'",
-                "Usa formato IPv4, ej: 192.168.1.1"))
+                "Usa formato IPv4, ej: 192.168.1.1")
         elif not _ip_valida(m):
-            errores.append(ErrorValidacion(
+            yield ErrorValidacion(
                 i, f"IP fuera de rango: '{ip_str}'",
-                "Cada octeto debe estar entre 0 y 255"))
+                "Cada octeto debe estar entre 0 y 255")
 
         for nombre in partes[1:]:
-            if not RE_HOST_NAME.match(nombre):
-                errores.append(ErrorValidacion(
+            if not _hostname_valido(nombre):
+                yield ErrorValidacion(
                     i, f"Hostname inválido: '{nombre}'",
-                    "Solo letras, dígitos, guiones y puntos; no puede empezar/terminar con guión"))
-
-    return errores
+                    "Solo letras, dígitos, guiones y puntos; no puede empezar/terminar con guión")
 
 
 # ─────────────────────────────────────────────
@@ -187,6 +362,7 @@ def validar_hosts(lineas: List[str]) -> List[ErrorValidacion]:
 # ─────────────────────────────────────────────
 
 def detectar_formato(nombre_archivo: str, lineas: List[str]) -> str:
+    """Sólo usa las primeras 10 líneas"""
     ext = nombre_archivo.rsplit('.', 1)[-1].lower() if '.' in nombre_archivo else ''
     if ext == 'ini':
         return 'ini'
@@ -220,32 +396,297 @@ VALIDADORES_MAP = {
     'hosts':      validar_hosts,
 }
 
-def validar_archivo(ruta: str, formato: str = None) -> None:
+def _validador(fmt: str, muestra: int = 1):
+    """La función de VALIDADORES_MAP para fmt; en CSV, con `muestra` filas para inferir tipos"""
+    if fmt == 'csv':
+        return lambda lineas: validar_csv(lineas, muestra)
+    return VALIDADORES_MAP[fmt]
+
+def validar_archivo(ruta: str, formato: str = None, max_errores: Optional[int] = None,
+                    solo_contar: bool = False, muestra: int = 1) -> Optional[int]:
+    """Valida el archivo línea por línea, con memoria constante, e imprime los
+    errores conforme aparecen. Regresa cuántos errores hubo (None si no se
+    pudo validar). max_errores (al menos 1) detiene la lectura al llegar a
+    ese número de errores; solo_contar no imprime los errores, sólo el total;
+    muestra es el número de filas de un CSV con que se infieren los tipos"""
+    if max_errores is not None and max_errores < 1:
+        print(f"[ERROR] max_errores debe ser al menos 1 (se pidió {max_errores})")
+        return None
     try:
-        with open(ruta, 'r', encoding='utf-8') as f:
-            lineas = f.readlines()
+        f = open(ruta, 'r', encoding='utf-8')
     except FileNotFoundError:
         print(f"[ERROR] Archivo no encontrado: {ruta}")
-        return
-
-    fmt = formato or detectar_formato(ruta, lineas)
-    if fmt not in VALIDADORES_MAP:
-        print(f"[ERROR] Formato desconocido: '{fmt}'. Opciones: {list(VALIDADORES_MAP)}")
-        return
+        return None
+
+    with f:
+        cabeza = list(islice(f, 10))
+        fmt = formato or detectar_formato(ruta, cabeza)
+        if fmt not in VALIDADORES_MAP:
+            print(f"[ERROR] Formato desconocido: '{fmt}'. Opciones: {list(VALIDADORES_MAP)}")
+            return None
+
+        print(f"\n{'='*55}")
+        print(f"  Validando: {ruta}  (formato: {fmt.upper()})")
+        print(f"{'='*55}")
+
+        total = 0
+        # islice deja de leer en cuanto se llega al límite, sin buscar un error más
+        for e in islice(_validador(fmt, muestra)(chain(cabeza, f)), max_errores):
+            if not solo_contar:
+                if total == 0:
+                    print("  ✖  Errores encontrados:\n")
+                print(e)
+            total += 1
+
+    if not total:
+        print("  ✔  Validación exitosa. Sin errores encontrados.")
+    else:
+        if not solo_contar:
+            print()
+        nota = " (lectura detenida al llegar al límite de max_errores)" if total == max_errores else ""
+        print(f"  ✖  Se encontraron {total} error(es){nota}")
+    print()
+    return total
 
-    print(f"\n{'='*55}")
-    print(f"  Validando: {ruta}  (formato: {fmt.upper()})")
-    print(f"{'='*55}")
 
-    errores = VALIDADORES_MAP[fmt](lineas)
+# ─────────────────────────────────────────────
+#  Validación de muchos archivos con caché
+#  Cada resultado se guarda en disco bajo una clave (hash del contenido,
+#  formato, versión de los validadores, max_errores, muestra): en un árbol sin
+#  cambios sólo se leen y se hashean los archivos
+# ─────────────────────────────────────────────
 
-    if not errores:
-        print("  ✔  Validación exitosa. Sin errores encontrados.")
+# Hash del propio código: cualquier cambio en los patrones o validadores
+# invalida la caché sin tener que acordarse de subir un número de versión
+with open(__file__, 'rb') as _fuente:
+    VERSION_VALIDADORES = blake2b(_fuente.read(), digest_size=8).hexdigest()
+
+EXTENSIONES_VALIDABLES = ('.ini', '.properties', '.csv', '.hosts')
+
+
+class CacheValidacion:
+    """Un archivo JSON por resultado en <directorio>/<2 hex>/<clave>.json.
+    Se escribe a un temporal y se renombra, así que dos corridas a la vez
+    nunca ven un resultado a medias"""
+    def __init__(self, directorio: str = '.cache_validacion'):
+        self.directorio = directorio
+
+    @staticmethod
+    def clave(hash_contenido: str, formato: str, max_errores: Optional[int], muestra: int = 1) -> str:
+        partes = f"{hash_contenido}|{formato}|{VERSION_VALIDADORES}|{max_errores}|{muestra}"
+        return blake2b(partes.encode(), digest_size=16).hexdigest()
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], clave + '.json')
+
+    def obtener(self, clave: str) -> Optional[List[Tuple[int, str, str]]]:
+        try:
+            with open(self._ruta(clave), 'r', encoding='utf-8') as f:
+                return [tuple(e) for e in json.load(f)]
+        except (OSError, ValueError):
+            return None
+
+    def guardar(self, clave: str, errores: List[Tuple[int, str, str]]) -> None:
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(errores, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+
+def expandir_rutas(patron: str) -> List[str]:
+    """Un directorio se recorre completo buscando archivos con extensión
+    validable (o llamados 'hosts'); cualquier otra cosa se trata como glob
+    ('**' recursivo). Regresa las rutas ordenadas y sin repetir"""
+    if os.path.isdir(patron):
+        rutas = [os.path.join(raiz, nombre)
+                 for raiz, _, nombres in os.walk(patron)
+                 for nombre in nombres
+                 if nombre == 'hosts' or nombre.lower().endswith(EXTENSIONES_VALIDABLES)]
     else:
-        print(f"  ✖  Se encontraron {len(errores)} error(es):\n")
-        for e in errores:
-            print(e)
-    print()
+        rutas = [r for r in glob.glob(patron, recursive=True) if os.path.isfile(r)]
+    return sorted(set(rutas))
+
+
+def _hash_y_cabeza(ruta: str, tam_bloque: int = 1 << 20) -> Tuple[str, List[str]]:
+    # Una sola lectura: el hash de todo el contenido y las primeras líneas
+    # para detectar el formato
+    h = blake2b(digest_size=16)
+    with open(ruta, 'rb') as f:
+        primero = f.read(tam_bloque)
+        h.update(primero)
+        for bloque in iter(lambda: f.read(tam_bloque), b''):
+            h.update(bloque)
+    cabeza = primero.decode('utf-8', 'replace').splitlines(keepends=True)[:10]
+    return h.hexdigest(), cabeza
+
+
+def _validar_en_trabajador(ruta: str, fmt: str, max_errores: Optional[int],
+                           muestra: int = 1) -> Tuple[Optional[list], str, float]:
+    """Corre en el pool: regresa (errores, mensaje de fallo, segundos)"""
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            errores = _validador(fmt, muestra)(f)
+            if max_errores is not None:
+                errores = islice(errores, max_errores)
+            resultado = [(e.linea, e.mensaje, e.sugerencia) for e in errores]
+    except (OSError, UnicodeDecodeError) as e:
+        return None, str(e), time.perf_counter() - inicio
+    return resultado, '', time.perf_counter() - inicio
+
+
+def validar_rutas(patron: str, formato: str = None, max_errores: Optional[int] = None,
+                  solo_contar: bool = False, procesos: Optional[int] = None,
+                  cache: Optional[CacheValidacion] = CacheValidacion(), muestra: int = 1) -> Optional[int]:
+    """Valida todos los archivos de un directorio o glob. Los que no están en
+    la caché se validan en un pool de `procesos` procesos (por omisión, uno
+    por CPU; 1 = en este proceso). Imprime una línea por archivo con su tiempo
+    y si vino de la caché, los errores (salvo con solo_contar) y el resumen.
+    Regresa el total de errores (None si ningún archivo coincide).
+    cache=None desactiva la caché; muestra es como en validar_archivo"""
+    if max_errores is not None and max_errores < 1:
+        print(f"[ERROR] max_errores debe ser al menos 1 (se pidió {max_errores})")
+        return None
+    inicio_total = time.perf_counter()
+    rutas = expandir_rutas(patron)
+    if not rutas:
+        print(f"[ERROR] Ningún archivo coincide con: {patron}")
+        return None
+
+    # 1) Hash y formato de cada archivo; los aciertos de caché quedan resueltos aquí
+    resultados = {}     # ruta -> (formato, errores o None, fallo, segundos, de_cache)
+    pendientes = []     # (ruta, formato, clave)
+    for ruta in rutas:
+        inicio = time.perf_counter()
+        try:
+            hash_contenido, cabeza = _hash_y_cabeza(ruta)
+        except OSError as e:
+            resultados[ruta] = ('?', None, str(e), time.perf_counter() - inicio, False)
+            continue
+        fmt = formato or detectar_formato(ruta, cabeza)
+        if fmt not in VALIDADORES_MAP:
+            resultados[ruta] = (fmt, None, f"Formato desconocido: '{fmt}'",
+                                time.perf_counter() - inicio, False)
+            continue
+        clave = CacheValidacion.clave(hash_contenido, fmt, max_errores, muestra)
+        errores = cache.obtener(clave) if cache else None
+        if errores is not None:
+            resultados[ruta] = (fmt, errores, '', time.perf_counter() - inicio, True)
+        else:
+            pendientes.append((ruta, fmt, clave))
+
+    # 2) Los que faltan, en paralelo; el pool sólo se levanta si hay trabajo
+    if pendientes:
+        args = ([r for r, _, _ in pendientes], [f for _, f, _ in pendientes],
+                repeat(max_errores), repeat(muestra))
+        procesos = procesos or os.cpu_count() or 1
+        if procesos <= 1 or len(pendientes) == 1:
+            salidas = list(map(_validar_en_trabajador, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=min(procesos, len(pendientes))) as pool:
+                salidas = list(pool.map(_validar_en_trabajador, *args,
+                                        chunksize=max(1, len(pendientes) // (4 * procesos))))
+        for (ruta, fmt, clave), (errores, fallo, segundos) in zip(pendientes, salidas):
+            errores = [tuple(e) for e in errores] if errores is not None else None
+            resultados[ruta] = (fmt, errores, fallo, segundos, False)
+            if cache and errores is not None:
+                cache.guardar(clave, errores)
+
+    # 3) Reporte en orden de ruta
+    total = fallidos = aciertos = 0
+    for ruta in rutas:
+        fmt, errores, fallo, segundos, de_cache = resultados[ruta]
+        origen = "caché" if de_cache else "validado"
+        if errores is None:
+            fallidos += 1
+            print(f"  ?  {ruta}  [ERROR] {fallo}  ({segundos * 1000:.1f} ms)")
+            continue
+        aciertos += de_cache
+        total += len(errores)
+        marca = '✖' if errores else '✔'
+        print(f"  {marca}  {ruta}  ({fmt.upper()}): {len(errores)} error(es)  "
+              f"{segundos * 1000:.1f} ms, {origen}")
+        if not solo_contar:
+            for linea, mensaje, sugerencia in errores:
+                print(f"  {ErrorValidacion(linea, mensaje, sugerencia)}")
+
+    print(f"\n  Archivos: {len(rutas)}  (de caché: {aciertos}, validados: "
+          f"{len(rutas) - aciertos - fallidos}, con fallo: {fallidos})")
+    print(f"  Errores: {total}  Tiempo total: {time.perf_counter() - inicio_total:.3f} s\n")
+    return total
+
+
+# ─────────────────────────────────────────────
+#  Validación incremental (editor / LSP)
+# ─────────────────────────────────────────────
+
+PASOS_INCREMENTALES = {
+    'ini':        (_paso_ini, False),
+    'properties': (_paso_properties, None),
+}
+
+
+class ValidadorIncremental:
+    """Mantiene las líneas de un archivo INI o properties con su estado de
+    parseo y su error, y revalida sólo lo necesario tras cada edición.
+    Para cada línea k se guarda el estado antes de ella (_antes[k]; el último
+    elemento es el estado al final del archivo) como punto de control: una
+    edición se revalida desde su primera línea, con el estado guardado, y
+    sigue después de las líneas nuevas sólo mientras el estado no coincida
+    con el que ya tenía la línea siguiente. Una edición que no cambia el
+    estado cuesta lo que sus propias líneas; una que lo cambia (p. ej. la
+    primera sección de un INI) revalida hasta donde deja de importar"""
+    def __init__(self, lineas: Iterable[str] = (), formato: str = 'ini'):
+        if formato not in PASOS_INCREMENTALES:
+            raise ValueError(f"Formato sin validación incremental: '{formato}'. "
+                             f"Opciones: {list(PASOS_INCREMENTALES)}")
+        self.formato = formato
+        self._paso, inicial = PASOS_INCREMENTALES[formato]
+        self._lineas: List[str] = []
+        self._antes: list = [inicial]
+        self._errores: List[Optional[Tuple[str, str]]] = []
+        self.total_errores = 0
+        self.editar(1, lineas, borradas=0)
+
+    def __len__(self) -> int:
+        return len(self._lineas)
+
+    def editar(self, linea: int, nuevas: Iterable[str], borradas: int = 1) -> List[ErrorValidacion]:
+        """Sustituye `borradas` líneas a partir de `linea` (desde 1) por `nuevas`
+        (borradas=0 inserta antes de `linea`; linea=len+1 agrega al final).
+        Regresa los errores del tramo revalidado, con la numeración nueva;
+        fuera de ese tramo los errores no cambian, sólo se recorren"""
+        i = linea - 1
+        if not 0 <= i <= len(self._lineas) or borradas < 0 or i + borradas > len(self._lineas):
+            raise IndexError(f"Edición fuera del archivo: línea {linea}, {borradas} borradas "
+                             f"de {len(self._lineas)}")
+        nuevas = [l.rstrip('\n') for l in nuevas]
+        m = len(nuevas)
+        estado = self._antes[i]
+        self.total_errores -= borradas - self._errores[i:i + borradas].count(None)
+        self._lineas[i:i + borradas] = nuevas
+        self._errores[i:i + borradas] = [None] * m
+        # Tras el reemplazo, _antes[i + m] es el estado guardado de la primera
+        # línea que no cambió: ahí se compara para saber si ya convergió
+        self._antes[i:i + borradas] = [None] * m
+
+        paso, lineas, antes, errores = self._paso, self._lineas, self._antes, self._errores
+        k, fin = i, len(lineas)
+        while k < fin and (k < i + m or estado != antes[k]):
+            antes[k] = estado
+            estado, error = paso(estado, lineas[k])
+            self.total_errores += (error is not None) - (errores[k] is not None)
+            errores[k] = error
+            k += 1
+        antes[k] = estado
+        return [ErrorValidacion(n + 1, *errores[n]) for n in range(i, k) if errores[n]]
+
+    def errores(self) -> List[ErrorValidacion]:
+        """Todos los errores actuales, en orden de línea"""
+        con_error = compress(range(len(self._errores)), self._errores)
+        return [ErrorValidacion(n + 1, *self._errores[n]) for n in con_error]
 
 
 # ─────────────────────────────────────────────
@@ -284,9 +725,23 @@ def demo():
 
 
 if __name__ == '__main__':
-    if len(sys.argv) >= 2:
-        fmt_arg = sys.argv[2] if len(sys.argv) >= 3 else None
-        validar_archivo(sys.argv[1], fmt_arg)
+    # Opciones: --contar (sólo el total), --max-errores=N y --muestra=N (filas
+    # con que se infieren los tipos de un CSV). Si el argumento es un
+    # directorio o un glob ('conf/**/*.ini') se validan todos los archivos
+    opciones = [a for a in sys.argv[1:] if a.startswith('--')]
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    max_arg = next((int(o.split('=', 1)[1]) for o in opciones if o.startswith('--max-errores=')), None)
+    muestra_arg = next((int(o.split('=', 1)[1]) for o in opciones if o.startswith('--muestra=')), 1)
+    if argumentos and (os.path.isdir(argumentos[0]) or glob.has_magic(argumentos[0])):
+        # Directorio o glob: --procesos=N, --sin-cache, --cache=DIR
+        fmt_arg = argumentos[1] if len(argumentos) >= 2 else None
+        procesos_arg = next((int(o.split('=', 1)[1]) for o in opciones if o.startswith('--procesos=')), None)
+        dir_cache = next((o.split('=', 1)[1] for o in opciones if o.startswith('--cache=')), '.cache_validacion')
+        cache_arg = None if '--sin-cache' in opciones else CacheValidacion(dir_cache)
+        validar_rutas(argumentos[0], fmt_arg, max_arg, '--contar' in opciones, procesos_arg, cache_arg, muestra_arg)
+    elif argumentos:
+        fmt_arg = argumentos[1] if len(argumentos) >= 2 else None
+        validar_archivo(argumentos[0], fmt_arg, max_arg, '--contar' in opciones, muestra_arg)
     else:
         print("Modo demo — ejecutando casos de prueba...\n")
         demo()
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Benchmark de ejercicio1_1: validadores con regex contra el camino rápido
+sin regex. Desde la raíz del repositorio:
+
+    python bench/bench_ejercicio1_1.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parte1_Regex"))
+from ejercicio1_1 import validar_ipv4, validar_password_fuerte  # noqa: E402
+
+# ─────────────────────────────────────────────
+#  Corpus aleatorio
+# ─────────────────────────────────────────────
+
+def ip_aleatoria(rng):
+    """IPv4 válidas y casi válidas: octetos fuera de rango, ceros a la
+    izquierda, texto, dígitos Unicode y saltos de línea al final"""
+    opciones = [
+        lambda: str(rng.randint(0, 255)),
+        lambda: str(rng.randint(256, 999)),
+        lambda: "0" + str(rng.randint(0, 99)),
+        lambda: rng.choice(["", "a", "-1", "1a", "0000", "٣", " 1"]),
+    ]
+    n = rng.choice([4, 4, 4, 3, 5])
+    return ".".join(rng.choice(opciones)() for _ in range(n)) + rng.choice(["", "", "", "\n", "."])
+
+def password_aleatoria(rng, longitud):
+    """Contraseña de `longitud` caracteres con alguna letra o dígito no ASCII"""
+    alfabeto = "ABCDEFGHabcdefgh0123456789!@#$%^&*_- "
+    texto = [rng.choice(alfabeto) for _ in range(longitud)]
+    if rng.random() < 0.1:
+        # Algunos casos con caracteres no ASCII, incluido un dígito Unicode
+        texto[rng.randrange(longitud)] = rng.choice("٣é")
+    return "".join(texto) + rng.choice(["", "", "\n", "\nX"])
+
+# ─────────────────────────────────────────────
+#  Regex contra camino rápido
+# ─────────────────────────────────────────────
+
+def _medir(funcion, datos):
+    inicio = time.perf_counter()
+    resultado = [funcion(d) for d in datos]
+    return resultado, len(datos) / (time.perf_counter() - inicio)
+
+def benchmark(n=20_000, semilla=2223):
+    """Comprueba equivalencia sobre un corpus aleatorio y reporta registros/s"""
+    rng = random.Random(semilla)
+    casos = [("ipv4", 15, [ip_aleatoria(rng) for _ in range(n)])]
+    for longitud in (8, 16, 64, 256, 1024):
+        casos.append(("password", longitud, [password_aleatoria(rng, longitud) for _ in range(n)]))
+    # Casi válidas: una sola mayúscula al inicio obliga a los lookaheads a recorrer todo
+    for longitud in (64, 256, 1024, 4096):
+        casos.append(("password casi", longitud, ["A1!" + "b2" * (longitud // 2)] * (n // 10)))
+
+    print(f"{'tipo':<14}{'long.':>7}{'regex (reg/s)':>16}{'rápido (reg/s)':>17}{'aceleración':>13}")
+    for tipo, longitud, datos in casos:
+        validador = validar_ipv4 if tipo == "ipv4" else validar_password_fuerte
+        esperado, v_regex = _medir(validador, datos)
+        obtenido, v_rapido = _medir(lambda d: validador(d, rapido=True), datos)
+        if esperado != obtenido:
+            malo = next(d for d, a, b in zip(datos, esperado, obtenido) if a != b)
+            raise AssertionError(f"{tipo}: resultados distintos para {malo!r}")
+        print(f"{tipo:<14}{longitud:>7}{v_regex:>16,.0f}{v_rapido:>17,.0f}{v_rapido / v_regex:>12.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
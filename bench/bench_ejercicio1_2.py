@@ -0,0 +1,113 @@
+"""Benchmarks de ejercicio1_2 (analizar_log). Desde la raíz del repositorio:
+
+    python bench/bench_ejercicio1_2.py [--bench [ARCHIVO]]   serial contra paralelo
+    python bench/bench_ejercicio1_2.py --verificar           resúmenes contra valores exactos
+"""
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+CARPETA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parte1_Regex")
+sys.path.insert(0, CARPETA)
+from ejercicio1_2 import RE_IP, analizar_log  # noqa: E402
+
+
+# ─────────────────────────────────────────────
+#  Análisis serial contra paralelo
+# ─────────────────────────────────────────────
+
+def benchmark(archivo=None, lineas=2_000_000, procesos=(1, 2, 4, 8, 16)):
+    """Compara el análisis serial contra el paralelo; sin archivo genera un log
+    sintético a partir de sistema.log"""
+    temporal = archivo is None
+    if temporal:
+        with open(os.path.join(CARPETA, "sistema.log"), encoding="utf-8") as f:
+            base = f.read().splitlines()
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False, encoding='utf-8') as tmp:
+            for i in range(lineas):
+                tmp.write(base[i % len(base)].replace("1234ms", f"{i % 5000}ms")
+                          .replace("192.168.1.100", f"10.{i % 7}.{i % 251}.{i % 13}") + "\n")
+            archivo = tmp.name
+    try:
+        print(f"Archivo: {archivo} ({os.path.getsize(archivo) / 2**20:.1f} MB)")
+        referencia, base_t = None, None
+        for n in procesos:
+            inicio = time.perf_counter()
+            r = analizar_log(archivo, max_muestras=100, procesos=n, tam_fragmento=8 << 20)
+            t = time.perf_counter() - inicio
+            if referencia is None:
+                referencia, base_t = r, t
+            elif vars(r) != vars(referencia):
+                raise AssertionError(f"El resultado con {n} procesos difiere del serial")
+            print(f"  {n:>2} proceso(s): {t:7.2f} s  aceleración {base_t / t:5.2f}x")
+    finally:
+        if temporal:
+            os.unlink(archivo)
+
+
+# ─────────────────────────────────────────────
+#  Resúmenes aproximados contra valores exactos
+# ─────────────────────────────────────────────
+
+def verificar_resumenes(lineas=300_000, semilla=7):
+    """Compara los resúmenes contra los valores exactos sobre un log sintético
+    y verifica que cada error quede dentro de su cota documentada"""
+    rng = random.Random(semilla)
+    pesadas = [f"192.168.0.{i}" for i in range(1, 21)]
+    with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False, encoding='utf-8') as tmp:
+        for i in range(lineas):
+            # Mitad de las líneas de unas cuantas IPs con distribución de Zipf, el resto dispersas
+            if rng.random() < 0.5:
+                ip = pesadas[min(int(rng.paretovariate(1.0)), 20) - 1]
+            else:
+                ip = f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(8)}"
+            ruta = f"/srv/app/m{int(rng.paretovariate(1.5)) % 500}.py"
+            tmp.write(f"2026-02-15 10:00:00 [INFO] {ip} abrió {ruta} en {int(rng.lognormvariate(4, 1.2))}ms\n")
+        archivo = tmp.name
+    try:
+        exacto = analizar_log(archivo)
+        aprox = analizar_log(archivo, max_muestras=0, aproximado=True)
+        reales = Counter()
+        tiempos = []
+        with open(archivo, encoding='utf-8') as f:
+            for linea in f:
+                reales[RE_IP.search(linea, 26).group()] += 1
+                tiempos.append(int(linea.rsplit(' ', 1)[1][:-3]))
+        tiempos.sort()
+
+        distintas = aprox.ips_distintas.estimar()
+        error = abs(distintas - len(exacto.ips)) / len(exacto.ips)
+        cota = 3 * 1.04 / math.sqrt(aprox.ips_distintas.m)
+        print(f"IPs distintas: exacto {len(exacto.ips)}, HLL {distintas} (error {error:.2%}, cota 3σ {cota:.2%})")
+        assert error <= cota
+
+        holgura = aprox.top_ips.total / aprox.top_ips.k
+        for ip, n in aprox.top_ips.mas_comunes(5):
+            print(f"  {ip}: estimado {n}, real {reales[ip]} (cota +{holgura:.0f})")
+            assert reales[ip] <= n <= reales[ip] + holgura
+        for ip, n in reales.items():
+            if n > holgura:
+                assert ip in aprox.top_ips.conteos
+
+        for q in (0.5, 0.95, 0.99):
+            real = tiempos[int(q * (len(tiempos) - 1))]
+            estimado = aprox.cuantiles_ms.cuantil(q)
+            print(f"p{int(q * 100)}: real {real}ms, estimado {estimado:.1f}ms (cota ±{aprox.cuantiles_ms.alfa:.0%})")
+            assert abs(estimado - real) <= aprox.cuantiles_ms.alfa * real
+        print("Todos los resúmenes dentro de sus cotas")
+    finally:
+        os.unlink(archivo)
+
+
+if __name__ == "__main__":
+    # Sin opciones corre todos; con una opción sólo ese y sus argumentos
+    opciones = [a for a in sys.argv[1:] if a.startswith('--')]
+    extra = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not opciones or '--bench' in opciones:
+        benchmark(*extra[:1])
+    if not opciones or '--verificar' in opciones:
+        verificar_resumenes()
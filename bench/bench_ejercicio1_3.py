@@ -0,0 +1,88 @@
+"""Benchmarks de ejercicio1_3 (CifradorROT) y las implementaciones anteriores
+con que se comparan. Desde la raíz del repositorio:
+
+    python bench/bench_ejercicio1_3.py [MB]          rotación y protección
+    python bench/bench_ejercicio1_3.py --lote [MB]   cifrar_lote serial y en paralelo
+"""
+import os
+import pathlib
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parte1_Regex"))
+from ejercicio1_3 import CifradorROT, tablas_rot  # noqa: E402
+
+def procesar_con_marcadores(cifrador, texto, n_actual):
+    """Implementación anterior de procesar_texto (marcadores __PROT_i__ y dos
+    re.sub); referencia para benchmark y para las pruebas"""
+    protegidos = []
+
+    def guardar_y_marcar(match):
+        protegidos.append(match.group(0))
+        return f"__PROT_{len(protegidos)-1}__"
+
+    texto_marcado = cifrador.regex_total().sub(guardar_y_marcar, texto)
+    texto_cifrado = cifrador.rotar(texto_marcado, n_actual)
+    marcador_busqueda = cifrador.rotar("PROT", n_actual)
+    return re.sub(fr'__{marcador_busqueda}_(\d+)__', lambda m: protegidos[int(m.group(1))], texto_cifrado)
+
+def benchmark(megabytes=100, n=13):
+    """Rendimiento de la rotación: ciclo por carácter (antes) contra translate"""
+    base = "Contacto: Uriel@email.com, Fecha: 13/12/2002. Este es un mensaje, no lo leas.\n"
+    texto = base * (megabytes * 2**20 // len(base))
+    texto_no_ascii = texto.replace("mensaje", "mensajé")
+    cifrador = CifradorROT(n)
+    mb = len(texto) / 2**20
+    print(f"Texto de {mb:.0f} MB")
+
+    def medir(nombre, funcion, entrada):
+        inicio = time.perf_counter()
+        resultado = funcion(entrada)
+        t = time.perf_counter() - inicio
+        print(f"  {nombre:<34} {t:8.2f} s  {mb / t:9.1f} MB/s")
+        return resultado
+
+    por_caracter = lambda t: "".join([cifrador.cifrar_caracter(c, n) for c in t])
+    antes = medir("por carácter", por_caracter, texto)
+    despues = medir("translate (ASCII)", lambda t: cifrador.rotar(t, n), texto)
+    assert antes == despues
+    despues = medir("translate (con no ASCII)", lambda t: cifrador.rotar(t, n), texto_no_ascii)
+    assert despues[:100_000] == por_caracter(texto_no_ascii[:100_000])
+    medir("str.translate (respaldo)", lambda t: t.translate(tablas_rot(n)[0]), texto_no_ascii)
+
+    # Protección: marcadores __PROT_i__ con dos re.sub (antes) contra tramos
+    denso = "a@b.mx 01/02/2003 (555) 123-4567 x " * (megabytes * 2**20 // 36)
+    texto = texto[:len(denso)]
+    mb = len(denso) / 2**20
+    print(f"Protección, {mb:.0f} MB")
+    for nombre, entrada in (("texto normal", texto), ("denso en protegidos", denso)):
+        antes = medir(f"marcadores, {nombre}", lambda t: procesar_con_marcadores(cifrador, t, n), entrada)
+        despues = medir(f"tramos, {nombre}", lambda t: cifrador.procesar_texto(t, n), entrada)
+        assert antes == despues
+
+def benchmark_lote(megabytes=64, workers=None):
+    """cifrar_lote sobre muchos documentos chicos y uno grande, serial y en paralelo"""
+    workers = workers or os.cpu_count() or 1
+    base = "Contacto: Uriel@email.com, Fecha: 13/12/2002. Este es un mensaje, no lo leas.\n"
+    cifrador = CifradorROT()
+    with tempfile.TemporaryDirectory() as carpeta:
+        grande = pathlib.Path(carpeta, "grande.txt")
+        grande.write_text(base * (megabytes * 2**20 // len(base)), encoding='utf-8')
+        chicos = [base * 50 for _ in range(2000)]
+        esperado = None
+        for w in sorted({1, workers}):
+            print(f"\n--- workers={w} ---")
+            reporte = cifrador.cifrar_lote([grande] + chicos, workers=w, tam_segmento=4 << 20)
+            reporte.mostrar(max_filas=3)
+            obtenido = (pathlib.Path(reporte.archivos[0][1]).read_text(encoding='utf-8'), reporte.resultados()[1:])
+            assert esperado is None or obtenido == esperado
+            esperado = obtenido
+
+if __name__ == "__main__":
+    extra = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--lote" in sys.argv:
+        benchmark_lote(int(extra[0]) if extra else 64)
+    else:
+        benchmark(int(extra[0]) if extra else 100)
@@ -0,0 +1,203 @@
+"""Benchmarks de ejercicio3_1 (AnalizadorSeguridad). Desde la raíz del
+repositorio:
+
+    python bench/bench_ejercicio3_1.py [--lexer] [--paralelo [N]] [--reglas]
+    python bench/bench_ejercicio3_1.py --carga [TASA SEGUNDOS ARCHIVOS]
+"""
+import asyncio
+import datetime
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+CARPETA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parte3_Aplicaciones")
+sys.path.insert(0, CARPETA)
+from ejercicio3_1 import AnalizadorSeguridad, IndiceReglas  # noqa: E402
+
+CONFIG = os.path.join(CARPETA, "config.json")
+
+
+# ─────────────────────────────────────────────
+#  Lexer de PLY contra tokenizador rápido
+# ─────────────────────────────────────────────
+
+def log_sintetico(n, semilla=2026):
+    """Líneas de auth.log con IPs 10.0.x.y, tres por segundo; fallos de login,
+    comandos peligrosos y texto que no debe alertar"""
+    rng = random.Random(semilla)
+    plantillas = [
+        "{ts} INFO: User admin logged in from {ip}",
+        "{ts} WARNING: Failed password for root from {ip} port 22 ssh2",
+        "{ts} WARNING: Invalid user oracle from {ip}",
+        "{ts} INFO: Accepted publickey for deploy from {ip} port 51234 ssh2: RSA SHA256:abc",
+        "{ts} CRITICAL: User developer executed rm -rf /var/www/html from {ip}",
+        "{ts} INFO: cron[2211]: (root) CMD (run-parts /etc/cron.hourly) ddos-check ok",
+    ]
+    inicio = datetime.datetime(2026, 2, 15)
+    lineas = []
+    for i in range(n):
+        ts = inicio + datetime.timedelta(seconds=i // 3)
+        ip = f"10.0.{rng.randint(0, 3)}.{rng.randint(0, 255)}"
+        lineas.append(rng.choice(plantillas).format(ts=ts, ip=ip) + "\n")
+    return lineas
+
+
+def benchmark_lexer(n=200_000, semilla=2026):
+    """Compara el lexer de PLY con el tokenizador rápido sobre un log sintético"""
+    lineas = log_sintetico(n, semilla)
+    resultados = {}
+    for modo in ("ply", "rapido"):
+        analizador = AnalizadorSeguridad(CONFIG)
+        analizador.tokenizar = getattr(analizador, f"_tokenizar_{modo}")
+        t = time.perf_counter()
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            for linea in lineas:
+                analizador.analizar_linea(linea)
+        t = time.perf_counter() - t
+        resultados[modo] = list(analizador.alertas)
+        print(f"{modo:<8} {t:7.2f} s  {n / t:>10,.0f} líneas/s  ({len(analizador.alertas)} alertas)")
+    assert resultados["ply"] == resultados["rapido"]
+
+
+# ─────────────────────────────────────────────
+#  procesar_log serial contra paralelo
+# ─────────────────────────────────────────────
+
+def benchmark_paralelo(n=1_000_000, semilla=2026):
+    """procesar_log serial contra paralelo con 2, 4, ... procesos"""
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "historico.log")
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.writelines(log_sintetico(n, semilla))
+        print(f"Log de {n:,} líneas ({os.path.getsize(ruta) / 2**20:.0f} MB), {os.cpu_count()} CPUs")
+        esperado = None
+        procesos = 1
+        while procesos <= max(2, os.cpu_count() or 1):
+            analizador = AnalizadorSeguridad(CONFIG)
+            t = time.perf_counter()
+            with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+                analizador.procesar_log(ruta, procesos=procesos, tam_fragmento=4 << 20)
+            t = time.perf_counter() - t
+            if esperado is None:
+                esperado = list(analizador.alertas)
+            assert list(analizador.alertas) == esperado
+            print(f"procesos={procesos:<3} {t:7.2f} s  {n / t:>10,.0f} líneas/s  ({len(analizador.alertas)} alertas)")
+            procesos *= 2
+
+
+# ─────────────────────────────────────────────
+#  Índice de reglas contra la lista
+# ─────────────────────────────────────────────
+
+def benchmark_reglas(n_ips=300_000, n_redes=20_000, n_comandos=5_000, n=100_000, semilla=2026):
+    """Consultas al índice de reglas contra el recorrido lineal de la lista"""
+    rng = random.Random(semilla)
+    ip = lambda: ".".join(str(rng.randint(0, 255)) for _ in range(4))
+    config = {
+        "blacklist_ips": [ip() for _ in range(n_ips)]
+                         + [f"{ip()}/{rng.randint(16, 30)}" for _ in range(n_redes)],
+        "danger_commands": ["rm -rf", "dd", "mkfs"]
+                           + [f"cmd{i} --{rng.choice(['force', 'all'])}" for i in range(n_comandos)],
+    }
+    t = time.perf_counter()
+    indice = IndiceReglas(config)
+    print(f"Índice construido en {time.perf_counter() - t:.2f} s "
+          f"({len(indice.ips)} IPs, {len(indice.inicios)} intervalos CIDR)")
+
+    consultas = [ip() for _ in range(n)]
+    lineas = [f"2026-02-15 10:00:01 INFO: user ran cmd{rng.randint(0, 2 * n_comandos)} --force from {c}\n"
+              for c in consultas]
+    for nombre, funcion, datos in (("ip_en_lista_negra", indice.ip_en_lista_negra, consultas),
+                                   ("comando_peligroso", indice.comando_peligroso, lineas)):
+        t = time.perf_counter()
+        aciertos = sum(1 for d in datos if funcion(d))
+        t = time.perf_counter() - t
+        print(f"{nombre:<20} {n / t:>12,.0f} consultas/s  ({aciertos} aciertos)")
+    lista = config["blacklist_ips"]
+    t = time.perf_counter()
+    for c in consultas[:200]:
+        c in lista
+    t = time.perf_counter() - t
+    print(f"{'lista (in)':<20} {200 / t:>12,.0f} consultas/s  (sólo IPs exactas)")
+
+
+# ─────────────────────────────────────────────
+#  Prueba de carga del modo seguimiento
+# ─────────────────────────────────────────────
+
+RE_MARCA = re.compile(r' t=(\d+\.\d+)$')
+
+
+def _marca_escritura(linea):
+    m = RE_MARCA.search(linea.rstrip('\n'))
+    return float(m.group(1)) if m else None
+
+
+async def _prueba_carga(tasa, segundos, archivos, carpeta):
+    analizador = AnalizadorSeguridad(CONFIG)
+    rutas = [os.path.join(carpeta, f"auth{i}.log") for i in range(archivos)]
+    for ruta in rutas:
+        open(ruta, 'w').close()
+    escritas = [0]
+
+    async def escritor(ruta, tasa_archivo, semilla):
+        # Escribe cada 10 ms las líneas que tocan; a la mitad rota el archivo
+        rng = random.Random(semilla)
+        f = open(ruta, 'a', encoding='utf-8')
+        inicio = time.monotonic()
+        rotado = False
+        propias = 0
+        try:
+            while (transcurrido := time.monotonic() - inicio) < segundos:
+                if not rotado and transcurrido >= segundos / 2:
+                    f.close()
+                    os.rename(ruta, ruta + ".1")
+                    f = open(ruta, 'a', encoding='utf-8')
+                    rotado = True
+                for _ in range(int(tasa_archivo * transcurrido) - propias):
+                    ip = "10.0.0.20" if rng.random() < 0.01 else f"172.20.{rng.randint(0, 255)}.{rng.randint(0, 255)}"
+                    ahora = datetime.datetime.now().replace(microsecond=0)
+                    f.write(f"{ahora} WARNING: Failed password for root from {ip} t={time.time():.6f}\n")
+                    propias += 1
+                f.flush()
+                await asyncio.sleep(0.01)
+        finally:
+            f.close()
+            escritas[0] += propias
+
+    detener = asyncio.Event()
+    seguimiento = asyncio.create_task(analizador.seguir(rutas, intervalo=0.05, detener=detener,
+                                                        marca_escritura=_marca_escritura))
+    await asyncio.sleep(0.1)  # los lectores se colocan al final de cada archivo
+    await asyncio.gather(*(escritor(ruta, tasa / archivos, i) for i, ruta in enumerate(rutas)))
+    await asyncio.sleep(0.5)
+    detener.set()
+    return escritas[0], await seguimiento
+
+
+def prueba_carga(tasa=5_000, segundos=5, archivos=2):
+    """Escribe en archivos temporales a `tasa` líneas/s mientras seguir() los
+    vigila, y reporta el rendimiento sostenido y la latencia de las alertas"""
+    with tempfile.TemporaryDirectory() as carpeta:
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            escritas, estadisticas = asyncio.run(_prueba_carga(tasa, segundos, archivos, carpeta))
+    print(f"Escritas: {escritas} líneas a {tasa:,} líneas/s en {archivos} archivos durante {segundos} s")
+    estadisticas.mostrar()
+
+
+if __name__ == "__main__":
+    # Sin opciones corre todos; con una opción sólo ese y sus números
+    opciones = [a for a in sys.argv[1:] if a.startswith('--')]
+    extra = [int(a) for a in sys.argv[1:] if not a.startswith('--')]
+    if not opciones or '--lexer' in opciones:
+        benchmark_lexer()
+    if not opciones or '--paralelo' in opciones:
+        benchmark_paralelo(*extra[:1])
+    if not opciones or '--reglas' in opciones:
+        benchmark_reglas()
+    if not opciones or '--carga' in opciones:
+        prueba_carga(*extra)
@@ -0,0 +1,297 @@
+"""Benchmarks de ejercicio3_2 y las implementaciones anteriores con que se
+comparan. Desde la raíz del repositorio:
+
+    python bench/bench_ejercicio3_2.py [--csv] [--incremental] [--clasificador]
+"""
+import os
+import random
+import sys
+import time
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Parte3_Aplicaciones"))
+from ejercicio3_2 import (RE_CSV_BOOL, RE_CSV_EMAIL, RE_CSV_INT, RE_CSV_STRING,  # noqa: E402
+                          RE_HOST_COMMENT, RE_HOST_EMPTY, RE_HOST_IPV4, RE_HOST_NAME,
+                          RE_INI_CLAVE, RE_INI_COMMENT, RE_INI_EMPTY, RE_INI_SECCION,
+                          RE_PROP_COMMENT, RE_PROP_EMPTY, RE_PROP_KV,
+                          ErrorValidacion, _hostname_valido, _ip_valida, _paso_ini,
+                          PASOS_INCREMENTALES, VALIDADORES_MAP, ValidadorIncremental,
+                          validar_csv, validar_hosts, validar_ini, validar_properties)
+
+
+# ─────────────────────────────────────────────
+#  CSV: por fila contra por bloque
+# ─────────────────────────────────────────────
+
+def validar_csv_por_fila(lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
+    """Implementación anterior de validar_csv (una regex por celda): la
+    referencia de benchmark_csv y de las pruebas"""
+    lineas = iter(lineas)
+    primera = next(lineas, None)
+    if primera is None:
+        return
+
+    cabecera = primera.rstrip('\n').split(',')
+    num_cols = len(cabecera)
+
+    # Inferir tipos con la segunda fila (si existe)
+    tipos = ['string'] * num_cols
+    segunda = next(lineas, None)
+    if segunda is not None:
+        lineas = chain([segunda], lineas)
+        primera_fila = segunda.rstrip('\n').split(',')
+        # (La versión original fallaba con IndexError si esta fila traía más columnas)
+        for j, valor in enumerate(primera_fila[:num_cols]):
+            if RE_CSV_INT.match(valor):
+                tipos[j] = 'int'
+            elif RE_CSV_EMAIL.match(valor):
+                tipos[j] = 'email'
+            elif RE_CSV_BOOL.match(valor):
+                tipos[j] = 'bool'
+            else:
+                tipos[j] = 'string'
+
+    VALIDADORES = {
+        'int':    (RE_CSV_INT,    "entero (ej: 25)"),
+        'email':  (RE_CSV_EMAIL,  "email válido (ej: user@mail.com)"),
+        'bool':   (RE_CSV_BOOL,   "booleano (true/false)"),
+        'string': (RE_CSV_STRING, "cadena no vacía"),
+    }
+
+    for i, linea in enumerate(lineas, 2):
+        l = linea.rstrip('\n')
+        if not l:
+            continue
+        campos = l.split(',')
+        if len(campos) != num_cols:
+            yield ErrorValidacion(
+                i, f"Se esperaban {num_cols} columnas, se encontraron {len(campos)}",
+                f"La cabecera define: {', '.join(cabecera)}")
+            continue
+        for j, (campo, tipo) in enumerate(zip(campos, tipos)):
+            patron, descripcion = VALIDADORES[tipo]
+            if not patron.match(campo):
+                yield ErrorValidacion(
+                    i, f"Columna '{cabecera[j]}' (col {j+1}): '{campo}' no es {tipo}",
+                    f"Se esperaba {descripcion}")
+
+
+def _csv_sintetico(filas: int, semilla: int = 2026, tasa_error: float = 0.001) -> List[str]:
+    rng = random.Random(semilla)
+    lineas = ["nombre,edad,email,activo,ciudad,puntos\n"]
+    for i in range(filas):
+        campos = [f"usuario{i}", str(rng.randint(18, 90)), f"u{i}@correo.mx",
+                  rng.choice(["true", "false"]), rng.choice(["CDMX", "Puebla", "León"]), str(rng.randint(0, 10**6))]
+        if rng.random() < tasa_error:
+            campos[rng.randrange(len(campos))] = rng.choice(["", "abc", "no@", "si"])
+        lineas.append(",".join(campos) + "\n")
+    return lineas
+
+def benchmark_csv(filas: int = 500_000, repeticiones: int = 3) -> None:
+    """Filas/s del validador anterior contra ValidadorCSV, con los mismos
+    errores; el mejor de `repeticiones` tiempos de cada uno"""
+    lineas = _csv_sintetico(filas)
+    resultados = {}
+    for nombre, funcion in (("por fila", validar_csv_por_fila), ("por bloque", validar_csv)):
+        errores, t = _mejor_tiempo(lambda: [(e.linea, e.mensaje) for e in funcion(lineas)], repeticiones)
+        resultados[nombre] = (errores, t)
+        print(f"{nombre:<10} {t:7.2f} s  {filas / t:>12,.0f} filas/s  ({len(errores)} errores)")
+    assert resultados["por fila"][0] == resultados["por bloque"][0]
+    print(f"Aceleración: {resultados['por fila'][1] / resultados['por bloque'][1]:.1f}x")
+
+
+# ─────────────────────────────────────────────
+#  Validación incremental contra completa
+# ─────────────────────────────────────────────
+
+def linea_aleatoria(rng: random.Random, formato: str) -> str:
+    if formato == 'ini':
+        return rng.choice([f"clave{rng.randrange(1000)} = valor", f"[seccion{rng.randrange(100)}]",
+                           "; comentario", "", "linea!!invalida"])
+    return rng.choice([f"app.clave{rng.randrange(1000)} = valor", "# comentario", "",
+                       "clave invalida con espacios"])
+
+def benchmark_incremental(lineas: int = 100_000, ediciones: int = 5_000, semilla: int = 2026) -> None:
+    """Latencia de ValidadorIncremental.editar contra revalidar todo el archivo,
+    con ediciones aleatorias (sustituir, insertar, borrar) y comprobando que
+    los errores coinciden con los del validador completo"""
+    rng = random.Random(semilla)
+    for formato in PASOS_INCREMENTALES:
+        texto = ["[general]" if formato == 'ini' else "# inicio"]
+        texto += [linea_aleatoria(rng, formato) for _ in range(lineas - 1)]
+        completo = VALIDADORES_MAP[formato]
+
+        t = time.perf_counter()
+        sum(1 for _ in completo(texto))
+        t_completo = time.perf_counter() - t
+        inc = ValidadorIncremental(texto, formato)
+
+        latencias = []
+        for n in range(ediciones):
+            linea = rng.randint(1, len(inc))
+            tipo = rng.random()
+            if tipo < 0.8:      # teclazo: se reescribe una línea
+                args = (linea, [linea_aleatoria(rng, formato)], 1)
+            elif tipo < 0.9:    # Enter: línea nueva
+                args = (linea, [linea_aleatoria(rng, formato)], 0)
+            else:               # borrar una línea
+                args = (linea, [], 1)
+            t = time.perf_counter()
+            inc.editar(*args)
+            latencias.append(time.perf_counter() - t)
+            if n % 1000 == 0 or n == ediciones - 1:
+                esperado = [(e.linea, e.mensaje) for e in completo(inc._lineas)]
+                assert [(e.linea, e.mensaje) for e in inc.errores()] == esperado
+                assert inc.total_errores == len(esperado)
+
+        latencias.sort()
+        print(f"{formato:<11} {len(inc):,} líneas  completo: {t_completo * 1000:8.2f} ms  "
+              f"incremental: media {sum(latencias) / len(latencias) * 1000:.3f} ms, "
+              f"p99 {latencias[int(len(latencias) * 0.99)] * 1000:.3f} ms, "
+              f"máx {latencias[-1] * 1000:.3f} ms")
+
+
+# ─────────────────────────────────────────────
+#  Clasificador: patrones en secuencia contra uno solo
+# ─────────────────────────────────────────────
+
+def paso_ini_secuencial(tiene_seccion: bool, l: str) -> Tuple[bool, Optional[Tuple[str, str]]]:
+    """Pasos anteriores al clasificador (un match por patrón, en orden): la
+    referencia de benchmark_clasificador y de las pruebas"""
+    if RE_INI_EMPTY.match(l) or RE_INI_COMMENT.match(l):
+        return tiene_seccion, None
+    if RE_INI_SECCION.match(l):
+        return True, None
+    if RE_INI_CLAVE.match(l):
+        if not tiene_seccion:
+            return tiene_seccion, (f"Clave fuera de sección: '{l}'",
+                                   "Agrega una sección antes, ej: [general]")
+        return tiene_seccion, None
+    # Línea inválida
+    return tiene_seccion, (f"Sintaxis no reconocida: '{l}'",
+                           "Usa [seccion], clave = valor, o ; comentario")
+
+
+def paso_properties_secuencial(estado: None, l: str) -> Tuple[None, Optional[Tuple[str, str]]]:
+    if RE_PROP_EMPTY.match(l) or RE_PROP_COMMENT.match(l) or RE_PROP_KV.match(l):
+        return estado, None
+    return estado, (f"Propiedad inválida: '{l}'",
+                    "Formato: propiedad.nombre = valor  o  propiedad.nombre: valor")
+
+
+def validar_hosts_secuencial(lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
+    """validar_hosts anterior, con RE_HOST_NAME"""
+    for i, linea in enumerate(lineas, 1):
+        l = linea.rstrip('\n')
+        if RE_HOST_EMPTY.match(l) or RE_HOST_COMMENT.match(l):
+            continue
+
+        partes = l.split()
+        if len(partes) < 2:
+            yield ErrorValidacion(
+                i, f"Línea incompleta: '{l}'",
+                "Formato: <ip>   <hostname> [alias ...]")
+            continue
+
+        ip_str = partes[0]
+        m = RE_HOST_IPV4.match(ip_str)
+        if not m:
+            yield ErrorValidacion(
+                i, f"IP inválida: '{ip_str}'",
+                "Usa formato IPv4, ej: 192.168.1.1")
+        elif not _ip_valida(m):
+            yield ErrorValidacion(
+                i, f"IP fuera de rango: '{ip_str}'",
+                "Cada octeto debe estar entre 0 y 255")
+
+        for nombre in partes[1:]:
+            if not RE_HOST_NAME.match(nombre):
+                yield ErrorValidacion(
+                    i, f"Hostname inválido: '{nombre}'",
+                    "Solo letras, dígitos, guiones y puntos; no puede empezar/terminar con guión")
+
+
+def validar_con_paso(paso, estado, lineas: Iterable[str]) -> Iterator[ErrorValidacion]:
+    for i, linea in enumerate(lineas, 1):
+        estado, error = paso(estado, linea.rstrip('\n'))
+        if error:
+            yield ErrorValidacion(i, *error)
+
+def _linea_hosts(rng: random.Random) -> str:
+    ip = ".".join(str(rng.randint(0, 260)) for _ in range(4))
+    nombres = [rng.choice(["servidor", "db-01", "api.interno.mx", "-malo", "ok.", "a..b"])
+               for _ in range(rng.randint(1, 3))]
+    return rng.choice([f"{ip}\t{' '.join(nombres)}", "# comentario", "", ip])
+
+def _medir_errores(validador, lineas) -> Tuple[list, float]:
+    t = time.perf_counter()
+    errores = [(e.linea, e.mensaje) for e in validador(lineas)]
+    return errores, time.perf_counter() - t
+
+def _mejor_tiempo(funcion, repeticiones: int = 5):
+    # El mínimo de varias corridas descarta pausas ajenas (p. ej. el recolector)
+    tiempos = []
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - t)
+    return resultado, min(tiempos)
+
+def benchmark_clasificador(lineas: int = 200_000, semilla: int = 2026) -> None:
+    """Líneas/s con los patrones en secuencia contra el clasificador, y tiempo
+    por carácter en entradas patológicas (casi válidas y muy largas): si el
+    costo por carácter no crece con n, el tiempo es lineal"""
+    rng = random.Random(semilla)
+    casos = [
+        ('ini', lambda ls: validar_con_paso(paso_ini_secuencial, False, ls), validar_ini,
+         ["[general]"] + [linea_aleatoria(rng, 'ini') for _ in range(lineas)]),
+        ('properties', lambda ls: validar_con_paso(paso_properties_secuencial, None, ls), validar_properties,
+         [linea_aleatoria(rng, 'properties') for _ in range(lineas)]),
+        ('hosts', validar_hosts_secuencial, validar_hosts,
+         [_linea_hosts(rng) for _ in range(lineas)]),
+    ]
+    print(f"{'formato':<11}{'secuencial':>14}{'clasificador':>16}{'aceleración':>13}")
+    for formato, anterior, nuevo, texto in casos:
+        esperado, t_anterior = _medir_errores(anterior, texto)
+        obtenido, t_nuevo = _medir_errores(nuevo, texto)
+        assert esperado == obtenido, formato
+        print(f"{formato:<11}{len(texto) / t_anterior:>12,.0f}/s{len(texto) / t_nuevo:>14,.0f}/s"
+              f"{t_anterior / t_nuevo:>12.1f}x")
+
+    patologicos = [
+        ('host a…a-',    lambda n: 'a' * n + '-'),
+        ('host a-a.…-',  lambda n: 'a-a.' * (n // 4) + '-'),
+        ('host a.a.…!',  lambda n: 'a.' * (n // 2) + '!'),
+    ]
+    print(f"\n{'entrada':<14}{'n':>10}{'RE_HOST_NAME ns/car':>21}{'lineal ns/car':>15}")
+    for nombre, generar in patologicos:
+        for n in (1_000, 10_000, 100_000, 1_000_000):
+            s = generar(n)
+            esperado, t_regex = _mejor_tiempo(lambda: bool(RE_HOST_NAME.match(s)))
+            obtenido, t_lineal = _mejor_tiempo(lambda: _hostname_valido(s))
+            assert esperado == obtenido, nombre
+            print(f"{nombre:<14}{n:>10,}{t_regex * 1e9 / len(s):>21.2f}{t_lineal * 1e9 / len(s):>15.2f}")
+
+    # Líneas largas casi válidas para cada alternativa del patrón INI
+    print(f"\n{'línea INI':<14}{'n':>10}{'secuencial ns/car':>21}{'clasificador ns/car':>21}")
+    for nombre, generar in (('clave a…a!', lambda n: 'a' * n + '!'),
+                            ('clave k␣…␣',  lambda n: 'k' + ' ' * n),
+                            ('sección [a…', lambda n: '[' + 'a' * n)):
+        for n in (1_000, 10_000, 100_000, 1_000_000):
+            s = generar(n)
+            esperado, t_anterior = _mejor_tiempo(lambda: paso_ini_secuencial(True, s))
+            obtenido, t_nuevo = _mejor_tiempo(lambda: _paso_ini(True, s))
+            assert esperado == obtenido, nombre
+            print(f"{nombre:<14}{n:>10,}{t_anterior * 1e9 / len(s):>21.2f}{t_nuevo * 1e9 / len(s):>21.2f}")
+
+
+if __name__ == '__main__':
+    # Sin opciones corre todos; --csv, --incremental o --clasificador sólo ese
+    opciones = [a for a in sys.argv[1:] if a.startswith('--')]
+    if not opciones or '--csv' in opciones:
+        benchmark_csv()
+    if not opciones or '--incremental' in opciones:
+        benchmark_incremental()
+    if not opciones or '--clasificador' in opciones:
+        benchmark_clasificador()
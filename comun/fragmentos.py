@@ -0,0 +1,49 @@
+import io
+import os
+
+# ─────────────────────────────────────────────
+#  Archivos grandes en fragmentos alineados a líneas, para repartirlos
+#  entre los procesos de un ProcessPoolExecutor
+# ─────────────────────────────────────────────
+
+def fronteras_lineas(ruta, tam_fragmento):
+    """Desplazamientos en bytes, alineados justo después de un salto de línea.
+    Siempre empieza en 0 y termina en el tamaño del archivo: un archivo vacío
+    da [0, 0], un solo fragmento vacío"""
+    tam = os.path.getsize(ruta)
+    fronteras = [0]
+    with open(ruta, 'rb') as f:
+        for pos in range(tam_fragmento, tam, tam_fragmento):
+            if pos <= fronteras[-1]:
+                continue
+            f.seek(pos - 1)
+            f.readline()  # termina la línea en curso (o sólo consume el '\n' en pos-1)
+            if f.tell() < tam:
+                fronteras.append(f.tell())
+    fronteras.append(tam)
+    return fronteras
+
+
+def abrir_fragmento(ruta, inicio, fin):
+    """Los bytes [inicio, fin) como texto, con el mismo decodificado y manejo
+    de saltos de línea que open(ruta, 'r', encoding='utf-8'); se puede
+    recorrer por líneas o leer completo con .read()"""
+    with open(ruta, 'rb') as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+    return io.TextIOWrapper(io.BytesIO(datos), encoding='utf-8')
+
+
+# Objeto de cada proceso trabajador (un cifrador, un analizador...), construido
+# una sola vez por el initializer del pool en lugar de en cada tarea
+_ESTADO = None
+
+def iniciar_trabajador(fabrica, *args):
+    """Initializer para ProcessPoolExecutor: guarda fabrica(*args) en el proceso.
+    fabrica tiene que poder pasarse con pickle (una clase o función de módulo)"""
+    global _ESTADO
+    _ESTADO = fabrica(*args)
+
+def estado_trabajador():
+    """El objeto que construyó iniciar_trabajador en este proceso"""
+    return _ESTADO
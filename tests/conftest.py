@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Los ejercicios son scripts sueltos en cada carpeta, no paquetes; la raíz da acceso a comun/
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for carpeta in ('', 'Parte1_Regex', 'Parte3_Aplicaciones'):
+    sys.path.insert(0, os.path.join(RAIZ, carpeta))
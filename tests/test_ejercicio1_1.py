@@ -0,0 +1,69 @@
+import random
+import re
+
+import pytest
+
+from bench.bench_ejercicio1_1 import ip_aleatoria, password_aleatoria
+from ejercicio1_1 import (validar_ipv4, validar_lote, validar_matricula_uam,
+                          validar_password_fuerte, validar_rfc)
+
+# Los validadores originales: el patrón como cadena en cada llamada
+ORIGINALES = {
+    'rfc': lambda s: bool(re.fullmatch(r'^[A-Z]{4}\d{6}(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])[A-Z\d]{3}$', s)),
+    'matricula': lambda s: bool(re.fullmatch(r'^\d{10}$', s)),
+    'ipv4': lambda s: bool(re.fullmatch(
+        r'^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$', s)),
+    'password': lambda s: bool(re.match(
+        r'^(?=(?:.*[A-Z]){2})(?=(?:.*[a-z]){2})(?=(?:.*\d){2})(?=.*[!@#$%^&*]).{10,}$', s)),
+}
+INDIVIDUALES = {'rfc': validar_rfc, 'matricula': validar_matricula_uam,
+                'ipv4': validar_ipv4, 'password': validar_password_fuerte}
+
+
+def _registros(tipo, rng, n=600):
+    """Registros casi válidos con variaciones: fechas imposibles, dígitos Unicode, '\\n' final..."""
+    generadores = {
+        'rfc': lambda: (rng.choice(["AAAA", "ABCD", "ABC", "abcd", "ÑAAA"])
+                        + rng.choice(["850101", "85010"]) + rng.choice(["01", "12", "13", "00"])
+                        + rng.choice(["01", "29", "31", "32"])
+                        + rng.choice(["ABC", "A1Z", "12", "٣AB"]) + rng.choice(["", "", "\n"])),
+        'matricula': lambda: ("".join(rng.choice("0123456789") for _ in range(rng.randint(9, 11)))
+                              + rng.choice(["", "", "\n", "٣"])),
+        'ipv4': lambda: ip_aleatoria(rng),
+        'password': lambda: password_aleatoria(rng, rng.choice([8, 10, 16])),
+    }
+    return [generadores[tipo]() for _ in range(n)]
+
+
+@pytest.mark.parametrize("tipo", list(ORIGINALES))
+def test_individual_igual_al_original(tipo):
+    for registro in _registros(tipo, random.Random(6)):
+        assert INDIVIDUALES[tipo](registro) == ORIGINALES[tipo](registro), registro
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+@pytest.mark.parametrize("tipo", list(ORIGINALES))
+def test_lote_igual_a_uno_por_uno(tipo, procesos):
+    registros = _registros(tipo, random.Random(6))
+    esperado = bytearray(ORIGINALES[tipo](r) for r in registros)
+    assert validar_lote(tipo, iter(registros), procesos=procesos, tam_bloque=64) == esperado
+
+
+def test_lote_tipo_desconocido():
+    with pytest.raises(ValueError):
+        validar_lote("curp", ["x"])
+    with pytest.raises(ValueError):
+        validar_lote("rfc", ["x"], rapido=True)
+
+
+@pytest.mark.parametrize("tipo", ["ipv4", "password"])
+def test_camino_rapido_igual_a_regex(tipo):
+    rng = random.Random(7)
+    registros = _registros(tipo, rng, 5000)
+    if tipo == "password":
+        registros += [password_aleatoria(rng, n) for n in (64, 256) for _ in range(200)]
+        registros += ["A1!" + "b2" * 40, "AB1!" + "b2" * 40, "AB12!ab\nxyz", "AB12!abxyz\n", "AB٣٤!abxyz"]
+    for registro in registros:
+        assert INDIVIDUALES[tipo](registro, rapido=True) == ORIGINALES[tipo](registro), registro
+    esperado = bytearray(ORIGINALES[tipo](r) for r in registros)
+    assert validar_lote(tipo, registros, rapido=True, tam_bloque=500) == esperado
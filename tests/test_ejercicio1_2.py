@@ -0,0 +1,134 @@
+import random
+import re
+from collections import Counter
+
+from ejercicio1_2 import analizar_log
+
+
+def _log_aleatorio(rng, lineas):
+    piezas = ["[INFO]", "[ERROR]", "[WARNING]", "[DEBUG]", "10.0.0.5", "192.168.1.100",
+              "1234.5.6.78", "http://10.0.0.5/index.html", "/tmp/run_250ms.log",
+              "/data/config.xml", "250ms", "1250ms", "a/b.c", "fin."]
+    texto = []
+    for _ in range(lineas):
+        cuerpo = " ".join(rng.choice(piezas) for _ in range(rng.randint(1, 5)))
+        if rng.random() < 0.5:
+            cuerpo = f"2026-02-15 10:30:{rng.randrange(60):02d} {rng.choice(['[ERROR]', '[INFO]'])} {cuerpo}"
+        texto.append(cuerpo + "\n")
+    return "".join(texto)
+
+
+def _original(contenido):
+    """Los findall por categoría sobre todo el contenido del análisis original"""
+    return {
+        'errores': re.findall(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) \[ERROR\] (.*)$', contenido, re.MULTILINE),
+        'ips': set(re.findall(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', contenido)),
+        'archivos': re.findall(r'(/[a-zA-Z0-9._/-]+\.[a-z]{2,4})', contenido),
+        'tipos': Counter(re.findall(r'\[(ERROR|INFO|WARNING)\]', contenido)),
+        'tiempos': re.findall(r'(\d+ms)', contenido),
+    }
+
+
+def test_categorias_como_el_analisis_original(tmp_path):
+    ruta = tmp_path / "sistema.log"
+    ruta.write_text(_log_aleatorio(random.Random(3), 2000), encoding='utf-8')
+    esperado = _original(ruta.read_text(encoding='utf-8'))
+    r = analizar_log(ruta)
+    assert [tuple(e) for e in r.errores] == esperado['errores']
+    assert r.ips == esperado['ips']
+    assert r.archivos == esperado['archivos']
+    assert r.tipos == esperado['tipos']
+    assert r.tiempos == esperado['tiempos']
+
+
+def test_ip_y_tiempo_dentro_de_una_ruta(tmp_path):
+    ruta = tmp_path / "sistema.log"
+    ruta.write_text("2026-02-15 10:30:45 [INFO] GET http://10.0.0.5/index.html\n"
+                    "2026-02-15 10:30:46 [INFO] log /tmp/run_250ms.log\n", encoding='utf-8')
+    r = analizar_log(ruta)
+    assert r.ips == {'10.0.0.5'}
+    assert r.tiempos == ['250ms']
+    assert r.archivos == ['//10.0.0.5/index.html', '/tmp/run_250ms.log']
+
+
+def test_paralelo_igual_a_serial(tmp_path):
+    ruta = tmp_path / "sistema.log"
+    ruta.write_text(_log_aleatorio(random.Random(11), 3000), encoding='utf-8')
+    for aproximado in (False, True):
+        serial = analizar_log(ruta, max_muestras=50, aproximado=aproximado)
+        paralelo = analizar_log(ruta, max_muestras=50, procesos=3, tam_fragmento=4096, aproximado=aproximado)
+        assert serial.errores == paralelo.errores
+        assert serial.archivos == paralelo.archivos and serial.tiempos == paralelo.tiempos
+        assert (serial.total_errores, serial.total_archivos, serial.total_tiempos, serial.suma_ms) == \
+               (paralelo.total_errores, paralelo.total_archivos, paralelo.total_tiempos, paralelo.suma_ms)
+        assert serial.tipos == paralelo.tipos and serial.ips == paralelo.ips
+
+
+def _flujo_zipf(rng, n):
+    return [f"e{min(int(rng.paretovariate(1.1)), 5000)}" for _ in range(n)]
+
+
+def test_topk_fusionado_dentro_de_cotas():
+    from ejercicio1_2 import TopK
+    rng = random.Random(2)
+    for _ in range(20):
+        partes = [_flujo_zipf(rng, rng.randint(500, 4000)) for _ in range(rng.randint(2, 4))]
+        k = rng.choice([5, 20, 50])
+        resumenes = []
+        for parte in partes:
+            t = TopK(k)
+            for e in parte:
+                t.agregar(e)
+            resumenes.append(t)
+        fusionado = resumenes[0]
+        for otro in resumenes[1:]:
+            fusionado.fusionar(otro)
+        reales = Counter(e for parte in partes for e in parte)
+        holgura = fusionado.total / k
+        assert fusionado.total == sum(map(len, partes))
+        assert len(fusionado.conteos) <= k
+        for e, n in fusionado.conteos.items():
+            # Nunca subestima y sobreestima a lo más N/k
+            assert reales[e] <= n <= reales[e] + holgura, (e, n, reales[e])
+        for e, n in reales.items():
+            if n > holgura:
+                assert e in fusionado.conteos
+
+
+def test_resumenes_dentro_de_cotas(tmp_path):
+    import math
+    rng = random.Random(7)
+    ruta = tmp_path / "sistema.log"
+    pesadas = [f"192.168.0.{i}" for i in range(1, 21)]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for _ in range(40_000):
+            if rng.random() < 0.5:
+                ip = pesadas[min(int(rng.paretovariate(1.0)), 20) - 1]
+            else:
+                ip = f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(8)}"
+            f.write(f"2026-02-15 10:00:00 [INFO] {ip} abrió /srv/m{rng.randrange(300)}.py "
+                    f"en {int(rng.lognormvariate(4, 1.2))}ms\n")
+    exacto = analizar_log(ruta)
+    aprox = analizar_log(ruta, procesos=2, tam_fragmento=1 << 20, aproximado=True)
+
+    error = abs(aprox.ips_distintas.estimar() - len(exacto.ips)) / len(exacto.ips)
+    assert error <= 3 * 1.04 / math.sqrt(aprox.ips_distintas.m)
+
+    reales = Counter(linea.split()[3] for linea in open(ruta, encoding='utf-8'))
+    holgura = aprox.top_ips.total / aprox.top_ips.k
+    for ip, n in aprox.top_ips.conteos.items():
+        assert reales[ip] <= n <= reales[ip] + holgura
+
+    tiempos = sorted(int(t[:-2]) for t in re.findall(r'\d+ms', ruta.read_text(encoding='utf-8')))
+    for q in (0.5, 0.95, 0.99):
+        real = tiempos[int(q * (len(tiempos) - 1))]
+        assert abs(aprox.cuantiles_ms.cuantil(q) - real) <= aprox.cuantiles_ms.alfa * real
+
+
+def test_aproximado_acota_las_muestras(tmp_path):
+    from ejercicio1_2 import MUESTRAS_APROXIMADO
+    ruta = tmp_path / "sistema.log"
+    ruta.write_text("2026-02-15 10:00:00 [ERROR] /a/b.py 5ms\n" * (3 * MUESTRAS_APROXIMADO), encoding='utf-8')
+    r = analizar_log(ruta, aproximado=True)
+    assert len(r.archivos) == len(r.tiempos) == len(r.errores) == MUESTRAS_APROXIMADO
+    assert r.total_archivos == r.total_tiempos == r.total_errores == 3 * MUESTRAS_APROXIMADO
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from bench.bench_ejercicio1_3 import procesar_con_marcadores
+from comun import fragmentos
+from ejercicio1_3 import CifradorROT
+
+PIEZAS = ["hola", "Mundo", "https://ej.com/a?b=c", "www.uam.mx", "juan.p@mail.com",
+          "(555) 123-4567", "13/12/2002", " ", "\n", "\r\n", "\r", "ñandú"]
+
+
+def test_rotar_igual_a_cifrar_caracter():
+    cifrador = CifradorROT()
+    rng = random.Random(11)
+    for _ in range(300):
+        texto = "".join(rng.choice("azAZmnMN09 .,\nñÉ€\ud800") for _ in range(rng.randint(0, 40)))
+        for n in (-3, 0, 1, 13, 25, 26, 40):
+            esperado = "".join(cifrador.cifrar_caracter(c, n) for c in texto)
+            assert cifrador.rotar(texto, n) == esperado, (texto, n)
+
+
+@pytest.mark.parametrize("tam_bloque", [1, 3, 7, 64])
+def test_archivo_por_bloques_igual_a_texto_completo(tmp_path, tam_bloque):
+    cifrador = CifradorROT(13)
+    rng = random.Random(12)
+    entrada, cifrado, descifrado = tmp_path / "e.txt", tmp_path / "c.txt", tmp_path / "d.txt"
+    for _ in range(40):
+        texto = "".join(rng.choice(PIEZAS) for _ in range(rng.randint(0, 80)))
+        entrada.write_bytes(texto.encode('utf-8'))
+        cifrador.cifrar_archivo(str(entrada), str(cifrado), tam_bloque)
+        cifrador.descifrar_archivo(str(cifrado), str(descifrado), tam_bloque)
+        completo = entrada.read_text(encoding='utf-8')  # mismos saltos de línea que el modo texto
+        assert cifrado.read_text(encoding='utf-8') == cifrador.cifrar_texto(completo), texto
+        assert descifrado.read_text(encoding='utf-8') == completo, texto
+
+
+def _entradas(tmp_path, rng, cifrador, cantidad=30):
+    """Mezcla de cadenas y archivos (algunos vacíos) con su salida esperada"""
+    entradas, esperado = [], []
+    for i in range(cantidad):
+        texto = "".join(rng.choice(PIEZAS) for _ in range(rng.randint(0, 300) if i % 5 else 0))
+        if i % 2:
+            ruta = tmp_path / f"f{i}.txt"
+            ruta.write_bytes(texto.encode('utf-8'))
+            referencia = tmp_path / f"f{i}.ref"
+            cifrador.cifrar_archivo(str(ruta), str(referencia))
+            entradas.append(ruta)
+            esperado.append(referencia.read_text(encoding='utf-8'))
+        else:
+            entradas.append(texto)
+            esperado.append(cifrador.cifrar_texto(texto))
+    return entradas, esperado
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lote_igual_a_uno_por_uno(tmp_path, workers):
+    cifrador = CifradorROT(13)
+    entradas, esperado = _entradas(tmp_path, random.Random(3), cifrador)
+    reporte = cifrador.cifrar_lote(entradas, workers=workers, tam_segmento=50)
+    for (entrada, salida, _, _), x in zip(reporte.archivos, esperado):
+        obtenido = open(salida, encoding='utf-8').read() if entrada else salida
+        assert obtenido == x
+
+
+def test_lote_archivo_vacio(tmp_path):
+    ruta = tmp_path / "vacio.txt"
+    ruta.write_bytes(b"")
+    reporte = CifradorROT(13).cifrar_lote([ruta])
+    assert (tmp_path / "vacio.txt.rot").read_text(encoding='utf-8') == ""
+    assert reporte.archivos[0][2] == 0
+
+
+def test_lote_serial_no_toca_el_estado_del_proceso(monkeypatch):
+    monkeypatch.setattr(fragmentos, "_ESTADO", None)
+    CifradorROT(13).cifrar_lote(["hola mundo"], workers=1)
+    assert fragmentos.estado_trabajador() is None
+
+
+def test_tramos_igual_a_marcadores():
+    cifrador = CifradorROT(7)
+    rng = random.Random(13)
+    for _ in range(300):
+        texto = "".join(rng.choice(PIEZAS + ["x", ")", "@", "."]) for _ in range(rng.randint(0, 60)))
+        for n in (7, 19):
+            assert cifrador.procesar_texto(texto, n) == procesar_con_marcadores(cifrador, texto, n), texto
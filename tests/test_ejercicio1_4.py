@@ -0,0 +1,190 @@
+import random
+import re
+import time
+
+import pytest
+
+from ejercicio1_4 import AFDPerezoso, AFNDCompacto, GeneradorAFND, _construir_afd
+
+
+def _regex_aleatoria(rng, profundidad=0):
+    def atomo():
+        if profundidad < 2 and rng.random() < 0.3:
+            return "(" + _regex_aleatoria(rng, profundidad + 1) + ")"
+        return rng.choice("abc")
+
+    def termino():
+        return "".join(atomo() + rng.choice(["", "", "*", "+", "?"]) for _ in range(rng.randint(1, 3)))
+
+    return "|".join(termino() for _ in range(rng.randint(1, 2)))
+
+
+def _oraculo(regex, texto, completa=None):
+    """Más a la izquierda y luego más larga, sin vacías ni traslapes, por fuerza
+    bruta; completa(i, f) dice si texto[i:f] pertenece al lenguaje (por omisión, re)"""
+    if completa is None:
+        patron = re.compile(regex)
+        completa = lambda i, f: patron.fullmatch(texto, i, f)
+    resultado, inicio = [], 0
+    while inicio < len(texto):
+        fines = [f for f in range(inicio + 1, len(texto) + 1) if completa(inicio, f)]
+        if fines:
+            resultado.append((inicio, max(fines)))
+            inicio = max(fines)
+        else:
+            inicio += 1
+    return resultado
+
+
+def _en_trozos(rng, texto):
+    cortes = sorted(rng.sample(range(1, len(texto)), min(3, len(texto) - 1))) if len(texto) > 1 else []
+    return [texto[a:b] for a, b in zip([0] + cortes, cortes + [len(texto)])]
+
+
+@pytest.mark.parametrize("regex, texto, esperado", [
+    ("abcd|b", "abcd", [(0, 4)]),
+    ("((b)*c)*c", "xbcc", [(1, 4)]),
+    ("(a|b)*abb", "xx abb yy babb, aabbb", [(3, 6), (10, 14), (16, 20)]),
+])
+def test_mas_a_la_izquierda(regex, texto, esperado):
+    assert list(GeneradorAFND(regex).compilar().buscar_todo(texto)) == esperado
+
+
+def test_busqueda_contra_fuerza_bruta(tmp_path):
+    rng = random.Random(2026)
+    archivo = tmp_path / "texto.bin"
+    for _ in range(400):
+        regex = _regex_aleatoria(rng)
+        afd = GeneradorAFND(regex).compilar()
+        texto = "".join(rng.choice("abcx") for _ in range(rng.randint(0, 24)))
+        esperado = _oraculo(regex, texto)
+        assert list(afd.buscar_todo(texto)) == esperado, (regex, texto)
+        assert list(afd.buscar_flujo(_en_trozos(rng, texto))) == esperado, (regex, texto)
+        bytes_texto = texto.encode()
+        assert list(afd.buscar_flujo(_en_trozos(rng, bytes_texto))) == esperado, (regex, texto)
+        archivo.write_bytes(bytes_texto)
+        assert list(afd.buscar_en_archivo(archivo)) == esperado, (regex, texto)
+
+
+def test_busqueda_larga_contra_fuerza_bruta():
+    # Textos largos y repetitivos: muchas extensiones traslapadas entre coincidencias.
+    # re puede tardar exponencialmente con estas regex; coincide() ya se prueba contra re
+    rng = random.Random(4)
+    for _ in range(150):
+        regex = _regex_aleatoria(rng)
+        afd = GeneradorAFND(regex).compilar()
+        texto = "".join(rng.choice(["a", "a", "b", "ab", "c"]) for _ in range(rng.randint(20, 60)))
+        esperado = _oraculo(regex, texto, lambda i, f: afd.coincide(texto[i:f]))
+        assert list(afd.buscar_todo(texto)) == esperado, (regex, texto)
+
+
+def test_extension_lineal():
+    # Antes cada coincidencia volvía a recorrer toda la cola de 'a' buscando la 'b'
+    afd = GeneradorAFND("a|a*b").compilar()
+    t = time.perf_counter()
+    assert list(afd.buscar_todo("a" * 20_000)) == [(i, i + 1) for i in range(20_000)]
+    assert time.perf_counter() - t < 2
+    assert list(afd.buscar_todo("a" * 300 + "b")) == [(0, 301)]
+
+
+def test_extension_acotada_en_flujo():
+    # Con max_retroceso, cada coincidencia sale sin haber leído más de ese margen
+    afd = GeneradorAFND("a|a*b").compilar()
+    leidos = [0]
+
+    def trozos():
+        for _ in range(200):
+            leidos[0] += 10
+            yield "a" * 10
+
+    resultado = []
+    for inicio, fin in afd.buscar_flujo(trozos(), max_retroceso=50):
+        assert leidos[0] - fin <= 50 + 10
+        resultado.append((inicio, fin))
+    assert resultado == [(i, i + 1) for i in range(2000)]
+
+
+def test_coincide_contra_re():
+    rng = random.Random(7)
+    for _ in range(200):
+        regex = _regex_aleatoria(rng)
+        gen = GeneradorAFND(regex)
+        afd, perezoso = gen.compilar(), gen.compilar(modo="perezoso", memoria_max=2048)
+        for _ in range(20):
+            texto = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            esperado = re.fullmatch(regex, texto) is not None
+            assert afd.coincide(texto) == esperado, (regex, texto)
+            assert perezoso.coincide(texto) == esperado, (regex, texto)
+
+
+def test_alfabeto_vacio():
+    # Sólo acepta la cadena vacía
+    afnd = AFNDCompacto.desde_transiciones({'q0'}, {}, 'q0', {'q0'}, [])
+    for automata in (AFDPerezoso(afnd), _construir_afd(afnd)):
+        assert automata.coincide("")
+        assert not automata.coincide("a")
+        assert automata.patrones_que_coinciden("") == (0,)
+
+
+@pytest.mark.parametrize("regex, equivalente", [
+    ("(a|b)*", "(a*b*)*"),
+    ("(a|b)*abb", "(b|a)*abb"),
+    ("a(b|c)", "ab|ac"),
+    ("(ab)*a", "a(ba)*"),
+    ("a+", "aa*"),
+])
+def test_afd_minimo_no_depende_de_la_regex(regex, equivalente):
+    # Hopcroft deja un único AFD mínimo por lenguaje
+    assert GeneradorAFND(regex).compilar().num_estados == GeneradorAFND(equivalente).compilar().num_estados
+
+
+def test_afd_minimo_de_abb():
+    assert GeneradorAFND("(a|b)*abb").compilar().num_estados == 4
+
+
+def test_vista_con_nombres_ida_y_vuelta():
+    # La representación compacta se puede convertir a la de nombres 'qN' y de regreso
+    rng = random.Random(2)
+    for _ in range(100):
+        regex = _regex_aleatoria(rng)
+        gen = GeneradorAFND(regex)
+        gen.generar_afnd()
+        afnd = AFNDCompacto.desde_transiciones(gen.estados, gen.transiciones, gen.estado_inicial,
+                                               gen.estados_finales, gen.alfabeto)
+        assert afnd.a_transiciones() == gen.transiciones
+        assert (afnd.inicial, afnd.finales) == (gen.afnd.inicial, gen.afnd.finales)
+        afd = _construir_afd(afnd)
+        for _ in range(10):
+            texto = "".join(rng.choice("abc") for _ in range(rng.randint(0, 6)))
+            assert afd.coincide(texto) == (re.fullmatch(regex, texto) is not None), (regex, texto)
+
+
+def test_perezoso_con_cache_minima():
+    # Con memoria_max=1 la caché se vacía en cada estado nuevo; el resultado no cambia
+    gen = GeneradorAFND("(a|b)*a(a|b)(a|b)(a|b)")
+    perezoso, afd = gen.compilar(modo="perezoso", memoria_max=1), gen.compilar()
+    rng = random.Random(3)
+    for _ in range(300):
+        texto = "".join(rng.choice("ab") for _ in range(rng.randint(0, 12)))
+        assert perezoso.coincide(texto) == afd.coincide(texto), texto
+    assert perezoso.vaciados > 0
+    assert perezoso.num_estados <= 2
+
+
+def test_varios_patrones_contra_re():
+    rng = random.Random(5)
+    for _ in range(200):
+        patrones = [_regex_aleatoria(rng) for _ in range(rng.randint(1, 4))]
+        gen = GeneradorAFND(patrones)
+        afd, perezoso = gen.compilar(), gen.compilar(modo="perezoso", memoria_max=512)
+        for _ in range(10):
+            texto = "".join(rng.choice("abcx") for _ in range(rng.randint(0, 10)))
+            esperado = tuple(i for i, p in enumerate(patrones) if re.fullmatch(p, texto))
+            assert afd.patrones_que_coinciden(texto) == esperado, (patrones, texto)
+            assert perezoso.patrones_que_coinciden(texto) == esperado, (patrones, texto)
+            # escanear: por cada fin, los patrones con alguna coincidencia no vacía que termina ahí
+            fines = [(f, tuple(i for i, p in enumerate(patrones)
+                               if any(re.fullmatch(p, texto[s:f]) for s in range(f))))
+                     for f in range(1, len(texto) + 1)]
+            assert [(f, tuple(ids)) for f, ids in afd.escanear(_en_trozos(rng, texto))] == \
+                [(f, ids) for f, ids in fines if ids], (patrones, texto)
@@ -0,0 +1,267 @@
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import random
+import re
+from collections import OrderedDict
+
+import pytest
+
+import ejercicio3_1
+from bench.bench_ejercicio3_1 import log_sintetico
+from ejercicio3_1 import AnalizadorSeguridad, IndiceReglas
+
+CONFIG_REPO = os.path.join(os.path.dirname(ejercicio3_1.__file__), "config.json")
+
+
+def _config(tmp_path, umbrales=None, **cambios):
+    """config.json del repositorio sin consola, con las opciones de alerts y thresholds dadas"""
+    with open(CONFIG_REPO, encoding='utf-8') as f:
+        config = json.load(f)
+    config["alerts"].update(console=False, **cambios)
+    config["thresholds"].update(umbrales or {})
+    ruta = tmp_path / "config.json"
+    ruta.write_text(json.dumps(config), encoding='utf-8')
+    return str(ruta)
+
+
+PIEZAS = ["2026-02-15 10:30:00", "2026-02-15\t23:59:59", "192.168.1.50", "10.0.0.20",
+          "1234.5.6.7", "999.1.1.1", "Failed password", "Failed  password", "Login failed",
+          "Invalid user", "rm -rf", "rm-rf", "dd", "ddos", "add", "mkfs.ext4", "shutdown",
+          "sudo -s", "chmod 777", "chmod 7777", "admin", "from", "port", "/var/log",
+          "١٢٣", "ñ", "!", "  ", "\t", ":", "-"]
+
+
+def test_lexer_por_defecto_es_ply(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    assert analizador.tokenizar == analizador._tokenizar_ply
+
+
+def test_tokenizador_rapido_igual_a_ply(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    rng = random.Random(15)
+    for _ in range(5000):
+        linea = "".join(rng.choice(PIEZAS) + rng.choice(["", " ", "\t"]) for _ in range(rng.randint(0, 8)))
+        assert analizador._tokenizar_rapido(linea) == analizador._tokenizar_ply(linea), linea
+
+
+def test_timestamp_invalido_en_ambos_modos(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    for tokenizar in (analizador._tokenizar_ply, analizador._tokenizar_rapido):
+        with pytest.raises(ValueError):
+            tokenizar("2026-13-45 10:00:00 Failed password for root from 10.0.0.1")
+
+
+def _log_con_fecha_invalida(ruta):
+    lineas = ["2026-13-45 10:00:00 Failed password for root from 10.0.0.1 port 22\n"]
+    lineas += [f"2026-02-15 10:00:{s:02d} Failed password for root from 10.0.0.9 port 22\n" for s in range(6)]
+    ruta.write_text("".join(lineas), encoding='utf-8')
+    return len(lineas)
+
+
+def test_seguir_salta_lineas_invalidas(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    ruta = tmp_path / "auth.log"
+    total = _log_con_fecha_invalida(ruta)
+    estadisticas = asyncio.run(asyncio.wait_for(
+        analizador.seguir([str(ruta)], intervalo=0.01, duracion=0.3, desde_inicio=True), 10))
+    assert estadisticas.lineas == total
+    assert estadisticas.errores == 1
+    assert any("Fuerza bruta" in alerta["mensaje"] for alerta in analizador.alertas)
+
+
+def test_seguir_relanza_si_el_consumidor_muere(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    ruta = tmp_path / "auth.log"
+    _log_con_fecha_invalida(ruta)
+
+    def marca_escritura(linea):
+        raise RuntimeError("marca rota")
+
+    # Sin duración ni `detener`: antes se quedaba esperando para siempre
+    with pytest.raises(RuntimeError, match="marca rota"):
+        asyncio.run(asyncio.wait_for(
+            analizador.seguir([str(ruta)], intervalo=0.01, desde_inicio=True, marca_escritura=marca_escritura), 10))
+
+
+def test_seguir_lee_el_archivo_rotado_hasta_el_final(tmp_path, monkeypatch):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    ruta = tmp_path / "auth.log"
+    ruta.write_text("2026-02-15 10:00:00 INFO: User admin logged in from 10.0.0.1\n", encoding='utf-8')
+    stat = os.stat
+    rotado = []
+
+    def stat_tras_rotar(camino, *args, **kwargs):
+        # El escritor agrega una línea y rota justo después de que el lector llegó al final
+        if str(camino) == str(ruta) and not rotado:
+            rotado.append(True)
+            with open(ruta, 'a', encoding='utf-8') as f:
+                f.write("2026-02-15 10:00:01 CRITICAL: User dev executed rm -rf /srv from 10.0.0.2\n")
+            os.rename(ruta, str(ruta) + ".1")
+            ruta.write_text("", encoding='utf-8')
+        return stat(camino, *args, **kwargs)
+
+    monkeypatch.setattr(ejercicio3_1.os, "stat", stat_tras_rotar)
+    estadisticas = asyncio.run(asyncio.wait_for(
+        analizador.seguir([str(ruta)], intervalo=0.01, duracion=0.3, desde_inicio=True), 10))
+    assert rotado and estadisticas.rotaciones == 1
+    assert estadisticas.lineas == 2
+    assert any("Comando peligroso" in alerta["mensaje"] for alerta in analizador.alertas)
+
+
+def test_paralelo_no_trunca_el_archivo_de_alertas(tmp_path):
+    log = tmp_path / "auth.log"
+    log.write_text("".join(log_sintetico(3000, 7)), encoding='utf-8')
+    serial = AnalizadorSeguridad(_config(tmp_path))
+    serial.procesar_log(str(log))
+    esperado = list(serial.alertas)
+    assert esperado
+
+    archivo = tmp_path / "alertas.jsonl"
+    analizador = AnalizadorSeguridad(_config(tmp_path, file=str(archivo)))
+    for _ in range(2):
+        analizador.procesar_log(str(log), procesos=2, tam_fragmento=4096)
+    analizador.alertas._f.flush()
+    datos = archivo.read_bytes()
+    assert b"\0" not in datos
+    assert [json.loads(linea) for linea in datos.splitlines()] == esperado * 2
+    assert list(analizador.alertas) == esperado * 2
+
+
+@pytest.mark.parametrize("umbrales", [
+    {"cooldown_seconds": 0, "max_login_attempts": 3, "window_seconds": 4},
+    {"cooldown_seconds": 60, "max_login_attempts": 3, "window_seconds": 4},
+    {"cooldown_seconds": 60},
+    # Menos IPs rastreadas que IPs con fallos: el tope desaloja entre particiones
+    {"cooldown_seconds": 0, "max_login_attempts": 3, "window_seconds": 60, "max_tracked_ips": 2},
+])
+def test_paralelo_igual_a_serial(tmp_path, umbrales):
+    # Pocas IPs distintas: muchos fallos de la misma IP cruzan fronteras de fragmento
+    log = tmp_path / "auth.log"
+    log.write_text("".join(re.sub(r"10\.0\.\d+\.(\d+)", lambda m: f"10.0.0.{int(m.group(1)) % 4}", linea)
+                           for linea in log_sintetico(6000, 19)), encoding='utf-8')
+    config = _config(tmp_path, umbrales)
+    serial = AnalizadorSeguridad(config)
+    serial.procesar_log(str(log))
+    assert any("Fuerza bruta" in alerta["mensaje"] for alerta in serial.alertas)
+    for procesos in (2, 3):
+        paralelo = AnalizadorSeguridad(config)
+        paralelo.procesar_log(str(log), procesos=procesos, tam_fragmento=8000)
+        assert list(paralelo.alertas) == list(serial.alertas)
+
+
+def test_agregados_por_tipo(tmp_path):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    for i in range(50):
+        analizador.registrar_alerta("HIGH", f"IP en lista negra detectada: 10.0.0.{i}", "2026-02-15 10:00:00")
+    assert analizador.alertas.por_tipo == {"IP en lista negra detectada": 50}
+
+
+def _fuerza_bruta_ingenua(fallos, max_intentos, ventana, enfriamiento, max_ips):
+    """Cada IP guarda todos sus fallos; las menos recientes se olvidan al pasar de max_ips"""
+    historial, ultima, resultado = OrderedDict(), {}, []
+    for ip, ts in fallos:
+        historial.setdefault(ip, []).append(ts)
+        historial.move_to_end(ip)
+        while len(historial) > max_ips:
+            olvidada, _ = historial.popitem(last=False)
+            ultima.pop(olvidada, None)
+        intentos = historial[ip]
+        alerta = (len(intentos) >= max_intentos and (ts - intentos[-max_intentos]).total_seconds() <= ventana
+                  and (ip not in ultima or (ts - ultima[ip]).total_seconds() >= enfriamiento))
+        if alerta:
+            ultima[ip] = ts
+        resultado.append(alerta)
+    return resultado
+
+
+@pytest.mark.parametrize("max_intentos, ventana, enfriamiento, max_ips", [
+    (3, 4, 0, 100_000), (3, 4, 10, 100_000), (5, 60, 60, 100_000), (1, 0, 0, 100_000), (3, 10, 5, 2), (2, 30, 0, 1),
+])
+def test_fuerza_bruta_igual_a_ventana_ingenua(tmp_path, max_intentos, ventana, enfriamiento, max_ips):
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    analizador.max_intentos, analizador.ventana = max_intentos, ventana
+    analizador.enfriamiento, analizador.max_ips = enfriamiento, max_ips
+    rng = random.Random(16)
+    ts = datetime.datetime(2026, 2, 15)
+    fallos = []
+    for _ in range(5000):
+        ts += datetime.timedelta(seconds=rng.choice([0, 0, 1, 2, 5, 40]))
+        fallos.append((f"10.0.0.{rng.randint(0, 4)}", ts))
+    obtenido = [analizador.fuerza_bruta(ip, ts) for ip, ts in fallos]
+    assert obtenido == _fuerza_bruta_ingenua(fallos, max_intentos, ventana, enfriamiento, max_ips)
+    assert any(obtenido)
+
+
+def _fuerza_bruta_original(fallos, max_intentos, ventana):
+    """La regla de la versión original: todos los fallos de la IP, sin orden"""
+    historial, resultado = {}, []
+    for ip, ts in fallos:
+        historial.setdefault(ip, []).append(ts)
+        intentos = [t for t in historial[ip] if (ts - t).total_seconds() <= ventana]
+        resultado.append(len(intentos) >= max_intentos)
+    return resultado
+
+
+@pytest.mark.parametrize("max_intentos, ventana, retraso", [(3, 4, 3), (5, 60, 30), (2, 10, 120), (4, 20, 20)])
+def test_fuerza_bruta_fuera_de_orden(tmp_path, max_intentos, ventana, retraso):
+    # Marcas que retroceden hasta `retraso` segundos, incluso más que la ventana
+    analizador = AnalizadorSeguridad(_config(tmp_path))
+    analizador.max_intentos, analizador.ventana, analizador.enfriamiento = max_intentos, ventana, 0
+    rng = random.Random(max_intentos)
+    ts = datetime.datetime(2026, 2, 15)
+    fallos = []
+    for _ in range(3000):
+        ts += datetime.timedelta(seconds=rng.choice([0, 1, 2, 5, 40]))
+        atraso = rng.randint(0, retraso) if rng.random() < 0.2 else 0
+        fallos.append((f"10.0.0.{rng.randint(0, 4)}", ts - datetime.timedelta(seconds=atraso)))
+    obtenido = [analizador.fuerza_bruta(ip, ts) for ip, ts in fallos]
+    assert obtenido == _fuerza_bruta_original(fallos, max_intentos, ventana)
+    assert any(obtenido)
+
+
+def _en_lista_lineal(lista, ip):
+    for entrada in lista:
+        if entrada == ip:
+            return True
+        if '/' in entrada:
+            try:
+                if ipaddress.ip_address(ip) in ipaddress.ip_network(entrada, strict=False):
+                    return True
+            except ValueError:  # '300.1.1.1' no es una IP
+                pass
+    return False
+
+
+def _comando_lineal(comandos, linea):
+    """Último comando de la línea probando cada posición y cada comando en orden"""
+    patrones = [re.compile(r'(?<![a-zA-Z0-9:/._-])' + r'\s'.join(map(re.escape, c.split())))
+                for c in comandos if c.strip()]
+    for inicio in range(len(linea) - 1, -1, -1):
+        for patron in patrones:
+            m = patron.match(linea, inicio)
+            if m:
+                return m.group()
+    return None
+
+
+def test_indice_de_reglas_igual_a_recorrido_lineal():
+    rng = random.Random(17)
+    octeto = lambda: str(rng.choice([0, 1, 10, 127, 128, 254, 255, 256, rng.randint(0, 255)]))
+    ip = lambda: ".".join(octeto() for _ in range(4))
+    redes = [".".join(str(rng.randint(0, 255)) for _ in range(4)) + f"/{rng.randint(8, 32)}" for _ in range(12)]
+    config = {
+        "blacklist_ips": [ip() for _ in range(200)] + redes + ["10.0.0.0/30", "10.0.0.4/30", "10.0.0.0/8", "10.1.0.0/16", "::1/128"],
+        "danger_commands": ["rm -rf", "dd", "mkfs", "shutdown", "sudo -s", "chmod 777", "rm", " ", "dd if"],
+    }
+    indice = IndiceReglas(config)
+    for _ in range(5000):
+        consulta = ip()
+        assert indice.ip_en_lista_negra(consulta) == _en_lista_lineal(config["blacklist_ips"], consulta), consulta
+    assert not indice.ip_en_lista_negra(None)
+    for _ in range(5000):
+        piezas = PIEZAS + ["rm", "-rf", "if", "dd", "mkfs", "777", " "]
+        linea = "".join(rng.choice(piezas) for _ in range(rng.randint(0, 10)))
+        assert indice.comando_peligroso(linea) == _comando_lineal(config["danger_commands"], linea), linea
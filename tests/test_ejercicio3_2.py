@@ -0,0 +1,203 @@
+import random
+import re
+
+import pytest
+
+import ejercicio3_2
+
+from bench.bench_ejercicio3_2 import (linea_aleatoria, paso_ini_secuencial, paso_properties_secuencial,
+                                      validar_con_paso, validar_csv_por_fila, validar_hosts_secuencial)
+from ejercicio3_2 import (RE_HOST_NAME, VALIDADORES_MAP, CacheValidacion, ValidadorCSV, ValidadorIncremental,
+                          _hostname_valido, validar_archivo, validar_csv, validar_hosts, validar_ini,
+                          validar_properties, validar_rutas)
+
+
+@pytest.fixture
+def csv_con_dos_errores(tmp_path):
+    ruta = tmp_path / "datos.csv"
+    ruta.write_text("id,ok\n1,true\nx,false\ny,true\n", encoding='utf-8')
+    return str(ruta)
+
+
+@pytest.mark.parametrize("max_errores", [0, -1])
+def test_max_errores_menor_a_uno_se_rechaza(csv_con_dos_errores, capsys, max_errores):
+    assert validar_archivo(csv_con_dos_errores, max_errores=max_errores) is None
+    assert validar_rutas(csv_con_dos_errores, max_errores=max_errores, cache=None) is None
+    salida = capsys.readouterr().out
+    assert "max_errores debe ser al menos 1" in salida
+    assert "Validación exitosa" not in salida
+
+
+@pytest.mark.parametrize("max_errores, total, detenido", [(1, 1, True), (2, 2, True), (3, 2, False), (None, 2, False)])
+def test_aviso_de_max_errores(csv_con_dos_errores, capsys, max_errores, total, detenido):
+    assert validar_archivo(csv_con_dos_errores, max_errores=max_errores) == total
+    assert ("lectura detenida al llegar al límite" in capsys.readouterr().out) == detenido
+
+
+def test_max_errores_deja_de_leer(tmp_path, monkeypatch, capsys):
+    # Un único error al inicio de un archivo enorme: no hace falta leer el resto
+    ruta = tmp_path / "grande.properties"
+    ruta.write_text("a=1\nb=2\n=sin_clave\n" + "c=3\n" * 200_000, encoding='utf-8')
+    leidas = []
+    original = ejercicio3_2.validar_properties
+
+    def contando(lineas):
+        return original(leidas.append(linea) or linea for linea in lineas)
+
+    monkeypatch.setitem(VALIDADORES_MAP, 'properties', contando)
+    assert validar_archivo(str(ruta), max_errores=1) == 1
+    assert len(leidas) <= 10
+
+
+VALORES = ["1", "23", "007", "١٢", "a@b.co", "x.y+z@mail.com.mx", "a@b", "true", "FALSE", "tru",
+           "", "abc", " ", "ñandú", "x\r"]
+
+
+def _csv_aleatorio(rng):
+    lineas = ["id,correo,activo\n"]
+    for _ in range(rng.randint(0, 40)):
+        if rng.random() < 0.1:
+            lineas.append("\n")
+            continue
+        columnas = 3 if rng.random() < 0.85 else rng.randint(1, 5)
+        lineas.append(",".join(rng.choice(VALORES) for _ in range(columnas)) + "\n")
+    return lineas
+
+
+def _como_tuplas(errores):
+    return [(e.linea, e.mensaje, e.sugerencia) for e in errores]
+
+
+def test_csv_igual_al_original(monkeypatch):
+    # Bloques de 7 líneas para cruzar muchas fronteras de bloque
+    monkeypatch.setattr(ValidadorCSV.__init__, "__defaults__", (1, 0.5, 7))
+    rng = random.Random(22)
+    for _ in range(500):
+        lineas = _csv_aleatorio(rng)
+        if rng.random() < 0.5:
+            # Como lista de cadenas: unas con '\n' final y otras sin él
+            lineas = [l.rstrip('\n') if rng.random() < 0.5 else l for l in lineas]
+        assert _como_tuplas(validar_csv(lineas)) == _como_tuplas(validar_csv_por_fila(lineas)), lineas
+
+
+def test_csv_lista_sin_saltos_de_linea():
+    errores = _como_tuplas(validar_csv(["id,ok", "1,true", "x,false", "3,true"]))
+    assert errores == [(3, "Columna 'id' (col 1): 'x' no es int", "Se esperaba entero (ej: 25)")]
+
+
+def test_csv_segunda_linea_vacia_deja_todo_en_string():
+    assert _como_tuplas(validar_csv(["id,ok\n", "\n", "1,true\n", "x,false\n"])) == []
+
+
+def test_muestra_llega_a_validar_archivo_y_validar_rutas(tmp_path, capsys):
+    ruta = tmp_path / "datos.csv"
+    # La primera fila parece int, pero la mayoría de las muestras no
+    ruta.write_text("id\n1\na\nb\nc\n", encoding='utf-8')
+    assert validar_archivo(str(ruta)) == 3
+    assert validar_archivo(str(ruta), muestra=4) == 0
+    cache = tmp_path / "cache"
+    assert validar_rutas(str(tmp_path / "*.csv"), cache=CacheValidacion(str(cache))) == 3
+    assert validar_rutas(str(tmp_path / "*.csv"), cache=CacheValidacion(str(cache)), muestra=4) == 0
+
+
+PIEZAS_LINEA = ["[", "]", "a", "Z", "_", "1", "=", ":", " ", "\t", "\x0b", "\u00a0", ";", "#", "!",
+                ".", "-", "ñ", "٣", "10.0.0.1", "300.1.1.1", "host-a", "-x", "a..b"]
+
+
+def _lineas_aleatorias(rng, cantidad=300):
+    return ["".join(rng.choice(PIEZAS_LINEA) for _ in range(rng.randint(0, 8))) + rng.choice(["", "\n"])
+            for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize("nuevo, anterior", [
+    (validar_ini, lambda ls: validar_con_paso(paso_ini_secuencial, False, ls)),
+    (validar_properties, lambda ls: validar_con_paso(paso_properties_secuencial, None, ls)),
+    (validar_hosts, validar_hosts_secuencial),
+])
+def test_clasificador_igual_a_patrones_en_secuencia(nuevo, anterior):
+    rng = random.Random(25)
+    for _ in range(50):
+        lineas = _lineas_aleatorias(rng)
+        assert _como_tuplas(nuevo(lineas)) == _como_tuplas(anterior(lineas))
+
+
+def test_hostname_valido_igual_a_regex():
+    rng = random.Random(25)
+    for _ in range(20_000):
+        nombre = "".join(rng.choice("ab09Z-._ñ٣") for _ in range(rng.randint(1, 10)))
+        assert _hostname_valido(nombre) == bool(RE_HOST_NAME.match(nombre)), nombre
+
+
+@pytest.mark.parametrize("formato", ["ini", "properties"])
+def test_incremental_igual_a_revalidar_todo(formato):
+    rng = random.Random(24)
+    inc = ValidadorIncremental([linea_aleatoria(rng, formato) for _ in range(30)], formato)
+    for _ in range(2000):
+        linea = rng.randint(1, len(inc) + 1)
+        borradas = rng.randint(0, min(3, len(inc) - linea + 1))
+        nuevas = [linea_aleatoria(rng, formato) for _ in range(rng.choice([0, 1, 1, 1, 2]))]
+        inc.editar(linea, nuevas, borradas)
+        esperado = _como_tuplas(VALIDADORES_MAP[formato](inc._lineas))
+        assert _como_tuplas(inc.errores()) == esperado
+        assert inc.total_errores == len(esperado)
+
+
+def test_incremental_rechaza_ediciones_fuera_del_archivo():
+    inc = ValidadorIncremental(["[general]", "a = 1"], 'ini')
+    with pytest.raises(IndexError):
+        inc.editar(4, ["b = 2"], 0)
+    with pytest.raises(IndexError):
+        inc.editar(2, [], 2)
+    with pytest.raises(ValueError):
+        ValidadorIncremental([], 'csv')
+
+
+@pytest.fixture
+def carpeta_mixta(tmp_path):
+    carpeta = tmp_path / "configs"
+    carpeta.mkdir()
+    (carpeta / "app.ini").write_text("[general]\nnombre = x\nsin_igual\n", encoding='utf-8')
+    (carpeta / "app.properties").write_text("a=1\n=sin_clave\n", encoding='utf-8')
+    (carpeta / "datos.csv").write_text("id,ok\n1,true\nx,false\n", encoding='utf-8')
+    (carpeta / "red.hosts").write_text("127.0.0.1 localhost\n300.1.1.1 malo\n", encoding='utf-8')
+    for i in range(6):
+        (carpeta / f"extra{i}.ini").write_text("[s]\n" + "k = v\n" * i + "mal\n" * (i % 3), encoding='utf-8')
+    return carpeta
+
+
+def _reporte(capsys):
+    """Líneas por archivo sin tiempos ni origen, y el conteo de aciertos de caché"""
+    salida = capsys.readouterr().out
+    lineas = [re.sub(r"\s+[\d.]+ ms, \S+$", "", l) for l in salida.splitlines() if not l.startswith("  Errores:")]
+    aciertos = int(re.search(r"de caché: (\d+)", salida).group(1))
+    return [l for l in lineas if "de caché" not in l], aciertos
+
+
+def test_rutas_cache_y_paralelo(carpeta_mixta, tmp_path, capsys):
+    cache = CacheValidacion(str(tmp_path / "cache"))
+    total = validar_rutas(str(carpeta_mixta), cache=cache, procesos=1)
+    referencia, aciertos = _reporte(capsys)
+    assert total > 0 and aciertos == 0
+
+    # Segunda corrida: todo de la caché, mismo reporte
+    assert validar_rutas(str(carpeta_mixta), cache=cache, procesos=1) == total
+    assert _reporte(capsys) == (referencia, 10)
+
+    # En paralelo y sin caché: mismo reporte
+    assert validar_rutas(str(carpeta_mixta), cache=None, procesos=2) == total
+    assert _reporte(capsys) == (referencia, 0)
+
+    # Editar un archivo invalida sólo su entrada
+    (carpeta_mixta / "app.ini").write_text("[general]\nnombre = x\n", encoding='utf-8')
+    assert validar_rutas(str(carpeta_mixta), cache=cache, procesos=2) == total - 1
+    assert _reporte(capsys)[1] == 9
+
+
+def test_clave_de_cache_cambia_con_version_y_muestra(monkeypatch):
+    clave = CacheValidacion.clave("abc", "csv", None)
+    assert CacheValidacion.clave("abc", "csv", None, muestra=1) == clave
+    assert CacheValidacion.clave("abc", "csv", None, muestra=4) != clave
+    assert CacheValidacion.clave("abc", "csv", 5) != clave
+    assert CacheValidacion.clave("abc", "ini", None) != clave
+    monkeypatch.setattr(ejercicio3_2, "VERSION_VALIDADORES", "otra")
+    assert CacheValidacion.clave("abc", "csv", None) != clave
@@ -0,0 +1,30 @@
+import random
+
+from comun.fragmentos import abrir_fragmento, fronteras_lineas
+
+
+def test_fronteras_alineadas_a_lineas(tmp_path):
+    rng = random.Random(5)
+    ruta = tmp_path / "datos.txt"
+    for _ in range(50):
+        lineas = ["x" * rng.randint(0, 30) + rng.choice(["\n", "\r\n", "\r"]) for _ in range(rng.randint(0, 40))]
+        if lineas and rng.random() < 0.3:
+            lineas[-1] = lineas[-1].rstrip()  # sin salto de línea final
+        ruta.write_bytes("".join(lineas).encode())
+        fronteras = fronteras_lineas(ruta, rng.randint(1, 64))
+        datos = ruta.read_bytes()
+        assert fronteras[0] == 0 and fronteras[-1] == len(datos)
+        assert fronteras == sorted(set(fronteras)) or fronteras == [0, 0]
+        for f in fronteras[1:-1]:
+            assert datos[f - 1:f] == b"\n"
+        # Los fragmentos leídos en orden reconstruyen el modo texto del archivo completo
+        with open(ruta, encoding='utf-8') as f:
+            completo = f.read()
+        assert "".join(abrir_fragmento(ruta, a, b).read() for a, b in zip(fronteras, fronteras[1:])) == completo
+
+
+def test_archivo_vacio(tmp_path):
+    ruta = tmp_path / "vacio.txt"
+    ruta.write_bytes(b"")
+    assert fronteras_lineas(ruta, 16) == [0, 0]
+    assert abrir_fragmento(ruta, 0, 0).read() == ""